@@ -4,7 +4,7 @@ import numba
 import torch
 import tensorflow
 
-from moa.frontend import LazyArray
+from moa.frontend import LazyArray, compile_fused
 
 
 @pytest.mark.benchmark(group="addition", warmup=True)
@@ -23,6 +23,55 @@ def test_moa_numba_addition(benchmark):
     benchmark(local_dict['f'], A, B)
 
 
+@pytest.mark.benchmark(group="addition", warmup=True)
+def test_moa_numba_addition_output_argument(benchmark):
+    n = 1000
+    m = 1000
+
+    expression = LazyArray(name='A', shape=('n', 'm')) + LazyArray(name='B', shape=('n', 'm'))
+
+    local_dict = {}
+    exec(expression.compile(backend='python', use_numba=True, out=True), globals(), local_dict)
+
+    A = numpy.random.random((n, m))
+    B = numpy.random.random((n, m))
+    C = numpy.empty((n, m))
+
+    benchmark(local_dict['f'], A, B, C)
+
+
+@pytest.mark.benchmark(group="addition", warmup=True)
+def test_moa_numba_addition_collapsed(benchmark):
+    n = 1000
+    m = 1000
+
+    expression = LazyArray(name='A', shape=('n', 'm')) + LazyArray(name='B', shape=('n', 'm'))
+
+    local_dict = {}
+    exec(expression.compile(backend='python', use_numba=True, collapse=True), globals(), local_dict)
+
+    A = numpy.random.random((n, m))
+    B = numpy.random.random((n, m))
+
+    benchmark(local_dict['f'], A, B)
+
+
+@pytest.mark.benchmark(group="addition")
+def test_moa_numpy_vectorized_addition(benchmark):
+    n = 1000
+    m = 1000
+
+    expression = LazyArray(name='A', shape=('n', 'm')) + LazyArray(name='B', shape=('n', 'm'))
+
+    local_dict = {}
+    exec(expression.compile(backend='python', vectorize=True), globals(), local_dict)
+
+    A = numpy.random.random((n, m))
+    B = numpy.random.random((n, m))
+
+    benchmark(local_dict['f'], A, B)
+
+
 @pytest.mark.benchmark(group="addition")
 def test_numpy_addition(benchmark):
     n = 1000
@@ -290,6 +339,60 @@ def test_tensorflow_reduce(benchmark):
     benchmark(_test)
 
 
+@pytest.mark.benchmark(group="reduce_vector", warmup=True)
+def test_moa_numba_reduce_vector_parallel(benchmark):
+    n = 10000000
+
+    expression = LazyArray(name='A', shape=('n',)).reduce('+')
+
+    local_dict = {}
+    exec(expression.compile(backend='python', use_numba=True, parallel=True), globals(), local_dict)
+
+    A = numpy.random.random((n,))
+
+    benchmark(local_dict['f'], A)
+
+
+@pytest.mark.benchmark(group="reduce_vector", warmup=True)
+def test_moa_numba_reduce_vector(benchmark):
+    n = 10000000
+
+    expression = LazyArray(name='A', shape=('n',)).reduce('+')
+
+    local_dict = {}
+    exec(expression.compile(backend='python', use_numba=True), globals(), local_dict)
+
+    A = numpy.random.random((n,))
+
+    benchmark(local_dict['f'], A)
+
+
+@pytest.mark.benchmark(group="reduce_vector", warmup=True)
+def test_moa_numba_reduce_vector_accumulators(benchmark):
+    n = 10000000
+
+    expression = LazyArray(name='A', shape=('n',)).reduce('+')
+
+    local_dict = {}
+    exec(expression.compile(backend='python', use_numba=True, accumulators=4), globals(), local_dict)
+
+    A = numpy.random.random((n,))
+
+    benchmark(local_dict['f'], A)
+
+
+@pytest.mark.benchmark(group="reduce_vector")
+def test_numpy_reduce_vector(benchmark):
+    n = 10000000
+
+    A = numpy.random.random((n,))
+
+    def _test():
+        A.sum()
+
+    benchmark(_test)
+
+
 @pytest.mark.benchmark(group="inner_product", warmup=True)
 def test_moa_numba_inner_product(benchmark):
     n = 1000
@@ -308,6 +411,60 @@ def test_moa_numba_inner_product(benchmark):
     benchmark(local_dict['f'], A, B)
 
 
+@pytest.mark.benchmark(group="inner_product", warmup=True)
+def test_moa_numba_inner_product_tiled(benchmark):
+    n = 1000
+    m = 1000
+
+    _A = LazyArray(name='A', shape=('n', 'm'))
+    _B = LazyArray(name='B', shape=('m', 'k'))
+    expression = _A.inner('+', '*', _B)
+
+    local_dict = {}
+    exec(expression.compile(backend='python', use_numba=True, tiling=True), globals(), local_dict)
+
+    A = numpy.random.random((n, m))
+    B = numpy.random.random((n, m))
+
+    benchmark(local_dict['f'], A, B)
+
+
+@pytest.mark.benchmark(group="inner_product", warmup=True)
+def test_moa_numba_inner_product_parallel(benchmark):
+    n = 1000
+    m = 1000
+
+    _A = LazyArray(name='A', shape=('n', 'm'))
+    _B = LazyArray(name='B', shape=('m', 'k'))
+    expression = _A.inner('+', '*', _B)
+
+    local_dict = {}
+    exec(expression.compile(backend='python', use_numba=True, parallel=True), globals(), local_dict)
+
+    A = numpy.random.random((n, m))
+    B = numpy.random.random((n, m))
+
+    benchmark(local_dict['f'], A, B)
+
+
+@pytest.mark.benchmark(group="inner_product", warmup=True)
+def test_moa_numba_inner_product_strength_reduction(benchmark):
+    n = 1000
+    m = 1000
+
+    _A = LazyArray(name='A', shape=('n', 'm'))
+    _B = LazyArray(name='B', shape=('m', 'k'))
+    expression = _A.inner('+', '*', _B)
+
+    local_dict = {}
+    exec(expression.compile(backend='python', use_numba=True, strength_reduction=True), globals(), local_dict)
+
+    A = numpy.random.random((n, m))
+    B = numpy.random.random((n, m))
+
+    benchmark(local_dict['f'], A, B)
+
+
 @pytest.mark.benchmark(group="inner_product")
 def test_numpy_inner_product(benchmark):
     n = 1000
@@ -353,3 +510,64 @@ def test_tensorflow_inner_product(benchmark):
         session.run(result)
 
     benchmark(_test)
+
+
+def _multiple_output_expressions():
+    def _A():
+        return LazyArray(name='A', shape=('n', 'm'))
+
+    def _B():
+        return LazyArray(name='B', shape=('n', 'm'))
+
+    return [_A() + _B(), (_A() + _B()).reduce('+', axis=1), _A() * _B()]
+
+
+@pytest.mark.benchmark(group="multiple_output", warmup=True)
+def test_moa_numba_compile_fused(benchmark):
+    n = 1000
+    m = 1000
+
+    local_dict = {}
+    exec(compile_fused(_multiple_output_expressions(), backend='python', use_numba=True), globals(), local_dict)
+
+    A = numpy.random.random((n, m))
+    B = numpy.random.random((n, m))
+
+    benchmark(local_dict['f'], A, B)
+
+
+@pytest.mark.benchmark(group="multiple_output", warmup=True)
+def test_moa_numba_separate_kernels(benchmark):
+    n = 1000
+    m = 1000
+
+    functions = []
+    for expression in _multiple_output_expressions():
+        local_dict = {}
+        exec(expression.compile(backend='python', use_numba=True), globals(), local_dict)
+        functions.append(local_dict['f'])
+
+    A = numpy.random.random((n, m))
+    B = numpy.random.random((n, m))
+
+    def _test():
+        for function in functions:
+            function(A, B)
+
+    benchmark(_test)
+
+
+@pytest.mark.benchmark(group="multiple_output")
+def test_numpy_multiple_output(benchmark):
+    n = 1000
+    m = 1000
+
+    A = numpy.random.random((n, m))
+    B = numpy.random.random((n, m))
+
+    def _test():
+        C = A + B
+        C.sum(axis=1)
+        A * B
+
+    benchmark(_test)
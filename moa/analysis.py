@@ -1,17 +1,30 @@
-from functools import reduce
-
 from . import ast
 
 
-def metric_flops(context):
+def metric_flops(context, symbolic_bound=None):
+    """Number of arithmetic (+-*/ max min) operations to evaluate expression
+
+    Symbolic dimensions are counted as ``symbolic_bound`` elements
+    which allows comparing expressions with unknown shape.
+    """
+    def _num_elements(shape):
+        total = 1
+        for element in shape:
+            if ast.is_symbolic_element(element):
+                if symbolic_bound is None:
+                    raise ValueError('metric "flops" requires symbolic_bound for arrays with symbolic shape')
+                element = symbolic_bound
+            total *= element
+        return total
+
     def _count_flops(context):
         if context.ast.shape is None:
             raise ValueError('metric "flops" assumes that shape analysis is completed')
 
         flops = 0
 
-        if context.ast.symbol[-1] in {ast.NodeSymbol.PLUS, ast.NodeSymbol.MINUS, ast.NodeSymbol.TIMES, ast.NodeSymbol.DIVIDE}:
-            flops = reduce(lambda x,y: x*y, context.ast.shape)
+        if context.ast.symbol[-1] in {ast.NodeSymbol.PLUS, ast.NodeSymbol.MINUS, ast.NodeSymbol.TIMES, ast.NodeSymbol.DIVIDE, ast.NodeSymbol.MAXIMUM, ast.NodeSymbol.MINIMUM}:
+            flops = _num_elements(context.ast.shape)
 
         return ast.create_context(
             ast=flops + sum([_ for _ in context.ast.child]),
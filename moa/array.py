@@ -10,11 +10,38 @@ to stabilize and more work before that happens.
 
 """
 
+def gamma_strides(shape, fmt='row'):
+    """Strides of each dimension for "row" or "column" major layout"""
+    strides = []
+    stride = 1
+    for bound in (shape if fmt == 'column' else shape[::-1]):
+        strides.append(stride)
+        stride *= bound
+    return tuple(strides if fmt == 'column' else strides[::-1])
+
+
 class Array:
-    def __init__(self, shape, value=None, fmt='row'):
+    """Array stored in ``value`` with "row", "column", or "strided" layout
+
+    For the "strided" layout ``strides`` gives the number of elements
+    between consecutive indicies of each dimension and ``value`` is
+    the underlying storage.
+    """
+    def __init__(self, shape, value=None, fmt='row', strides=None):
+        if fmt in {'row', 'column'}:
+            if strides is not None:
+                raise ValueError(f'strides are only allowed with "strided" format not "{fmt}"')
+            strides = gamma_strides(shape, fmt)
+        elif fmt == 'strided':
+            if strides is None or len(strides) != len(shape):
+                raise ValueError('"strided" format requires a stride for each dimension')
+            strides = tuple(strides)
+        else:
+            raise ValueError(f'format "{fmt}" not one of "row", "column", or "strided"')
+
         total = 1
-        for i in shape:
-            total *= i
+        for bound, stride in zip(shape, strides):
+            total += (bound - 1) * stride
 
         if value:
             if total != len(value):
@@ -24,27 +51,34 @@ class Array:
             self.value = [0] * total
 
         self._shape = shape
-
-        if fmt != 'row':
-            raise NotImplementedError('only "row" based format implmented')
+        self._strides = strides
         self.fmt = fmt
 
     @property
     def shape(self):
         return self._shape
 
+    @property
+    def strides(self):
+        return self._strides
+
+    def storage(self, shape=None):
+        """Underlying storage of array indexed by flat offset"""
+        return self.value
+
     def _offset(self, index):
+        if not isinstance(index, tuple):
+            index = (index,)
+
         if len(index) != len(self.shape):
             raise IndexError('index is not a full index')
 
-        stride = 1
         offset = 0
-        for i, s in zip(index[::-1], self.shape[::-1]):
+        for i, s, stride in zip(index, self.shape, self.strides):
             if i >= s:
                 raise IndexError(f'index {i} >= {s} is incompatible with shape')
 
             offset += stride * i
-            stride *= s
 
         return offset
 
@@ -98,6 +132,31 @@ class Array:
             raise TypeError('only scalar operations allowed')
         return other / self[()]
 
+    def __floordiv__(self, other):
+        if len(self.shape) != 0:
+            raise TypeError('only scalar operations allowed')
+        return self[()] // other
+
+    def __rfloordiv__(self, other):
+        if len(self.shape) != 0:
+            raise TypeError('only scalar operations allowed')
+        return other // self[()]
+
+    def __mod__(self, other):
+        if len(self.shape) != 0:
+            raise TypeError('only scalar operations allowed')
+        return self[()] % other
+
+    def __rmod__(self, other):
+        if len(self.shape) != 0:
+            raise TypeError('only scalar operations allowed')
+        return other % self[()]
+
+    def __index__(self):
+        if len(self.shape) != 0:
+            raise TypeError('only scalar operations allowed')
+        return self[()]
+
     # scalar comparison
     def __lt__(self, other):
         if len(self.shape) != 0:
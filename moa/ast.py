@@ -14,25 +14,30 @@ NodeSymbol = enum.Enum('NodeSymbol', [
     # compound operators
     'REDUCE', 'DOT',
     # unary operators
-    'IOTA', 'DIM', 'TAU', 'SHAPE', 'RAV', 'TRANSPOSE',
+    'IOTA', 'DIM', 'TAU', 'SHAPE', 'RAV', 'TRANSPOSE', 'STORAGE',
     # unary boolean operators
     'NOT',
     # binary operators
     'ASSIGN', 'PLUS', 'MINUS', 'TIMES', 'DIVIDE',
-    'PSI', 'TAKE', 'DROP', 'CAT', 'TRANSPOSEV',
+    'FLOORDIVIDE', 'MODULO',
+    'MAXIMUM', 'MINIMUM',
+    'PSI', 'TAKE', 'DROP', 'CAT', 'TRANSPOSEV', 'RESHAPE', 'SLICE',
     # binary boolean operators
     'EQUAL', 'NOTEQUAL',
     'LESSTHAN', 'LESSTHANEQUAL',
     'GREATERTHAN', 'GREATERTHANEQUAL',
     'AND', 'OR',
+    # arrays share memory
+    'OVERLAP',
 ])
 
 
 Node = collections.namedtuple(
     'Node', ['symbol', 'shape', 'attrib', 'child'])
 
+# layout is None (row major), 'column', or a tuple of strides
 SymbolNode = collections.namedtuple(
-    'SymbolNode', ['symbol', 'shape', 'type', 'value'])
+    'SymbolNode', ['symbol', 'shape', 'type', 'value', 'layout'], defaults=(None,))
 
 Context = collections.namedtuple(
     'Context', ['ast', 'symbol_table'])
@@ -172,15 +177,15 @@ def replace_node_attributes(context, replacement_attributes, selection=()):
 
 
 # symbol table methods
-def add_symbol(context, name, symbol, shape, type, value):
+def add_symbol(context, name, symbol, shape, type, value, layout=None):
     symbol_table = context.symbol_table
-    if name in symbol_table and symbol_table[name] != (symbol, shape, type, value):
-        raise MOAException(f'attempted to add to symbol table different symbol with same name "{name}" {symbol_table[name]} != {SymbolNode(symbol, shape, type, value)}')
+    if name in symbol_table and symbol_table[name] != (symbol, shape, type, value, layout):
+        raise MOAException(f'attempted to add to symbol table different symbol with same name "{name}" {symbol_table[name]} != {SymbolNode(symbol, shape, type, value, layout)}')
 
     # idempotency makes debugging way easier dict(str: tuple)
     # deep copy not necessary
     symbol_table_copy = copy.copy(symbol_table)
-    symbol_table_copy[name] = SymbolNode(symbol, shape, type, value)
+    symbol_table_copy[name] = SymbolNode(symbol, shape, type, value, layout)
     return Context(ast=context.ast, symbol_table=symbol_table_copy)
 
 
@@ -210,13 +215,15 @@ def referenced_node_symbols(context):
             node_symbol = select_array_node_symbol(context)
             if node_symbol.shape:
                 for element in node_symbol.shape:
-                    if is_symbolic_element(element):
-                        visited_symbols.add(element.attrib[0])
+                    visited_symbols.update(element_symbols(element))
 
             if node_symbol.value:
                 for element in node_symbol.value:
-                    if is_symbolic_element(element):
-                        visited_symbols.add(element.attrib[0])
+                    visited_symbols.update(element_symbols(element))
+
+            if isinstance(node_symbol.layout, tuple):
+                for element in node_symbol.layout:
+                    visited_symbols.update(element_symbols(element))
         return context
 
     node_traversal(context, _visit_node, traversal='postorder')
@@ -258,7 +265,10 @@ def rename_symbol_table_symbols(symbol_table, symbol_mapping):
                     value = value + (Node(element.symbol, element.shape, (symbol_mapping[element.attrib[0]],), ()),)
                 else:
                     value = value + (element,)
-        new_symbol_table[name] = SymbolNode(node_symbol.symbol, shape, node_symbol.type, value)
+        layout = node_symbol.layout
+        if isinstance(layout, tuple):
+            layout = tuple(substitute_element_symbols(element, symbol_mapping) for element in layout)
+        new_symbol_table[name] = SymbolNode(node_symbol.symbol, shape, node_symbol.type, value, layout)
     return new_symbol_table
 
 
@@ -273,7 +283,7 @@ def join_symbol_tables(left_context, right_context):
 
     def _symbol_mapping(symbols):
         symbol_mapping = {}
-        for symbol in symbols:
+        for symbol in sorted(symbols):
             if symbol.startswith('_i'):
                 symbol_mapping[symbol] = f'_i{next(counter)}'
             elif symbol.startswith('_a'):
@@ -308,6 +318,19 @@ def join_symbol_tables(left_context, right_context):
     return new_symbol_table, new_left_context, new_right_context
 
 
+def join_contexts(contexts):
+    """Join contexts into a BLOCK of their trees sharing one symbol table"""
+    context = create_context(
+        ast=Node((NodeSymbol.BLOCK,), None, (), (contexts[0].ast,)),
+        symbol_table=contexts[0].symbol_table)
+    for right_context in contexts[1:]:
+        new_symbol_table, left_context, right_context = join_symbol_tables(context, right_context)
+        context = create_context(
+            ast=Node((NodeSymbol.BLOCK,), None, (), left_context.ast.child + (right_context.ast,)),
+            symbol_table=new_symbol_table)
+    return context
+
+
 # tuple methods
 def replace_tuple(value, replacement_element, index):
     return value[:index] + (replacement_element,) + value[index+1:]
@@ -321,6 +344,196 @@ def is_symbolic_element(element):
     return isinstance(element, tuple)
 
 
+def element_symbols(element):
+    """Names of all arrays referenced by a (possibly compound) element
+
+    Symbolic elements are either a scalar array node or an arithmetic
+    node of scalar elements e.g. ``(i * n) + j``.
+    """
+    if not is_symbolic_element(element):
+        return ()
+    if element.symbol in {(NodeSymbol.ARRAY,), (NodeSymbol.INDEX,)}:
+        return (element.attrib[0],)
+    return tuple(name for child in element.child for name in element_symbols(child))
+
+
+def substitute_element_symbols(element, symbol_mapping):
+    """Rename arrays referenced by a (possibly compound) element"""
+    if not is_symbolic_element(element):
+        return element
+    if element.symbol in {(NodeSymbol.ARRAY,), (NodeSymbol.INDEX,)}:
+        return Node(element.symbol, element.shape, (symbol_mapping.get(element.attrib[0], element.attrib[0]),), ())
+    return Node(element.symbol, element.shape, element.attrib, tuple(substitute_element_symbols(child, symbol_mapping) for child in element.child))
+
+
+# symbolic element arithmetic
+def element_node(context, element):
+    """Convert element into scalar node adding constants to symbol table"""
+    if is_symbolic_element(element):
+        return context, element
+
+    array_name = generate_unique_array_name(context)
+    context = add_symbol(context, array_name, NodeSymbol.ARRAY, (), None, (element,))
+    return context, Node((NodeSymbol.ARRAY,), (), (array_name,), ())
+
+
+def element_operation(context, operation, left_element, right_element):
+    """Apply integer arithmetic operation to two elements
+
+    Constant elements are evaluated at compile time and trivial
+    identities (``x + 0``, ``x * 1``, ``x * 0``, ...) are removed so
+    that index arithmetic stays as small as possible.
+    """
+    operation_map = {
+        NodeSymbol.PLUS: lambda e1, e2: e1 + e2,
+        NodeSymbol.MINUS: lambda e1, e2: e1 - e2,
+        NodeSymbol.TIMES: lambda e1, e2: e1 * e2,
+        NodeSymbol.FLOORDIVIDE: lambda e1, e2: e1 // e2,
+        NodeSymbol.MODULO: lambda e1, e2: e1 % e2,
+        NodeSymbol.MAXIMUM: max,
+        NodeSymbol.MINIMUM: min,
+    }
+
+    if not is_symbolic_element(left_element) and not is_symbolic_element(right_element):
+        return context, operation_map[operation](left_element, right_element)
+
+    if operation in {NodeSymbol.PLUS, NodeSymbol.MINUS} and right_element == 0:
+        return context, left_element
+    elif operation == NodeSymbol.PLUS and left_element == 0:
+        return context, right_element
+    elif operation == NodeSymbol.TIMES and (left_element == 0 or right_element == 0):
+        return context, 0
+    elif operation in {NodeSymbol.TIMES, NodeSymbol.FLOORDIVIDE} and right_element == 1:
+        return context, left_element
+    elif operation == NodeSymbol.TIMES and left_element == 1:
+        return context, right_element
+    elif operation == NodeSymbol.MODULO and right_element == 1:
+        return context, 0
+
+    context, left_node = element_node(context, left_element)
+    context, right_node = element_node(context, right_element)
+    return context, Node((operation,), (), (), (left_node, right_node))
+
+
+def substitute_element(context, element, index_name, replacement_element):
+    """Substitute index within element folding constant arithmetic
+
+    Scalar constants of the symbol table are replaced by their value.
+    """
+    if not is_symbolic_element(element):
+        return context, element
+    elif element.symbol in {(NodeSymbol.ARRAY,), (NodeSymbol.INDEX,)}:
+        if element.attrib[0] == index_name:
+            return context, replacement_element
+        node_symbol = context.symbol_table[element.attrib[0]]
+        if node_symbol.symbol == NodeSymbol.ARRAY and node_symbol.shape == () and \
+           node_symbol.value is not None and not has_symbolic_elements(node_symbol.value):
+            return context, node_symbol.value[0]
+        return context, element
+
+    children = ()
+    for child in element.child:
+        context, child = substitute_element(context, child, index_name, replacement_element)
+        children = children + (child,)
+
+    if len(children) == 2 and element.symbol[0] in {
+            NodeSymbol.PLUS, NodeSymbol.MINUS, NodeSymbol.TIMES,
+            NodeSymbol.FLOORDIVIDE, NodeSymbol.MODULO,
+            NodeSymbol.MAXIMUM, NodeSymbol.MINIMUM}:
+        return element_operation(context, element.symbol[0], children[0], children[1])
+    return context, Node(element.symbol, element.shape, element.attrib, children)
+
+
+def is_index_element(element, index_name):
+    """Element is the symbol index_name"""
+    return is_symbolic_element(element) and \
+        element.symbol in {(NodeSymbol.ARRAY,), (NodeSymbol.INDEX,)} and \
+        element.attrib[0] == index_name
+
+
+def element_product(context, elements):
+    product = 1
+    for element in elements:
+        context, product = element_operation(context, NodeSymbol.TIMES, product, element)
+    return context, product
+
+
+def ravel_index(context, index, shape):
+    """Row major flat offset of index within array of given shape
+
+    <i j k> with shape <l m n> => ((i * m) + j) * n + k
+    """
+    offset = 0
+    for element, bound in zip(index, shape):
+        context, offset = element_operation(context, NodeSymbol.TIMES, offset, bound)
+        context, offset = element_operation(context, NodeSymbol.PLUS, offset, element)
+    return context, offset
+
+
+def layout_strides(context, shape, layout=None):
+    """Strides of each dimension for array layout (gamma)
+
+    row major <l m n> => <m * n, n, 1>
+    column major <l m n> => <1, l, l * m>
+    strided layouts are given by their strides
+    """
+    if isinstance(layout, tuple):
+        return context, layout
+
+    strides = ()
+    stride = 1
+    dimensions = tuple(enumerate(shape)) if layout == 'column' else tuple(reversed(tuple(enumerate(shape))))
+    for i, bound in dimensions:
+        strides = strides + ((i, stride),)
+        context, stride = element_operation(context, NodeSymbol.TIMES, stride, bound)
+    return context, tuple(stride for _, stride in sorted(strides))
+
+
+def gamma_index(context, index, shape, layout=None):
+    """Flat offset of index within storage of array with layout
+
+    <i j k> with strides <s t u> => ((i * s) + (j * t)) + (k * u)
+    """
+    context, strides = layout_strides(context, shape, layout)
+
+    offset = 0
+    for element, stride in zip(index, strides):
+        context, term = element_operation(context, NodeSymbol.TIMES, element, stride)
+        context, offset = element_operation(context, NodeSymbol.PLUS, offset, term)
+    return context, offset
+
+
+def storage_size(context, shape, layout=None):
+    """Number of elements in storage of array with layout"""
+    if not isinstance(layout, tuple):
+        return element_product(context, shape)
+
+    context, strides = layout_strides(context, shape, layout)
+
+    size = 1
+    for bound, stride in zip(shape, strides):
+        context, extent = element_operation(context, NodeSymbol.MINUS, bound, 1)
+        context, extent = element_operation(context, NodeSymbol.TIMES, extent, stride)
+        context, size = element_operation(context, NodeSymbol.PLUS, size, extent)
+    return context, size
+
+
+def unravel_index(context, offset, shape):
+    """Row major index within array of given shape from flat offset
+
+    offset with shape <l m n> => <offset // (m * n), (offset // n) % m, offset % n>
+    """
+    index = ()
+    stride = 1
+    for i, bound in reversed(tuple(enumerate(shape))):
+        context, element = element_operation(context, NodeSymbol.FLOORDIVIDE, offset, stride)
+        if i != 0: # leading index is always in bounds
+            context, element = element_operation(context, NodeSymbol.MODULO, element, bound)
+        index = (element,) + index
+        context, stride = element_operation(context, NodeSymbol.TIMES, stride, bound)
+    return context, index
+
+
 ## replacement methods
 class MOAReplacementError(MOAException):
     pass
@@ -346,3 +559,32 @@ def node_traversal(context, replacement_function, traversal, max_iterations=rang
         return replacement_function(context)
 
     return context
+
+
+# node collection
+def array_nodes(node):
+    """ARRAY nodes within node in preorder"""
+    nodes = (node,) if node.symbol == (NodeSymbol.ARRAY,) else ()
+    return nodes + tuple(array_node for child in node.child for array_node in array_nodes(child))
+
+
+def array_names(node):
+    """Names of ARRAY nodes within node"""
+    return {array_node.attrib[0] for array_node in array_nodes(node)}
+
+
+def psi_nodes(node):
+    """PSI nodes within node in preorder"""
+    nodes = (node,) if node.symbol == (NodeSymbol.PSI,) else ()
+    return nodes + tuple(psi_node for child in node.child for psi_node in psi_nodes(child))
+
+
+def assignment_nodes(nodes):
+    """Flattened assignments of nodes in program order (including nested loops)"""
+    statements = ()
+    for node in nodes:
+        if node.symbol == (NodeSymbol.ASSIGN,):
+            statements = statements + (node,)
+        else:
+            statements = statements + assignment_nodes(node.child)
+    return statements
@@ -18,7 +18,7 @@ def python_backend(context):
     return context.ast
 
 
-def generate_python_source(context, materialize_scalars=False, use_numba=False):
+def generate_python_source(context, materialize_scalars=False, use_numba=False, num_threads=None, use_numpy=False):
     python_ast = python_backend(context)
 
     class ReplaceScalars(ast.NodeTransformer):
@@ -28,19 +28,31 @@ def generate_python_source(context, materialize_scalars=False, use_numba=False):
                 return ast.Num(symbol_node.value[0])
             return node
 
-    # TODO: this will no longer be necissary with psi reduction
-    class ReplaceShapeIndex(ast.NodeTransformer):
-        def visit_Subscript(self, node):
-            if isinstance(node.value, ast.Attribute) and node.value.attr == 'shape':
-                return ast.Subscript(value=node.value,
-                                     slice=ast.Index(value=node.slice.value.elts[0]),
-                                     ctx=ast.Load())
+    class ReplaceParallelRange(ast.NodeTransformer):
+        def visit_Name(self, node):
+            if node.id == 'prange':
+                node.id = 'numba.prange' if use_numba else 'range'
             return node
 
-    class ReplaceWithNumba(ast.NodeTransformer):
-        def visit_FunctionDef(self, node):
-            node.decorator_list = [ast.Name(id='numba.jit', ctx=ast.Load())]
+    class ReplaceWithNumpy(ast.NodeTransformer):
+        check_contiguous = True
+
+        def visit_Call(self, node):
             self.generic_visit(node)
+            if isinstance(node.func, ast.Name) and node.func.id == 'numpy.zeros' and len(node.args) == 2:
+                # Array(shape, value) => numpy.array(value).reshape(shape)
+                node = ast.Call(func=ast.Attribute(
+                    value=ast.Call(func=ast.Name(id='numpy.array', ctx=ast.Load()), args=[node.args[1]], keywords=[]),
+                    attr='reshape', ctx=ast.Load()), args=[node.args[0]], keywords=[])
+            elif isinstance(node.func, ast.Attribute) and node.func.attr == 'storage':
+                array_node = node.func.value
+                if context.symbol_table[array_node.id].layout is None:
+                    # A.storage(shape) => A.reshape(shape) of row major (C contiguous) A
+                    return ast.Call(func=ast.Attribute(value=array_node, attr='reshape', ctx=ast.Load()), args=node.args, keywords=[])
+                # A.storage(shape) => as_strided(A, shape, (A.itemsize,))
+                node = ast.Call(func=ast.Name(id='numpy.lib.stride_tricks.as_strided', ctx=ast.Load()), args=[
+                    array_node, node.args[0],
+                    ast.Tuple(elts=[ast.Attribute(value=array_node, attr='itemsize', ctx=ast.Load())])], keywords=[])
             return node
 
         def visit_Name(self, node):
@@ -48,11 +60,50 @@ def generate_python_source(context, materialize_scalars=False, use_numba=False):
                 node.id = 'numpy.zeros'
             return node
 
+        def visit_Compare(self, node):
+            self.generic_visit(node)
+            if isinstance(node.ops[0], ast.Is):
+                # A is B => numpy.shares_memory(A, B) (views of the same data)
+                return ast.Call(func=ast.Name(id='numpy.shares_memory', ctx=ast.Load()), args=[node.left, node.comparators[0]], keywords=[])
+            return node
+
+        def visit_Assign(self, node):
+            value = node.value
+            self.generic_visit(node)
+            if self.check_contiguous and isinstance(value, ast.Call) and isinstance(value.func, ast.Attribute) and \
+               value.func.attr == 'storage' and context.symbol_table[value.func.value.id].layout is None:
+                # reshape silently copies non C contiguous arrays (writes to the copy would be lost)
+                return [ast.If(test=ast.UnaryOp(op=ast.Not(), operand=ast.Attribute(
+                    value=ast.Attribute(value=value.func.value, attr='flags', ctx=ast.Load()), attr='c_contiguous', ctx=ast.Load())),
+                    body=[ast.Raise(exc=ast.Call(func=ast.Name(id='Exception'), args=[ast.Str(s='array argument is not C contiguous')], keywords=[]), cause=None)],
+                    orelse=[]), node]
+            return node
+
+    class ReplaceWithNumba(ReplaceWithNumpy):
+        # numba rejects reshape of non contiguous arrays when typing the function
+        check_contiguous = False
+
+        def visit_FunctionDef(self, node):
+            self.generic_visit(node)
+            if any(isinstance(_, ast.Name) and _.id == 'numba.prange' for _ in ast.walk(node)):
+                node.decorator_list = [ast.Call(func=ast.Name(id='numba.jit', ctx=ast.Load()), args=[], keywords=[
+                    ast.keyword(arg='parallel', value=ast.NameConstant(value=True))])]
+                if num_threads is not None:
+                    # number of threads is limited by the threads numba was started with
+                    node.body.insert(0, ast.Expr(value=ast.Call(func=ast.Name(id='numba.set_num_threads', ctx=ast.Load()), args=[
+                        ast.Call(func=ast.Name(id='min', ctx=ast.Load()), args=[
+                            ast.Num(n=num_threads), ast.Name(id='numba.config.NUMBA_NUM_THREADS', ctx=ast.Load())], keywords=[])], keywords=[])))
+            else:
+                node.decorator_list = [ast.Name(id='numba.jit', ctx=ast.Load())]
+            return node
+
+    python_ast = ReplaceParallelRange().visit(python_ast)
     if materialize_scalars:
         python_ast = ReplaceScalars().visit(python_ast)
-        python_ast = ReplaceShapeIndex().visit(python_ast)
         if use_numba:
             python_ast = ReplaceWithNumba().visit(python_ast)
+        elif use_numpy:
+            python_ast = ReplaceWithNumpy().visit(python_ast)
 
     return astunparse.unparse(python_ast)[:-1] # remove newline
 
@@ -70,11 +121,16 @@ def _ast_replacement(context):
         (NodeSymbol.LOOP,): _ast_loop,
         (NodeSymbol.SHAPE,): _ast_shape,
         (NodeSymbol.DIM,): _ast_dimension,
+        (NodeSymbol.STORAGE,): _ast_storage,
         (NodeSymbol.PSI,): _ast_psi,
         (NodeSymbol.PLUS,): _ast_plus_minus_times_divide,
         (NodeSymbol.MINUS,): _ast_plus_minus_times_divide,
         (NodeSymbol.TIMES,): _ast_plus_minus_times_divide,
         (NodeSymbol.DIVIDE,): _ast_plus_minus_times_divide,
+        (NodeSymbol.FLOORDIVIDE,): _ast_plus_minus_times_divide,
+        (NodeSymbol.MODULO,): _ast_plus_minus_times_divide,
+        (NodeSymbol.MAXIMUM,): _ast_maximum_minimum,
+        (NodeSymbol.MINIMUM,): _ast_maximum_minimum,
         (NodeSymbol.EQUAL,): _ast_comparison_operations,
         (NodeSymbol.NOTEQUAL,): _ast_comparison_operations,
         (NodeSymbol.LESSTHAN,): _ast_comparison_operations,
@@ -84,6 +140,7 @@ def _ast_replacement(context):
         (NodeSymbol.AND,): _ast_boolean_binary_operations,
         (NodeSymbol.OR,): _ast_boolean_binary_operations,
         (NodeSymbol.NOT,): _ast_boolean_unary_operations,
+        (NodeSymbol.OVERLAP,): _ast_overlap,
     }
     return _NODE_AST_MAP[context.ast.symbol](context)
 
@@ -91,7 +148,7 @@ def _ast_replacement(context):
 # helper
 def _ast_element(context, element):
     if is_symbolic_element(element):
-        return _ast_replacement(create_context(ast=element, symbol_table=context.symbol_table)).ast
+        return node_traversal(create_context(ast=element, symbol_table=context.symbol_table), _ast_replacement, traversal='postorder').ast
     else:
         return ast.Num(n=element)
 
@@ -103,9 +160,15 @@ def _ast_tuple(context, value):
 # python elements
 def _ast_psi(context):
     left_symbol_node = select_node(context, (0,)).ast.id
+    index = context.symbol_table[left_symbol_node].value
+    if len(index) == 1: # flat offset
+        index_node = _ast_element(context, index[0])
+    else:
+        index_node = _ast_tuple(context, index)
+
     return create_context(
         ast=ast.Subscript(value=select_node(context, (1,)).ast,
-                          slice=ast.Index(value=_ast_tuple(context, context.symbol_table[left_symbol_node].value)),
+                          slice=ast.Index(value=index_node),
                           ctx=ast.Load()),
         symbol_table=context.symbol_table)
 
@@ -117,11 +180,17 @@ def _ast_array(context):
 
 
 def _ast_function(context):
+    # multiple results are returned as a tuple
+    if isinstance(context.ast.attrib[1], tuple):
+        result = ast.Tuple(elts=[ast.Name(id=name) for name in context.ast.attrib[1]])
+    else:
+        result = ast.Name(id=context.ast.attrib[1])
+
     return create_context(
         ast=ast.FunctionDef(name='f',
                             args=ast.arguments(args=[ast.arg(arg=arg, annotation=None) for arg in context.ast.attrib[0]],
                                                vararg=None, kwonlyargs=[], kw_defaults=[], kwarg=None, defaults=[]),
-                            body=[ast.Expr(value=child_node) for child_node in context.ast.child] + [ast.Return(value=ast.Name(id=context.ast.attrib[1]))],
+                            body=[ast.Expr(value=child_node) for child_node in context.ast.child] + [ast.Return(value=result)],
                             decorator_list=[],
                             returns=None),
         symbol_table=context.symbol_table)
@@ -133,11 +202,37 @@ def _ast_assignment(context):
         symbol_table=context.symbol_table)
 
 
+class _ReplaceVectorIndex(ast.NodeTransformer):
+    """Replace loop index by slice of loop bounds and elementwise functions"""
+    _FUNCTION_MAP = {'max': 'numpy.maximum', 'min': 'numpy.minimum'}
+
+    def __init__(self, index_name, index_slice):
+        self.index_name = index_name
+        self.index_slice = index_slice
+
+    def visit_Name(self, node):
+        if node.id == self.index_name:
+            return self.index_slice
+        elif node.id in self._FUNCTION_MAP:
+            node.id = self._FUNCTION_MAP[node.id]
+        return node
+
+
 def _ast_loop(context):
     node_symbol = select_array_node_symbol(context)
+    if context.ast.attrib[1:] == ('vector',):
+        # vector loops are emitted once over the slice A[i, j] => A[i, slice(start, stop, step)]
+        index_slice = ast.Call(func=ast.Name(id='slice', ctx=ast.Load()), args=[
+            _ast_element(context, element) for element in node_symbol.value], keywords=[])
+        return create_context(
+            ast=_ReplaceVectorIndex(context.ast.attrib[0], index_slice).visit(ast.Module(body=select_node(context, (0,)).ast)).body,
+            symbol_table=context.symbol_table)
+
+    # parallel loops are emitted as prange and replaced by numba.prange or range
+    range_name = 'prange' if context.ast.attrib[1:] == ('parallel',) else 'range'
     return create_context(
         ast=ast.For(target=ast.Name(id=context.ast.attrib[0]),
-                iter=ast.Call(func=ast.Name(id='range'),
+                iter=ast.Call(func=ast.Name(id=range_name),
                               args=[
                                   _ast_element(context, node_symbol.value[0]),
                                   _ast_element(context, node_symbol.value[1]),
@@ -153,10 +248,17 @@ def _ast_error(context):
 
 
 def _ast_initialize(context):
+    args = [_ast_tuple(context, context.ast.shape)]
+
+    # arrays with known values are initialized as tables
+    node_symbol = select_array_node_symbol(context)
+    if node_symbol.value is not None:
+        args.append(_ast_tuple(context, node_symbol.value))
+
     return create_context(
         ast=ast.Assign(targets=[ast.Name(id=context.ast.attrib[0])],
                        value=ast.Call(func=ast.Name(id='Array'),
-                                      args=[_ast_tuple(context, context.ast.shape)],
+                                      args=args,
                                       keywords=[])),
         symbol_table=context.symbol_table)
 
@@ -167,6 +269,13 @@ def _ast_shape(context):
         symbol_table=context.symbol_table)
 
 
+def _ast_storage(context):
+    return create_context(
+        ast=ast.Call(func=ast.Attribute(value=select_node(context, (0,)).ast, attr='storage', ctx=ast.Load()),
+                     args=[_ast_tuple(context, context.ast.shape)], keywords=[]),
+        symbol_table=context.symbol_table)
+
+
 def _ast_dimension(context):
     return create_context(
         ast=ast.Call(func=ast.Name(id='len', ctx=ast.Load()), args=[_ast_shape(context).ast], keywords=[]),
@@ -179,12 +288,25 @@ def _ast_plus_minus_times_divide(context):
         (NodeSymbol.MINUS,): ast.Sub,
         (NodeSymbol.TIMES,): ast.Mult,
         (NodeSymbol.DIVIDE,): ast.Div,
+        (NodeSymbol.FLOORDIVIDE,): ast.FloorDiv,
+        (NodeSymbol.MODULO,): ast.Mod,
     }
     return create_context(
         ast=ast.BinOp(left=select_node(context, (0,)).ast, op=binop_map[context.ast.symbol](), right=select_node(context, (1,)).ast),
         symbol_table=context.symbol_table)
 
 
+def _ast_maximum_minimum(context):
+    function_map = {
+        (NodeSymbol.MAXIMUM,): 'max',
+        (NodeSymbol.MINIMUM,): 'min',
+    }
+    return create_context(
+        ast=ast.Call(func=ast.Name(id=function_map[context.ast.symbol], ctx=ast.Load()),
+                     args=[select_node(context, (0,)).ast, select_node(context, (1,)).ast], keywords=[]),
+        symbol_table=context.symbol_table)
+
+
 def _ast_block(context):
     return create_context(
         ast=[ast.Expr(value=child_node) for child_node in context.ast.child],
@@ -231,3 +353,9 @@ def _ast_boolean_unary_operations(context):
     return create_context(
         ast=ast.UnaryOp(op=boolean_map[context.ast.symbol](), operand=select_node(context, (0,)).ast),
         symbol_table=context.symbol_table)
+
+
+def _ast_overlap(context):
+    return create_context(
+        ast=ast.Compare(left=select_node(context, (0,)).ast, ops=[ast.Is()], comparators=[select_node(context, (1,)).ast]),
+        symbol_table=context.symbol_table)
@@ -1,15 +1,94 @@
+from moa import ast
 from moa.shape import calculate_shapes
 from moa.dnf import reduce_to_dnf
-from moa.onf import reduce_to_onf
+from moa.onf import reduce_to_onf, add_output_arguments, write_in_place, plan_memory
+from moa.optimize import fold_constants, remove_identities, simplify, eliminate_common_subexpressions, hoist_loop_invariants, simplify_conditions, reduce_strength
+from moa.loop import fuse_loops, interchange_loops, collapse_loops, tile_loops, unroll_loops, parallelize_loops, parallelize_reductions, interleave_accumulators, vectorize_loops
 from moa.backend import generate_python_source
 
 
-def compiler(context, backend='python', include_conditions=True, use_numba=False):
-    shape_context = calculate_shapes(context)
-    dnf_context = reduce_to_dnf(shape_context)
+def compiler(context, backend='python', include_conditions=True, use_numba=False, constant_folding=True, simplify_expressions=False, eliminate_subexpressions=True, hoist_invariants=True, reorder_loops=True, fusion=True, tiling=False, tile_sizes=None, unrolling=False, unroll_threshold=16, unroll_factor=None, parallel=False, num_threads=None, num_partitions=None, accumulators=None, vectorize=False, out=False, inplace=None, memory_planning=True, strength_reduction=False, collapse=False):
+    if isinstance(context, ast.Context):
+        dnf_context = _reduce_to_dnf(context, simplify_expressions, constant_folding)
+    else:
+        # several expressions are compiled into one function returning each result
+        block_context = ast.join_contexts(context)
+        dnf_context = []
+        symbol_table = block_context.symbol_table
+        for node in block_context.ast.child:
+            expression_context = _reduce_to_dnf(ast.create_context(ast=node, symbol_table=symbol_table), simplify_expressions, constant_folding)
+            symbol_table = expression_context.symbol_table
+            dnf_context.append(expression_context)
+
     onf_context = reduce_to_onf(dnf_context, include_conditions=include_conditions)
+    if out:
+        onf_context = add_output_arguments(onf_context, include_conditions=include_conditions)
+    elif inplace is not None:
+        onf_context = write_in_place(onf_context, inplace)
+    if constant_folding:
+        onf_context = simplify_conditions(onf_context)
+    if fusion:
+        onf_context = fuse_loops(onf_context)
+    if reorder_loops:
+        onf_context = interchange_loops(onf_context)
+        if fusion:
+            # interchange may align loop nests of different expressions
+            onf_context = fuse_loops(onf_context)
+    if collapse:
+        onf_context = collapse_loops(onf_context)
+    if tiling:
+        onf_context = tile_loops(onf_context, tile_sizes=tile_sizes)
+    if unrolling:
+        onf_context = unroll_loops(onf_context, unroll_threshold=unroll_threshold, unroll_factor=unroll_factor)
+    if parallel:
+        num_partitions = _num_partitions(use_numba, num_threads, num_partitions)
+        if num_partitions is not None:
+            onf_context = parallelize_reductions(onf_context, num_partitions=num_partitions)
+    if accumulators:
+        onf_context = interleave_accumulators(onf_context, num_accumulators=accumulators)
+    if hoist_invariants:
+        onf_context, _ = hoist_loop_invariants(onf_context)
+    if eliminate_subexpressions:
+        onf_context, _ = eliminate_common_subexpressions(onf_context)
+    if vectorize:
+        onf_context = vectorize_loops(onf_context)
+    if parallel:
+        onf_context = parallelize_loops(onf_context)
+    if memory_planning:
+        onf_context, _ = plan_memory(onf_context)
+    if strength_reduction:
+        onf_context = reduce_strength(onf_context)
 
     if backend == 'python':
-        return generate_python_source(onf_context, materialize_scalars=True, use_numba=use_numba)
+        return generate_python_source(onf_context, materialize_scalars=True, use_numba=use_numba, num_threads=num_threads, use_numpy=vectorize)
     else:
         raise ValueError(f'unknown backend {backend}')
+
+
+def _num_partitions(use_numba, num_threads, num_partitions):
+    """Number of chunks parallel reductions are split into or None
+
+    Without numba the chunks would run one after another, so
+    reductions are only split when num_partitions is given. With
+    numba it defaults to the number of threads.
+    """
+    if num_partitions is not None or not use_numba:
+        return num_partitions
+    elif num_threads is not None:
+        return num_threads
+
+    import numba
+    return numba.config.NUMBA_NUM_THREADS
+
+
+def _reduce_to_dnf(context, simplify_expressions, constant_folding):
+    shape_context = calculate_shapes(context)
+    if simplify_expressions:
+        shape_context = simplify(shape_context)
+    if constant_folding:
+        shape_context = fold_constants(shape_context)
+
+    dnf_context = reduce_to_dnf(shape_context)
+    if constant_folding:
+        dnf_context = remove_identities(fold_constants(dnf_context))
+    return dnf_context
@@ -0,0 +1,263 @@
+"""Dependence analysis of ONF loop nests
+
+Array accesses within a loop are described by affine access
+functions of the loop indicies extracted from the psi index vectors.
+Pairs of accesses to the same array (at least one of them a write)
+are tested for dependence and summarized by direction vectors over
+their common loops, outermost first, where ``'<'`` means that the
+source iteration precedes the sink iteration, ``'='`` that both are
+the same iteration and ``'>'`` that the source iteration follows.
+Only lexicographically positive direction vectors (and loop
+independent ``'='`` vectors between statements in program order) are
+dependences.
+
+"""
+import collections
+import itertools
+import math
+
+from . import ast
+
+
+Dependence = collections.namedtuple('Dependence', ['array_name', 'indicies', 'direction'])
+
+_Access = collections.namedtuple('_Access', ['array_name', 'subscript', 'is_write', 'loops', 'order'])
+
+_DIRECTIONS = ('<', '=', '>')
+
+
+def written_scalars(statements):
+    """Names of scalars assigned by statements"""
+    return {statement.child[0].attrib[0] for statement in statements if statement.child[0].symbol == (ast.NodeSymbol.ARRAY,)}
+
+
+def is_private_scalar(statements, scalar_name):
+    """Scalar is assigned before it is read within an iteration"""
+    references = [statement for statement in statements if scalar_name in ast.array_names(statement)]
+    first_statement = references[0]
+    return first_statement.child[0].symbol == (ast.NodeSymbol.ARRAY,) and \
+        first_statement.child[0].attrib[0] == scalar_name and \
+        scalar_name not in ast.array_names(first_statement.child[1])
+
+
+def affine_element(context, element):
+    """Linear form of index element or None when it is not affine
+
+    ``(2 * i) + (n - 1)`` => ``{'i': 2, 'n': 1, None: -1}`` where the
+    key None holds the constant term. Scalar constants of the symbol
+    table are folded into the constant term.
+    """
+    if not ast.is_symbolic_element(element):
+        return {None: element}
+
+    if element.symbol in {(ast.NodeSymbol.ARRAY,), (ast.NodeSymbol.INDEX,)}:
+        node_symbol = context.symbol_table.get(element.attrib[0])
+        if node_symbol is not None and node_symbol.symbol == ast.NodeSymbol.ARRAY and node_symbol.shape == () and \
+           node_symbol.value is not None and not ast.has_symbolic_elements(node_symbol.value):
+            return {None: node_symbol.value[0]}
+        return {element.attrib[0]: 1}
+
+    if element.symbol in {(ast.NodeSymbol.PLUS,), (ast.NodeSymbol.MINUS,)}:
+        left, right = affine_element(context, element.child[0]), affine_element(context, element.child[1])
+        if left is None or right is None:
+            return None
+        sign = 1 if element.symbol == (ast.NodeSymbol.PLUS,) else -1
+        form = dict(left)
+        for name, coefficient in right.items():
+            form[name] = form.get(name, 0) + sign * coefficient
+        return form
+
+    if element.symbol == (ast.NodeSymbol.TIMES,):
+        left, right = affine_element(context, element.child[0]), affine_element(context, element.child[1])
+        if left is None or right is None:
+            return None
+        if set(left) == {None}:
+            left, right = right, left
+        if set(right) != {None}:
+            return None
+        return {name: coefficient * right[None] for name, coefficient in left.items()}
+
+    return None
+
+
+def access_function(context, node):
+    """Array name and affine subscript of a psi or scalar array node
+
+    Subscripts are a tuple with one linear form (see
+    :func:`affine_element`) per dimension, None for dimensions that
+    are not affine and None altogether when the index is unknown.
+    """
+    if node.symbol == (ast.NodeSymbol.ARRAY,):
+        return node.attrib[0], ()
+
+    vector = context.symbol_table[node.child[0].attrib[0]].value
+    if vector is None:
+        return node.child[1].attrib[0], None
+    return node.child[1].attrib[0], tuple(affine_element(context, element) for element in vector)
+
+
+def _accesses(context, node, loops=(), path=()):
+    """Accesses of statements within node in program order
+
+    Reads of an assignment precede its write. Each access records the
+    enclosing loops (path and index name) below node.
+    """
+    def _reads(node):
+        if node.symbol == (ast.NodeSymbol.PSI,):
+            return (node,)
+        elif node.symbol == (ast.NodeSymbol.ARRAY,) and node.shape == ():
+            return (node,)
+        return tuple(read for child in node.child for read in _reads(child))
+
+    accesses = ()
+    if node.symbol == (ast.NodeSymbol.LOOP,):
+        loops = loops + ((path, node.attrib[0]),)
+
+    if node.symbol == (ast.NodeSymbol.ASSIGN,):
+        for read in _reads(node.child[1]):
+            accesses = accesses + ((read, False, loops),)
+        accesses = accesses + ((node.child[0], True, loops),)
+        return accesses
+
+    for i, child in enumerate(node.child):
+        accesses = accesses + _accesses(context, child, loops, path + (i,))
+    return accesses
+
+
+def _direction_sets(source, sink, common_indicies, loop_indicies):
+    """Possible directions of each common loop or None when independent
+
+    Each dimension is tested on its own: ZIV (no loop index), GCD and
+    strong SIV (single common index with equal coefficients) tests.
+    """
+    directions = {index_name: set(_DIRECTIONS) for index_name in common_indicies}
+    distances = {}
+
+    if source.subscript is None or sink.subscript is None:
+        return directions
+
+    for source_form, sink_form in zip(source.subscript, sink.subscript):
+        if source_form is None or sink_form is None:
+            continue
+
+        # source(I) = sink(I') <=> sum a_k I_k - sum b_k I'_k = delta
+        def _parameters(form):
+            return {name: coefficient for name, coefficient in form.items() if name is not None and name not in loop_indicies and coefficient}
+
+        if _parameters(source_form) != _parameters(sink_form):
+            continue
+        delta = sink_form.get(None, 0) - source_form.get(None, 0)
+
+        index_names = {name for form in (source_form, sink_form) for name, coefficient in form.items() if name in loop_indicies and coefficient}
+        if not index_names:
+            if delta != 0:
+                return None
+            continue
+
+        divisor = math.gcd(*(form.get(name, 0) for form in (source_form, sink_form) for name in index_names))
+        if delta % divisor != 0:
+            return None
+
+        if len(index_names) == 1 and index_names <= set(common_indicies):
+            index_name = index_names.pop()
+            coefficient = source_form.get(index_name, 0)
+            if coefficient != sink_form.get(index_name, 0):
+                continue
+            if delta % coefficient != 0:
+                return None
+
+            distance = -delta // coefficient
+            if distances.setdefault(index_name, distance) != distance:
+                return None
+            directions[index_name] &= {'<' if distance > 0 else ('=' if distance == 0 else '>')}
+            if not directions[index_name]:
+                return None
+    return directions
+
+
+def dependences(context, loop):
+    """Dependences between accesses within loop
+
+    Returns a tuple of :class:`Dependence` with the array, the index
+    names of the common loops of source and sink (outermost first,
+    starting with loop) and a direction vector. Loops enclosing loop
+    are fixed and their indicies treated as parameters. Scalars that
+    are assigned before they are read within an iteration of a loop
+    are private to it (see :func:`is_private_scalar`) and carry no
+    dependence at that loop or the loops enclosing it.
+    """
+    accesses = tuple(
+        _Access(*access_function(context, node), is_write, loops, order)
+        for order, (node, is_write, loops) in enumerate(_accesses(context, loop)))
+    loop_indicies = {index_name for access in accesses for _, index_name in access.loops}
+
+    # loops in which each scalar is private
+    private_loops = {}
+    for access in accesses:
+        if access.subscript != ():
+            continue
+        for path, _ in access.loops:
+            node = loop
+            for i in path:
+                node = node.child[i]
+            if is_private_scalar(ast.assignment_nodes(node.child[0].child), access.array_name):
+                private_loops.setdefault(access.array_name, set()).add(path)
+
+    result = set()
+    for source, sink in itertools.product(accesses, repeat=2):
+        if source.array_name != sink.array_name or not (source.is_write or sink.is_write):
+            continue
+
+        common_loops = ()
+        for source_loop, sink_loop in zip(source.loops, sink.loops):
+            if source_loop != sink_loop:
+                break
+            common_loops = common_loops + (source_loop,)
+        common_indicies = tuple(index_name for _, index_name in common_loops)
+
+        directions = _direction_sets(source, sink, common_indicies, loop_indicies)
+        if directions is None:
+            continue
+
+        if source.subscript == ():
+            private_depth = max((i for i, (path, _) in enumerate(common_loops) if path in private_loops.get(source.array_name, ())), default=-1)
+            for _, index_name in common_loops[:private_depth + 1]:
+                directions[index_name] &= {'='}
+
+        for direction in itertools.product(*(sorted(directions[index_name], key=_DIRECTIONS.index) for index_name in common_indicies)):
+            carried = next((d for d in direction if d != '='), None)
+            if carried == '<' or (carried is None and source.order < sink.order):
+                result.add(Dependence(source.array_name, common_indicies, direction))
+    return tuple(sorted(result))
+
+
+def is_parallel(context, loop):
+    """No dependence is carried by loop
+
+    Iterations of loop may run in any order (or concurrently) when
+    every dependence within it has direction ``'='`` at loop.
+    """
+    return all(dependence.direction[0] == '=' for dependence in dependences(context, loop))
+
+
+def can_interchange(context, outer, inner):
+    """Loops outer and inner of a perfect loop nest may be interchanged
+
+    Every direction vector must remain lexicographically positive
+    after exchanging the directions of the two loops.
+    """
+    depth = 0
+    node = outer
+    while node != inner:
+        statements = node.child[0].child
+        if len(statements) != 1 or statements[0].symbol != (ast.NodeSymbol.LOOP,):
+            return False
+        node = statements[0]
+        depth = depth + 1
+
+    for dependence in dependences(context, outer):
+        direction = list(dependence.direction)
+        direction[0], direction[depth] = direction[depth], direction[0]
+        if next((d for d in direction if d != '='), '<') != '<':
+            return False
+    return True
@@ -12,6 +12,9 @@ def add_indexing_node(context):
     """Adds indexing into the MOA AST
 
     For example: <i0 i1> psi (A + B)
+
+    Every expression within a BLOCK is indexed by the same vector so
+    that the expressions share loops.
     """
     condition_node = None
     if context.ast.symbol == (ast.NodeSymbol.CONDITION,):
@@ -27,7 +30,11 @@ def add_indexing_node(context):
     array_name = ast.generate_unique_array_name(context)
     context = ast.add_symbol(context, array_name, ast.NodeSymbol.ARRAY, (len(index_symbols),), None, index_symbols)
     vector_node = ast.Node((ast.NodeSymbol.ARRAY,), (len(index_symbols),), (array_name,), ())
-    node = ast.Node((ast.NodeSymbol.PSI,), context.ast.shape, (), (vector_node, context.ast))
+    if context.ast.symbol == (ast.NodeSymbol.BLOCK,):
+        node = ast.Node((ast.NodeSymbol.BLOCK,), context.ast.shape, (), tuple(
+            ast.Node((ast.NodeSymbol.PSI,), context.ast.shape, (), (vector_node, child)) for child in context.ast.child))
+    else:
+        node = ast.Node((ast.NodeSymbol.PSI,), context.ast.shape, (), (vector_node, context.ast))
 
     if condition_node:
         node = ast.Node((ast.NodeSymbol.CONDITION,), node.shape, (), (condition_node, node))
@@ -68,6 +75,9 @@ def _reduce_replacement(context):
         ((ast.NodeSymbol.PSI,), (None, ((ast.NodeSymbol.PSI,),),)): _reduce_psi_psi,
         ((ast.NodeSymbol.PSI,), (None, ((ast.NodeSymbol.TRANSPOSE,),),)): _reduce_psi_transpose,
         ((ast.NodeSymbol.PSI,), (None, ((ast.NodeSymbol.TRANSPOSEV,),),)): _reduce_psi_transposev,
+        ((ast.NodeSymbol.PSI,), (None, ((ast.NodeSymbol.RAV,),),)): _reduce_psi_ravel,
+        ((ast.NodeSymbol.PSI,), (None, ((ast.NodeSymbol.RESHAPE,),),)): _reduce_psi_reshape,
+        ((ast.NodeSymbol.PSI,), (None, ((ast.NodeSymbol.SLICE,),),)): _reduce_psi_slice,
         ((ast.NodeSymbol.PSI,), (None, ((ast.NodeSymbol.PLUS,),),)): _reduce_psi_plus_minus_times_divide,
         ((ast.NodeSymbol.PSI,), (None, ((ast.NodeSymbol.MINUS,),),)): _reduce_psi_plus_minus_times_divide,
         ((ast.NodeSymbol.PSI,), (None, ((ast.NodeSymbol.TIMES,),),)): _reduce_psi_plus_minus_times_divide,
@@ -82,6 +92,8 @@ def _reduce_replacement(context):
         ((ast.NodeSymbol.PSI,), (None, ((ast.NodeSymbol.REDUCE, ast.NodeSymbol.MINUS),),)): _reduce_psi_reduce_plus_minus_times_divide,
         ((ast.NodeSymbol.PSI,), (None, ((ast.NodeSymbol.REDUCE, ast.NodeSymbol.TIMES),),)): _reduce_psi_reduce_plus_minus_times_divide,
         ((ast.NodeSymbol.PSI,), (None, ((ast.NodeSymbol.REDUCE, ast.NodeSymbol.DIVIDE),),)): _reduce_psi_reduce_plus_minus_times_divide,
+        ((ast.NodeSymbol.PSI,), (None, ((ast.NodeSymbol.REDUCE, ast.NodeSymbol.MAXIMUM),),)): _reduce_psi_reduce_plus_minus_times_divide,
+        ((ast.NodeSymbol.PSI,), (None, ((ast.NodeSymbol.REDUCE, ast.NodeSymbol.MINIMUM),),)): _reduce_psi_reduce_plus_minus_times_divide,
         # inner product
         ((ast.NodeSymbol.PSI,), (None, ((ast.NodeSymbol.DOT, ast.NodeSymbol.PLUS  , ast.NodeSymbol.PLUS),),)): _reduce_psi_inner_plus_minus_times_divide,
         ((ast.NodeSymbol.PSI,), (None, ((ast.NodeSymbol.DOT, ast.NodeSymbol.MINUS , ast.NodeSymbol.PLUS),),)): _reduce_psi_inner_plus_minus_times_divide,
@@ -154,8 +166,82 @@ def _reduce_psi_transposev(context):
     left_node_symbol = ast.select_array_node_symbol(context, (0,))
     left_left_node_symbol = ast.select_array_node_symbol(context, (1, 0))
 
+    # array dimension k is placed at the position of k-th element in sorted transpose vector
+    transpose_order = sorted(left_left_node_symbol.value)
+    array_name = ast.generate_unique_array_name(context)
+    array_values = tuple(left_node_symbol.value[transpose_order.index(element)] for element in left_left_node_symbol.value)
+    context = ast.add_symbol(context, array_name, ast.NodeSymbol.ARRAY, (len(array_values),), None, array_values)
+
+    return ast.create_context(
+        ast=ast.Node((ast.NodeSymbol.PSI,), context.ast.shape, (), (
+            ast.Node((ast.NodeSymbol.ARRAY,), (len(array_values),), (array_name,), ()),
+            ast.select_node(context, (1, 1)).ast)),
+        symbol_table=context.symbol_table)
+
+
+def _reshape_index(context, index, shape, array_shape):
+    """Map index within shape to index within array_shape with equal number of elements
+
+    Trailing dimensions that both shapes share keep their index and
+    the remaining index is converted through a flat row major offset.
+    """
+    trailing_index = ()
+    while index and shape and array_shape and shape[-1] == array_shape[-1]:
+        trailing_index = index[-1:] + trailing_index
+        index, shape, array_shape = index[:-1], shape[:-1], array_shape[:-1]
+
+    context, offset = ast.ravel_index(context, index, shape)
+    context, leading_index = ast.unravel_index(context, offset, array_shape)
+    return context, leading_index + trailing_index
+
+
+def _reduce_psi_reshape_index(context, shape, array_node):
+    index_vector = ast.select_array_node_symbol(context, (0,)).value
+    if len(index_vector) != len(shape):
+        raise MOAReductionError('<...> PSI RESHAPE ... replacement requires a full index')
+
+    context, array_values = _reshape_index(context, index_vector, shape, array_node.shape)
+    if not array_values:
+        return ast.create_context(ast=array_node, symbol_table=context.symbol_table)
+
+    array_name = ast.generate_unique_array_name(context)
+    context = ast.add_symbol(context, array_name, ast.NodeSymbol.ARRAY, (len(array_values),), None, array_values)
+
+    return ast.create_context(
+        ast=ast.Node((ast.NodeSymbol.PSI,), context.ast.shape, (), (
+            ast.Node((ast.NodeSymbol.ARRAY,), (len(array_values),), (array_name,), ()),
+            array_node)),
+        symbol_table=context.symbol_table)
+
+
+def _reduce_psi_ravel(context):
+    """<i> psi rav ... => <i // n, i % n> psi ... with shape <m n>"""
+    return _reduce_psi_reshape_index(context, ast.select_node_shape(context, (1,)), ast.select_node(context, (1, 0)).ast)
+
+
+def _reduce_psi_reshape(context):
+    """<i j k> psi <l m n> rho ... => <(i*m + j) // p, (i*m + j) % p, k> psi ... with shape <q p n>"""
+    return _reduce_psi_reshape_index(context, ast.select_node_shape(context, (1,)), ast.select_node(context, (1, 1)).ast)
+
+
+def _reduce_psi_slice(context):
+    """<i j k> psi <<b0 e0 s0> <b1 e1 s1>> slice ... => <b0 + i*s0, b1 + j*s1, k> psi ..."""
+    index_vector = ast.select_array_node_symbol(context, (0,)).value
+    slice_node_symbol = ast.select_array_node_symbol(context, (1, 0))
+
+    num_slices = slice_node_symbol.shape[0]
+    if len(index_vector) < num_slices:
+        raise MOAReductionError('<...> PSI SLICE ... replacement requires index to include all sliced dimensions')
+
+    array_values = ()
+    for i in range(num_slices):
+        start, _, step = slice_node_symbol.value[i*3:(i+1)*3]
+        context, element = ast.element_operation(context, ast.NodeSymbol.TIMES, index_vector[i], step)
+        context, element = ast.element_operation(context, ast.NodeSymbol.PLUS, start, element)
+        array_values = array_values + (element,)
+    array_values = array_values + index_vector[num_slices:]
+
     array_name = ast.generate_unique_array_name(context)
-    array_values = tuple(s for _, s in sorted(zip(left_left_node_symbol.value, left_node_symbol.value), key=lambda pair: pair[0]))
     context = ast.add_symbol(context, array_name, ast.NodeSymbol.ARRAY, (len(array_values),), None, array_values)
 
     return ast.create_context(
@@ -166,20 +252,28 @@ def _reduce_psi_transposev(context):
 
 
 def _reduce_psi_reduce_plus_minus_times_divide(context):
+    """<i j> psi (+red over axes (0 2)) ... => +red (k l) <k i l j> psi ..."""
     right_right_node = ast.select_node(context, (1, 0)).ast
     left_node_symbol = ast.select_array_node_symbol(context, (0,))
 
-    index_name = ast.generate_unique_index_name(context)
-    context = ast.add_symbol(context, index_name, ast.NodeSymbol.INDEX, (), None, (0, right_right_node.shape[0], 1))
+    index_names = ()
+    index_vector = left_node_symbol.value
+    for axis in shape.reduction_axes(context, (1,)):
+        if axis > len(index_vector):
+            raise MOAReductionError('<...> PSI REDUCE ... replacement requires index to include all dimensions before reduced axis')
+
+        index_name = ast.generate_unique_index_name(context)
+        context = ast.add_symbol(context, index_name, ast.NodeSymbol.INDEX, (), None, (0, right_right_node.shape[axis], 1))
+        index_names = index_names + (index_name,)
+        index_vector = index_vector[:axis] + (ast.Node((ast.NodeSymbol.ARRAY,), (), (index_name,), ()),) + index_vector[axis:]
 
-    index_vector = (ast.Node((ast.NodeSymbol.ARRAY,), (), (index_name,), ()),) + left_node_symbol.value
     vector_name = ast.generate_unique_array_name(context)
     context = ast.add_symbol(context, vector_name, ast.NodeSymbol.ARRAY, (len(index_vector),), None, index_vector)
 
     right_node = ast.select_node(context, (1,))
 
     return ast.create_context(
-        ast=ast.Node(right_node.ast.symbol, context.ast.shape, (index_name,), (
+        ast=ast.Node(right_node.ast.symbol, context.ast.shape, index_names, (
             ast.Node((ast.NodeSymbol.PSI,), context.ast.shape, (), (
                 ast.Node((ast.NodeSymbol.ARRAY,), (len(index_vector),), (vector_name,), ()),
                 right_right_node)),)),
@@ -225,7 +319,7 @@ def _reduce_psi_inner_plus_minus_times_divide(context):
     context = ast.add_symbol(context, left_vector_name, ast.NodeSymbol.ARRAY, (len(left_vector_value),), None, left_vector_value)
 
     right_vector_name = ast.generate_unique_array_name(context)
-    right_vector_value = (ast.Node((ast.NodeSymbol.INDEX,), (), (reduction_symbol_name,), ()),) + index_vector.value[-(len(right_node.ast.shape)-1):]
+    right_vector_value = (ast.Node((ast.NodeSymbol.INDEX,), (), (reduction_symbol_name,), ()),) + index_vector.value[len(index_vector.value)-(len(right_node.ast.shape)-1):]
     context = ast.add_symbol(context, right_vector_name, ast.NodeSymbol.ARRAY, (len(right_vector_value),), None, right_vector_value)
 
     return ast.create_context(
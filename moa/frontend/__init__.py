@@ -1,4 +1,4 @@
-from .array import LazyArray
+from .array import LazyArray, compile_fused
 
 
 def parse(source, frontend='moa'):
@@ -3,6 +3,7 @@ from ..shape import calculate_shapes
 from ..dnf import reduce_to_dnf
 from ..onf import reduce_to_onf
 from ..analysis import metric_flops
+from ..optimize import simplify, eliminate_common_subexpressions
 from ..visualize import visualize_ast, print_ast
 
 
@@ -14,22 +15,52 @@ class LazyArray:
         '/': ast.NodeSymbol.DIVIDE,
     }
 
-    def __init__(self, shape, value=None, name=None):
+    REDUCE_OPPERATION_MAP = {
+        **OPPERATION_MAP,
+        'max': ast.NodeSymbol.MAXIMUM,
+        'min': ast.NodeSymbol.MINIMUM,
+    }
+
+    def __init__(self, shape, value=None, name=None, fmt='row', strides=None):
         if name is None and value is None:
             raise ValueError('either name or value must be supplied for LazyArray')
 
-        if value is not None:
-            raise NotImplemenetedError('not able to pass in value at compile time at this moment')
-
         self.context = ast.create_context()
 
         shape = self._create_array_from_list_tuple(shape)
+
+        # storage layout of array argument (gamma)
+        if fmt == 'row' and strides is None:
+            layout = None
+        elif fmt == 'column' and strides is None:
+            layout = 'column'
+        elif fmt == 'strided' and strides is not None:
+            if len(strides) != len(shape):
+                raise ValueError('"strided" format requires a stride for each dimension')
+            layout = tuple(self._create_array_from_list_tuple(strides))
+        else:
+            raise ValueError(f'format "{fmt}" must be "row", "column", or "strided" with strides')
+
+        if value is not None:
+            if ast.has_symbolic_elements(shape):
+                raise ValueError('array with compile time value must have known shape')
+
+            if layout is not None:
+                raise ValueError('array with compile time value must have "row" format')
+
+            value = (value,) if isinstance(value, (int, float)) else tuple(value)
+            total = 1
+            for bound in shape:
+                total *= bound
+            if total != len(value):
+                raise ValueError('number of values must match shape')
+
         name = name or ast.generate_unique_array_name(self.context)
 
         self.context = ast.create_context(
             ast=ast.Node((ast.NodeSymbol.ARRAY,), None, (name,), ()),
             symbol_table=self.context.symbol_table)
-        self.context = ast.add_symbol(self.context, name, ast.NodeSymbol.ARRAY, shape, None, value)
+        self.context = ast.add_symbol(self.context, name, ast.NodeSymbol.ARRAY, shape, None, value, layout)
 
     def __getitem__(self, index):
         if isinstance(index, (int, str, slice)):
@@ -58,8 +89,18 @@ class LazyArray:
             self.context = ast.create_context(
                 ast=ast.Node((ast.NodeSymbol.PSI,), None, (), (ast.Node((ast.NodeSymbol.ARRAY,), None, (array_name,), ()), self.context.ast)),
                 symbol_table=self.context.symbol_table)
+        # trailing full slices `:` leave the array unchanged
+        while strides and strides[-1] == (None, None, None):
+            strides = strides[:-1]
+
         if strides:
-            raise NotImplemenetedError('strides not implemented')
+            slice_values = self._create_array_from_list_tuple(sum(strides, ()))
+
+            array_name = ast.generate_unique_array_name(self.context)
+            self.context = ast.add_symbol(self.context, array_name, ast.NodeSymbol.ARRAY, (len(strides), 3), None, tuple(slice_values))
+            self.context = ast.create_context(
+                ast=ast.Node((ast.NodeSymbol.SLICE,), None, (), (ast.Node((ast.NodeSymbol.ARRAY,), None, (array_name,), ()), self.context.ast)),
+                symbol_table=self.context.symbol_table)
         return self
 
     def _create_array_from_int_float_string(self, value):
@@ -103,6 +144,22 @@ class LazyArray:
                 symbol_table=self.context.symbol_table)
         return self
 
+    def ravel(self):
+        self.context = ast.create_context(
+            ast=ast.Node((ast.NodeSymbol.RAV,), None, (), (self.context.ast,)),
+            symbol_table=self.context.symbol_table)
+        return self
+
+    def reshape(self, shape):
+        symbolic_vector = self._create_array_from_list_tuple(shape)
+
+        array_name = ast.generate_unique_array_name(self.context)
+        self.context = ast.add_symbol(self.context, array_name, ast.NodeSymbol.ARRAY, (len(symbolic_vector),), None, tuple(symbolic_vector))
+        self.context = ast.create_context(
+            ast=ast.Node((ast.NodeSymbol.RESHAPE,), None, (), (ast.Node((ast.NodeSymbol.ARRAY,), None, (array_name,), ()), self.context.ast)),
+            symbol_table=self.context.symbol_table)
+        return self
+
     def outer(self, operation, array):
         if operation not in self.OPPERATION_MAP:
             raise ValueError(f'operation {operation} not one of allowed operations {self.OPPERATION_MAP.keys()}')
@@ -141,14 +198,25 @@ class LazyArray:
             raise TypeError(f'not known how to handle outer product with type {type(array)}')
         return self
 
-    def reduce(self, operation):
-        if operation not in self.OPPERATION_MAP:
-            raise ValueError(f'operation {operation} not one of allowed operations {self.OPPERATION_MAP.keys()}')
+    def reduce(self, operation, axis=None):
+        if operation not in self.REDUCE_OPPERATION_MAP:
+            raise ValueError(f'operation {operation} not one of allowed operations {self.REDUCE_OPPERATION_MAP.keys()}')
+
+        # default reduces over leading axis
+        if axis is None:
+            axes = ()
+        elif isinstance(axis, int):
+            axes = (axis,)
+        else:
+            axes = tuple(axis)
+
+        if len(axes) > 1 and operation in {'-', '/'}:
+            raise ValueError(f'reduction over multiple axes requires an associative operation not {operation}')
 
-        moa_operation = (ast.NodeSymbol.REDUCE, self.OPPERATION_MAP[operation])
+        moa_operation = (ast.NodeSymbol.REDUCE, self.REDUCE_OPPERATION_MAP[operation])
 
         self.context = ast.create_context(
-            ast=ast.Node(moa_operation, None, (), (self.context.ast,)),
+            ast=ast.Node(moa_operation, None, axes, (self.context.ast,)),
             symbol_table=self.context.symbol_table)
         return self
 
@@ -218,11 +286,16 @@ class LazyArray:
 
     def analysis(self):
         shape_context = calculate_shapes(self.context)
-        dnf_context = reduce_to_dnf(shape_context)
+        simplified_context = simplify(shape_context)
+        dnf_context = reduce_to_dnf(simplified_context)
+        onf_context = reduce_to_onf(dnf_context)
+        _, num_eliminated = eliminate_common_subexpressions(onf_context)
 
         return {
             'unoptimized_flops': metric_flops(shape_context),
-            'optimized_flops': metric_flops(dnf_context)
+            'simplified_flops': metric_flops(simplified_context),
+            'optimized_flops': metric_flops(dnf_context),
+            'eliminated_subexpressions': num_eliminated,
         }
 
     def visualize(self, stage=None, as_text=False):
@@ -245,3 +318,20 @@ class LazyArray:
             return dot.pipe(format='svg').decode(dot._encoding)
         except ImportError as e:
             return None
+
+
+def compile_fused(arrays, backend='python', **kwargs):
+    """Compile expressions into a single function returning each result
+
+    Each expression gets its own loop nest within the function and
+    nests with identical bounds are fused so that arguments are read
+    once and evaluated together in one sweep. For example the sum and
+    sum of squares of an array for computing its mean and variance,
+    or ``A + B``, ``(A + B).reduce('+')`` and ``A * B`` from a single
+    pass over ``A`` and ``B``. The expressions may have different
+    shapes.
+    """
+    if len(arrays) == 0:
+        raise ValueError('at least one array must be supplied to compile_fused')
+
+    return compiler.compiler([array.context for array in arrays], backend=backend, **kwargs)
@@ -12,7 +12,7 @@ from .. import ast
 class MOALexer(sly.Lexer):
     tokens = {
         PLUS, MINUS, TIMES, DIVIDE,
-        PSI, TAKE, DROP, CAT,
+        PSI, TAKE, DROP, CAT, RESHAPE,
         IOTA, DIM, TAU, SHAPE, RAV, TRANSPOSE,
         LANGLEBRACKET, RANGLEBRACKET,
         LPAREN, RPAREN,
@@ -61,6 +61,7 @@ class MOALexer(sly.Lexer):
     IDENTIFIER['take'] = TAKE
     IDENTIFIER['drop'] = DROP
     IDENTIFIER['cat'] = CAT
+    IDENTIFIER['rho'] = RESHAPE
 
     def error(self, t):
         raise ValueError(f"Illegal character '{t.value[0]}' no valid token can be formed from '{t.value}' on line {self.lineno}")
@@ -113,6 +114,7 @@ class MOAParser(sly.Parser):
        'TAKE',
        'DROP',
        'CAT',
+       'RESHAPE',
        'TRANSPOSE')
     def binary_operation(self, p):
         binary_map = {
@@ -124,6 +126,7 @@ class MOAParser(sly.Parser):
             'take': ast.NodeSymbol.TAKE,
             'drop': ast.NodeSymbol.DROP,
             'cat': ast.NodeSymbol.CAT,
+            'rho': ast.NodeSymbol.RESHAPE,
             'tran': ast.NodeSymbol.TRANSPOSEV,
         }
         return binary_map[p[0].lower()]
@@ -0,0 +1,1111 @@
+"""Loop transformations of ONF
+
+Transformations rewrite the loop nests generated by
+:func:`moa.onf.naive_reduction` and are applied by
+:func:`moa.compiler.compiler` after reduction to ONF.
+
+"""
+from . import ast, dependence
+
+
+_REDUCTION_SYMBOLS = {
+    (ast.NodeSymbol.PLUS,), (ast.NodeSymbol.MINUS,),
+    (ast.NodeSymbol.TIMES,), (ast.NodeSymbol.DIVIDE,),
+    (ast.NodeSymbol.MAXIMUM,), (ast.NodeSymbol.MINIMUM,),
+}
+
+
+# helpers
+def perfect_nest(node):
+    """Loops of perfect loop nest starting at node and innermost statements
+
+    LOOP i (LOOP j (LOOP k (statements))) => (i, j, k), statements
+    """
+    loops = ()
+    statements = (node,)
+    while len(statements) == 1 and statements[0].symbol == (ast.NodeSymbol.LOOP,):
+        loops = loops + (statements[0],)
+        statements = statements[0].child[0].child
+    return loops, statements
+
+
+def build_nest(loops, statements):
+    """Perfect loop nest from loops (outermost first) around statements"""
+    for loop in loops[::-1]:
+        statements = (ast.Node((ast.NodeSymbol.LOOP,), loop.shape, loop.attrib, (
+            ast.Node((ast.NodeSymbol.BLOCK,), loop.child[0].shape, (), statements),)),)
+    return statements[0]
+
+
+def _unit_stride_indicies(element):
+    """Indicies with coefficient one within affine index element"""
+    if not ast.is_symbolic_element(element):
+        return set()
+    elif element.symbol in {(ast.NodeSymbol.ARRAY,), (ast.NodeSymbol.INDEX,)}:
+        return {element.attrib[0]}
+    elif element.symbol == (ast.NodeSymbol.PLUS,):
+        return _unit_stride_indicies(element.child[0]) | _unit_stride_indicies(element.child[1])
+    elif element.symbol == (ast.NodeSymbol.MINUS,):
+        return _unit_stride_indicies(element.child[0])
+    return set()
+
+
+def is_permutable(context, loops, statements):
+    """Loops of perfect nest may be executed in any order
+
+    Conservative check that every array written within the nest is
+    either indexed by all loop indicies (each iteration writes a
+    distinct element), a scalar that is assigned before use within an
+    iteration (private), or a scalar accumulator ``acc = acc op
+    expression`` of a reduction.
+    """
+    index_names = {loop.attrib[0] for loop in loops}
+
+    # loop bounds must not depend on other loops
+    for loop in loops:
+        for element in context.symbol_table[loop.attrib[0]].value:
+            if index_names & set(ast.element_symbols(element)):
+                return False
+
+    statements = ast.assignment_nodes(statements)
+
+    written_vectors = {}
+    scalar_statements = {}
+    for statement in statements:
+        target = statement.child[0]
+        if target.symbol == (ast.NodeSymbol.PSI,):
+            vector = context.symbol_table[target.child[0].attrib[0]].value
+            if not all(any(ast.is_index_element(element, index_name) for element in vector) for index_name in index_names):
+                return False
+            array_name = target.child[1].attrib[0]
+            if written_vectors.setdefault(array_name, vector) != vector:
+                return False
+        else:
+            scalar_statements[target.attrib[0]] = ()
+
+    # reads of written arrays must access the element of the iteration
+    for statement in statements:
+        for node in ast.psi_nodes(statement):
+            array_name = node.child[1].attrib[0]
+            if array_name in written_vectors and context.symbol_table[node.child[0].attrib[0]].value != written_vectors[array_name]:
+                return False
+
+    for scalar_name in scalar_statements:
+        if dependence.is_private_scalar(statements, scalar_name):
+            continue
+
+        # reduction scalar
+        references = [statement for statement in statements if scalar_name in ast.array_names(statement)]
+        for statement in references:
+            target, value = statement.child
+            if target.symbol != (ast.NodeSymbol.ARRAY,) or target.attrib[0] != scalar_name:
+                return False
+            if value.symbol not in _REDUCTION_SYMBOLS or not (value.child[0].symbol == (ast.NodeSymbol.ARRAY,) and value.child[0].attrib[0] == scalar_name):
+                return False
+            if scalar_name in ast.array_names(value.child[1]):
+                return False
+    return True
+
+
+# loop interchange
+def interchange_loops(context):
+    """Reorder perfectly nested loops for unit stride innermost access
+
+    Every psi access within a nest is inspected. An index used as the
+    last element of a row major index (or with coefficient one in a
+    flat offset) has unit stride and is preferred innermost. Loops
+    are otherwise ordered by the distance of their index from the
+    last element of the accessed index (smaller is more inner) and
+    ties keep the order of index creation. Only nests that
+    :func:`is_permutable` are reordered. For example ``A.T + B``
+    iterates over rows of ``B`` and the result in the innermost loop.
+    """
+    def _interchange_loops(context):
+        if context.ast.symbol == (ast.NodeSymbol.BLOCK,):
+            statements = tuple(_interchange_node(context, node) for node in context.ast.child)
+            return ast.create_context(
+                ast=ast.Node(context.ast.symbol, context.ast.shape, context.ast.attrib, statements),
+                symbol_table=context.symbol_table)
+        return context
+
+    return ast.node_traversal(context, _interchange_loops, traversal='postorder')
+
+
+def _interchange_node(context, node):
+    loops, statements = perfect_nest(node)
+    if len(loops) < 2 or not is_permutable(context, loops, statements):
+        return node
+
+    index_names = tuple(loop.attrib[0] for loop in loops)
+    unit_strides = {index_name: 0 for index_name in index_names}
+    distances = {index_name: 0 for index_name in index_names}
+
+    for statement in statements:
+        for psi_node in ast.psi_nodes(statement):
+            vector = context.symbol_table[psi_node.child[0].attrib[0]].value
+            for position, element in enumerate(vector):
+                unit_indicies = _unit_stride_indicies(element)
+                for index_name in set(ast.element_symbols(element)) & set(index_names):
+                    distance = len(vector) - 1 - position
+                    if index_name not in unit_indicies:
+                        distance = distance + 1
+                    unit_strides[index_name] += (distance == 0)
+                    distances[index_name] += distance
+
+    creation_order = {name: i for i, name in enumerate(context.symbol_table)}
+    ordered_names = sorted(index_names, key=lambda name: (unit_strides[name], -distances[name], creation_order[name]))
+    if tuple(ordered_names) == index_names:
+        return node
+
+    loop_map = {loop.attrib[0]: loop for loop in loops}
+    return build_nest(tuple(loop_map[name] for name in ordered_names), statements)
+
+
+# loop collapsing
+def collapse_loops(context):
+    """Collapse perfect loop nests over identically indexed row major arrays
+
+    When every statement of a perfect nest accesses row major arrays
+    only through the same index vector (a permutation of the loop
+    indicies with bounds equal to the shape of each array) every
+    iteration touches its own element and the nest traverses the
+    storage of all arrays. The nest is replaced by a single loop over
+    the flat offset into the storage of each array
+
+    for i: for j: C[i, j] = A[i, j] + B[i, j] => for f: Cs[f] = As[f] + Bs[f]
+
+    Scalars written within the nest must be private to an iteration.
+    """
+    context, (node,) = _collapse_statements(context, (context.ast,))
+    return ast.create_context(ast=node, symbol_table=context.symbol_table)
+
+
+def _collapse_statements(context, statements):
+    collapsed_statements = ()
+    for statement in statements:
+        if statement.symbol == (ast.NodeSymbol.LOOP,):
+            loops, nest_statements = perfect_nest(statement)
+            vector = _collapsible_vector(context, loops, nest_statements)
+            if vector is not None:
+                context, nest = _collapse_nest(context, vector, nest_statements)
+                collapsed_statements = collapsed_statements + nest
+                continue
+
+        if statement.symbol in {(ast.NodeSymbol.LOOP,), (ast.NodeSymbol.BLOCK,), (ast.NodeSymbol.FUNCTION,), (ast.NodeSymbol.CONDITION,)}:
+            context, child = _collapse_statements(context, statement.child)
+            statement = ast.Node(statement.symbol, statement.shape, statement.attrib, child)
+        collapsed_statements = collapsed_statements + (statement,)
+    return context, collapsed_statements
+
+
+def _collapsible_vector(context, loops, statements):
+    """Index vector shared by all accesses of a collapsible nest or None"""
+    if len(loops) < 2:
+        return None
+
+    bounds = {}
+    for loop in loops:
+        start, stop, step = context.symbol_table[loop.attrib[0]].value
+        if loop.attrib[1:] != () or start != 0 or step != 1:
+            return None
+        bounds[loop.attrib[0]] = stop
+
+    if any(set(bounds) & set(ast.element_symbols(stop)) for stop in bounds.values()):
+        return None
+
+    vector = None
+    for statement in statements:
+        # indicies may only be used within psi indices
+        if statement.symbol != (ast.NodeSymbol.ASSIGN,) or set(bounds) & ast.array_names(statement):
+            return None
+
+        for psi_node in ast.psi_nodes(statement):
+            if psi_node.child[1].symbol != (ast.NodeSymbol.ARRAY,):
+                return None
+            array_symbol = context.symbol_table[psi_node.child[1].attrib[0]]
+            node_vector = context.symbol_table[psi_node.child[0].attrib[0]].value
+            if array_symbol.layout is not None or node_vector is None or vector not in {None, node_vector}:
+                return None
+            if not all(ast.is_symbolic_element(element) and element.symbol in {(ast.NodeSymbol.ARRAY,), (ast.NodeSymbol.INDEX,)} and element.attrib[0] in bounds for element in node_vector):
+                return None
+            if len({element.attrib[0] for element in node_vector}) != len(bounds) or \
+               array_symbol.shape != tuple(bounds[element.attrib[0]] for element in node_vector):
+                return None
+            vector = node_vector
+
+    statements = ast.assignment_nodes(statements)
+    if vector is None or not all(dependence.is_private_scalar(statements, scalar_name) for scalar_name in dependence.written_scalars(statements)):
+        return None
+    return vector
+
+
+def _collapse_nest(context, vector, statements):
+    """Single loop over flat offset into storage and storage assignments"""
+    shape = tuple(context.symbol_table[element.attrib[0]].value[1] for element in vector)
+    context, size = ast.element_product(context, shape)
+
+    index_name = ast.generate_unique_index_name(context)
+    context = ast.add_symbol(context, index_name, ast.NodeSymbol.INDEX, (), None, (0, size, 1))
+    vector_name = ast.generate_unique_array_name(context)
+    context = ast.add_symbol(context, vector_name, ast.NodeSymbol.ARRAY, (1,), None, (ast.Node((ast.NodeSymbol.ARRAY,), (), (index_name,), ()),))
+
+    storage_names = {}
+
+    def _flat_access(context):
+        if context.ast.symbol != (ast.NodeSymbol.PSI,):
+            return context
+
+        array_name = context.ast.child[1].attrib[0]
+        if array_name not in storage_names:
+            storage_names[array_name] = ast.generate_unique_array_name(context)
+            context = ast.add_symbol(context, storage_names[array_name], ast.NodeSymbol.ARRAY, (size,), None, None)
+
+        return ast.create_context(
+            ast=ast.Node((ast.NodeSymbol.PSI,), context.ast.shape, (), (
+                ast.Node((ast.NodeSymbol.ARRAY,), (1,), (vector_name,), ()),
+                ast.Node((ast.NodeSymbol.ARRAY,), (size,), (storage_names[array_name],), ()))),
+            symbol_table=context.symbol_table)
+
+    flat_statements = ()
+    for statement in statements:
+        statement_context = ast.node_traversal(ast.create_context(ast=statement, symbol_table=context.symbol_table), _flat_access, traversal='postorder')
+        context = ast.create_context(ast=context.ast, symbol_table=statement_context.symbol_table)
+        flat_statements = flat_statements + (statement_context.ast,)
+
+    storage_assignments = ()
+    for array_name, storage_name in storage_names.items():
+        storage_assignments = storage_assignments + (ast.Node((ast.NodeSymbol.ASSIGN,), (size,), (), (
+            ast.Node((ast.NodeSymbol.ARRAY,), (size,), (storage_name,), ()),
+            ast.Node((ast.NodeSymbol.STORAGE,), (size,), (), (
+                ast.Node((ast.NodeSymbol.ARRAY,), context.symbol_table[array_name].shape, (array_name,), ()),)))),)
+
+    return context, storage_assignments + (ast.Node((ast.NodeSymbol.LOOP,), (), (index_name,), (
+        ast.Node((ast.NodeSymbol.BLOCK,), (), (), flat_statements),)),)
+
+
+# loop tiling
+def tile_loops(context, tile_sizes=None, cache_size=32768, element_size=8):
+    """Tile loop nests including reductions nested within loops
+
+    A perfect nest is split into tile loops over blocks of each index
+    and point loops within a block. When the innermost statements of
+    the nest are a reduction (``acc = init; LOOP k (acc = acc op x);
+    R[i, j] = acc``) the reduction loops are tiled as well and the
+    partial reduction is kept in the result
+
+    .. code-block:: text
+
+       LOOP it, jt (LOOP i, j (R[i, j] = init)
+                    LOOP kt (LOOP i, j (acc = R[i, j]
+                                        LOOP k (acc = acc op x)
+                                        R[i, j] = acc)))
+
+    which preserves the order of operations of the reduction for each
+    element. ``tile_sizes`` is either an integer or a tuple of sizes
+    for the loops outermost first (output then reduction loops, the
+    last size is repeated). Without ``tile_sizes`` the largest power of
+    two is chosen such that a two dimensional tile of every array
+    accessed within the nest fits into ``cache_size`` bytes. Loops with
+    constant bounds not larger than their tile size are not tiled.
+    """
+    def _tile_loops(context, node):
+        if node.symbol == (ast.NodeSymbol.LOOP,):
+            context, tiled_node = _tile_node(context, node, tile_sizes, cache_size, element_size)
+            if tiled_node is not node:
+                return context, tiled_node
+
+            # tile nests within the innermost statements instead
+            loops, statements = perfect_nest(node)
+            context, statements = _tile_statements(context, statements)
+            return context, build_nest(loops, statements)
+
+        context, child = _tile_statements(context, node.child)
+        return context, ast.Node(node.symbol, node.shape, node.attrib, child)
+
+    def _tile_statements(context, nodes):
+        statements = ()
+        for node in nodes:
+            context, node = _tile_loops(context, node)
+            statements = statements + (node,)
+        return context, statements
+
+    context, node = _tile_loops(context, context.ast)
+    return ast.create_context(ast=node, symbol_table=context.symbol_table)
+
+
+def _reduction_nest(context, statements):
+    """Reduction loops and statements of ``acc = init; LOOP ...; R[...] = acc``"""
+    if len(statements) != 3 or statements[1].symbol != (ast.NodeSymbol.LOOP,):
+        return None
+
+    initialize, reduction, store = statements
+    if initialize.symbol != (ast.NodeSymbol.ASSIGN,) or store.symbol != (ast.NodeSymbol.ASSIGN,) or \
+       initialize.child[0].symbol != (ast.NodeSymbol.ARRAY,) or store.child[0].symbol != (ast.NodeSymbol.PSI,) or \
+       store.child[1] != initialize.child[0]:
+        return None
+
+    reduction_loops, reduction_statements = perfect_nest(reduction)
+    if not is_permutable(context, reduction_loops, reduction_statements):
+        return None
+
+    result_name = store.child[0].child[1].attrib[0]
+    if any(result_name in ast.array_names(statement) for statement in reduction_statements):
+        return None
+    return reduction_loops, reduction_statements
+
+
+def _tile_size(context, index_name, tile_size):
+    start, stop, step = context.symbol_table[index_name].value
+    if step != 1 or start != 0:
+        return None
+    if not ast.is_symbolic_element(stop) and stop <= tile_size:
+        return None
+    return tile_size
+
+
+def _tile_loop(context, loop, tile_size):
+    """Tile loop and point loop (with updated index bounds) of loop"""
+    index_name = loop.attrib[0]
+    index_symbol = context.symbol_table[index_name]
+    start, stop, step = index_symbol.value
+
+    tile_index_name = ast.generate_unique_index_name(context)
+    context = ast.add_symbol(context, tile_index_name, ast.NodeSymbol.INDEX, index_symbol.shape, index_symbol.type, (start, stop, tile_size))
+    tile_index = ast.Node((ast.NodeSymbol.INDEX,), (), (tile_index_name,), ())
+
+    context, tile_stop = ast.element_operation(context, ast.NodeSymbol.PLUS, tile_index, tile_size)
+    if ast.is_symbolic_element(stop) or stop % tile_size != 0:
+        context, tile_stop = ast.element_operation(context, ast.NodeSymbol.MINIMUM, tile_stop, stop)
+
+    symbol_table = {**context.symbol_table, index_name: index_symbol._replace(value=(tile_index, tile_stop, step))}
+    context = ast.create_context(ast=context.ast, symbol_table=symbol_table)
+    return context, ast.Node((ast.NodeSymbol.LOOP,), loop.shape, (tile_index_name,), (
+        ast.Node((ast.NodeSymbol.BLOCK,), loop.child[0].shape, (), ()),))
+
+
+def _cache_tile_size(context, statements, cache_size, element_size):
+    array_names = set()
+    for statement in ast.assignment_nodes(statements):
+        for node in ast.psi_nodes(statement):
+            array_names.add(node.child[1].attrib[0])
+    tile_size = 1
+    while len(array_names) * (2 * tile_size) ** 2 * element_size <= cache_size:
+        tile_size = tile_size * 2
+    return tile_size
+
+
+def _tile_node(context, node, tile_sizes, cache_size, element_size):
+    loops, statements = perfect_nest(node)
+    if not loops or not is_permutable(context, loops, statements):
+        return context, node
+
+    reduction_nest = _reduction_nest(context, statements)
+    reduction_loops = reduction_nest[0] if reduction_nest else ()
+    if len(loops) + len(reduction_loops) < 2:
+        return context, node
+
+    if tile_sizes is None:
+        tile_sizes = (_cache_tile_size(context, statements, cache_size, element_size),)
+    elif isinstance(tile_sizes, int):
+        tile_sizes = (tile_sizes,)
+
+    def _tile(context, loops, offset):
+        tile_loops = ()
+        for i, loop in enumerate(loops):
+            tile_size = _tile_size(context, loop.attrib[0], tile_sizes[min(i + offset, len(tile_sizes) - 1)])
+            if tile_size is not None:
+                context, tile_loop = _tile_loop(context, loop, tile_size)
+                tile_loops = tile_loops + (tile_loop,)
+        return context, tile_loops
+
+    context, tile_loops = _tile(context, loops, 0)
+    context, reduction_tile_loops = _tile(context, reduction_loops, len(loops))
+    if not tile_loops and not reduction_tile_loops:
+        return context, node
+
+    if not reduction_tile_loops:
+        return context, build_nest(tile_loops + loops, statements)
+
+    initialize, reduction, store = statements
+    store_target, accumulator = store.child
+
+    initialize_nest = build_nest(loops, (
+        ast.Node((ast.NodeSymbol.ASSIGN,), (), (), (store_target, initialize.child[1])),))
+    reduction_nest = build_nest(reduction_tile_loops + loops, (
+        ast.Node((ast.NodeSymbol.ASSIGN,), (), (), (accumulator, store_target)),
+        build_nest(reduction_loops, reduction_nest[1]),
+        store))
+
+    if tile_loops:
+        return context, build_nest(tile_loops, (initialize_nest, reduction_nest))
+    return context, ast.Node((ast.NodeSymbol.BLOCK,), (), (), (initialize_nest, reduction_nest))
+
+
+# loop fusion
+def fuse_loops(context):
+    """Merge adjacent loops with identical bounds within each block
+
+    Statements between the two loops are moved before the first or
+    after the second loop when independent of it. Loops are fused when
+    neither references an array that the other writes, or when every
+    access of such an array in both loops is to the element of the
+    current iteration (:func:`_fusion_preserves_dependencies`). For
+    example sibling reductions ``sum(A) + sum(B)`` or the sum and sum
+    of squares of an array are accumulated within one loop.
+    """
+    def _fuse_loops(context):
+        if context.ast.symbol == (ast.NodeSymbol.BLOCK,):
+            node = context.ast
+            context, statements = _fuse_statements(context, node.child)
+            context = ast.create_context(
+                ast=ast.Node(node.symbol, node.shape, node.attrib, statements),
+                symbol_table=context.symbol_table)
+        return context
+
+    return ast.node_traversal(context, _fuse_loops, traversal='postorder')
+
+
+def _fuse_statements(context, statements):
+    fused_statements = ()
+    for statement in statements:
+        fused_statements = fused_statements + (statement,)
+        context, fused_statements = _fuse_last_loop(context, fused_statements)
+    return context, fused_statements
+
+
+def _fuse_last_loop(context, statements):
+    loop_positions = [i for i, statement in enumerate(statements) if statement.symbol == (ast.NodeSymbol.LOOP,)]
+    if len(loop_positions) < 2 or loop_positions[-1] != len(statements) - 1:
+        return context, statements
+
+    first_loop, second_loop = statements[loop_positions[-2]], statements[-1]
+    first_index, second_index = first_loop.attrib[0], second_loop.attrib[0]
+    if context.symbol_table[first_index].value != context.symbol_table[second_index].value:
+        return context, statements
+
+    # move statements between loops out of the way
+    hoisted_statements, sunk_statements = (), ()
+    for statement in statements[loop_positions[-2]+1:-1]:
+        if _independent_statements(context, statement, first_loop) and all(_independent_statements(context, statement, _) for _ in sunk_statements):
+            hoisted_statements = hoisted_statements + (statement,)
+        elif _independent_statements(context, statement, second_loop):
+            sunk_statements = sunk_statements + (statement,)
+        else:
+            return context, statements
+
+    renamed_context = rename_index(ast.create_context(ast=second_loop, symbol_table=context.symbol_table), second_index, first_index)
+    if not _fusion_preserves_dependencies(renamed_context, first_loop, renamed_context.ast):
+        return context, statements
+
+    context, loop_statements = _fuse_statements(renamed_context, first_loop.child[0].child + renamed_context.ast.child[0].child)
+
+    fused_loop = ast.Node((ast.NodeSymbol.LOOP,), first_loop.shape, first_loop.attrib, (
+        ast.Node((ast.NodeSymbol.BLOCK,), first_loop.child[0].shape, (), loop_statements),))
+    return context, statements[:loop_positions[-2]] + hoisted_statements + (fused_loop,) + sunk_statements
+
+
+def _fusion_preserves_dependencies(context, first_loop, second_loop):
+    """Loops with the same index may be fused without reordering dependencies
+
+    An array written by one loop and referenced by the other must only
+    be accessed through psi with the same index vector that contains
+    the loop index. The second loop then reads (or writes) exactly the
+    element that the first loop produced within the same iteration.
+    """
+    index_name = first_loop.attrib[0]
+    shared_arrays = (_written_arrays(first_loop) & _referenced_arrays(context, second_loop)) | \
+        (_written_arrays(second_loop) & _referenced_arrays(context, first_loop))
+
+    for array_name in shared_arrays:
+        psi_nodes = [node for loop in (first_loop, second_loop) for node in ast.psi_nodes(loop) if node.child[1].attrib[0] == array_name]
+        array_nodes = [node for loop in (first_loop, second_loop) for node in ast.array_nodes(loop) if node.attrib[0] == array_name]
+        if len(psi_nodes) != len(array_nodes):
+            return False
+
+        vectors = {context.symbol_table[node.child[0].attrib[0]].value for node in psi_nodes}
+        if len(vectors) != 1 or not any(ast.is_index_element(element, index_name) for element in vectors.pop()):
+            return False
+    return True
+
+
+def _referenced_arrays(context, node):
+    arrays = set()
+
+    def _visit_node(context):
+        if context.ast.symbol in {(ast.NodeSymbol.ARRAY,), (ast.NodeSymbol.INDEX,)}:
+            arrays.add(context.ast.attrib[0])
+            node_symbol = ast.select_array_node_symbol(context)
+            for element in (node_symbol.value or ()):
+                arrays.update(ast.element_symbols(element))
+        elif context.ast.symbol == (ast.NodeSymbol.INITIALIZE,):
+            arrays.add(context.ast.attrib[0])
+        return context
+
+    ast.node_traversal(ast.create_context(ast=node, symbol_table=context.symbol_table), _visit_node, traversal='postorder')
+    return arrays
+
+
+def _written_arrays(node):
+    arrays = set()
+    if node.symbol == (ast.NodeSymbol.ASSIGN,):
+        target = node.child[0]
+        if target.symbol == (ast.NodeSymbol.PSI,):
+            target = target.child[1]
+        arrays.add(target.attrib[0])
+    elif node.symbol == (ast.NodeSymbol.INITIALIZE,):
+        arrays.add(node.attrib[0])
+
+    for child in node.child:
+        if isinstance(child, ast.Node):
+            arrays.update(_written_arrays(child))
+    return arrays
+
+
+def _independent_statements(context, left_node, right_node):
+    return not (_written_arrays(left_node) & _referenced_arrays(context, right_node)) and \
+        not (_written_arrays(right_node) & _referenced_arrays(context, left_node))
+
+
+def rename_index(context, index_name, new_index_name):
+    """Rename loop index within ONF node
+
+    Index vectors that reference the index are replaced by new
+    vectors in the symbol table.
+    """
+    symbol_mapping = {index_name: new_index_name}
+    vector_mapping = {}
+
+    def _rename_index(context):
+        if context.ast.symbol == (ast.NodeSymbol.LOOP,) and context.ast.attrib[0] == index_name:
+            return ast.replace_node_attributes(context, (new_index_name,) + context.ast.attrib[1:])
+        elif context.ast.symbol in {(ast.NodeSymbol.ARRAY,), (ast.NodeSymbol.INDEX,)}:
+            array_name = context.ast.attrib[0]
+            if array_name == index_name:
+                return ast.replace_node_attributes(context, (new_index_name,))
+
+            node_symbol = context.symbol_table[array_name]
+            if node_symbol.value is not None and any(index_name in ast.element_symbols(element) for element in node_symbol.value):
+                if array_name not in vector_mapping:
+                    vector_mapping[array_name] = ast.generate_unique_array_name(context)
+                    value = tuple(ast.substitute_element_symbols(element, symbol_mapping) for element in node_symbol.value)
+                    context = ast.add_symbol(context, vector_mapping[array_name], node_symbol.symbol, node_symbol.shape, node_symbol.type, value)
+                return ast.replace_node_attributes(context, (vector_mapping[array_name],))
+        return context
+
+    return ast.node_traversal(context, _rename_index, traversal='postorder')
+
+
+# loop unrolling
+def unroll_loops(context, unroll_threshold=16, unroll_factor=None):
+    """Unroll loops with small constant bounds and partially unroll others
+
+    Loops are visited innermost first. A loop with constant bounds is
+    fully unrolled when the number of statements of the unrolled body
+    is at most ``unroll_threshold``. Each copy of the body has the
+    index replaced by its value so index arithmetic is folded at
+    compile time, e.g. ``A[(_i0 * 3) + _i1]`` becomes ``A[5]``. When
+    ``unroll_factor`` is given the remaining innermost loops are
+    partially unrolled: ``unroll_factor`` copies of the body are
+    evaluated per iteration of a loop with a larger step followed by a
+    loop over the remaining iterations. Unrolling preserves the order
+    of evaluation and is always valid.
+    """
+    def _unroll_statements(context, nodes):
+        statements = ()
+        for node in nodes:
+            if node.symbol == (ast.NodeSymbol.LOOP,):
+                context, child = _unroll_statements(context, node.child[0].child)
+                node = ast.Node(node.symbol, node.shape, node.attrib, (
+                    ast.Node(node.child[0].symbol, node.child[0].shape, node.child[0].attrib, child),))
+                context, unrolled_statements = _unroll_loop(context, node, unroll_threshold, unroll_factor)
+                statements = statements + unrolled_statements
+            elif node.symbol in {(ast.NodeSymbol.BLOCK,), (ast.NodeSymbol.FUNCTION,), (ast.NodeSymbol.CONDITION,)}:
+                context, child = _unroll_statements(context, node.child)
+                statements = statements + (ast.Node(node.symbol, node.shape, node.attrib, child),)
+            else:
+                statements = statements + (node,)
+        return context, statements
+
+    context, (node,) = _unroll_statements(context, (context.ast,))
+    return ast.create_context(ast=node, symbol_table=context.symbol_table)
+
+
+def _nested_loops(node):
+    loops = ()
+    for child in node.child:
+        if child.symbol == (ast.NodeSymbol.LOOP,):
+            loops = loops + (child,)
+        loops = loops + _nested_loops(child)
+    return loops
+
+
+def _unroll_loop(context, loop, unroll_threshold, unroll_factor):
+    index_name = loop.attrib[0]
+    index_symbol = context.symbol_table[index_name]
+    start, stop, step = index_symbol.value
+    statements = loop.child[0].child
+
+    # bounds of inner loops must not depend on unrolled index
+    for nested_loop in _nested_loops(loop):
+        if any(index_name in ast.element_symbols(element) for element in context.symbol_table[nested_loop.attrib[0]].value):
+            return context, (loop,)
+
+    if not ast.has_symbolic_elements(index_symbol.value):
+        values = range(start, stop, step)
+        if len(values) * len(ast.assignment_nodes(statements)) <= unroll_threshold:
+            unrolled_statements = ()
+            for value in values:
+                context, copy_statements = substitute_index(context, statements, index_name, value)
+                unrolled_statements = unrolled_statements + copy_statements
+            return context, unrolled_statements
+
+    if unroll_factor is None or unroll_factor < 2 or _nested_loops(loop) or \
+       (not ast.has_symbolic_elements(index_symbol.value) and len(range(start, stop, step)) < 2 * unroll_factor):
+        return context, (loop,)
+
+    return _partially_unroll_loop(context, loop, unroll_factor)
+
+
+def _partially_unroll_loop(context, loop, unroll_factor, rename_copy=None):
+    """Main loop over unroll_factor copies of the body and remainder loop
+
+    ``rename_copy(context, statements, i)`` may further rewrite the
+    i-th copy of the body (after substitution of the index).
+    """
+    index_name = loop.attrib[0]
+    index_symbol = context.symbol_table[index_name]
+    start, stop, step = index_symbol.value
+    statements = loop.child[0].child
+
+    # main loop with step unroll_factor * step over copies of the body
+    unrolled_step = unroll_factor * step
+    context, trip_count = ast.element_operation(context, ast.NodeSymbol.MINUS, stop, start)
+    context, trip_count = ast.element_operation(context, ast.NodeSymbol.FLOORDIVIDE, trip_count, unrolled_step)
+    context, main_stop = ast.element_operation(context, ast.NodeSymbol.TIMES, trip_count, unrolled_step)
+    context, main_stop = ast.element_operation(context, ast.NodeSymbol.PLUS, start, main_stop)
+
+    main_index_name = ast.generate_unique_index_name(context)
+    context = ast.add_symbol(context, main_index_name, ast.NodeSymbol.INDEX, index_symbol.shape, index_symbol.type, (start, main_stop, unrolled_step))
+    main_index = ast.Node((ast.NodeSymbol.INDEX,), (), (main_index_name,), ())
+
+    unrolled_statements = ()
+    for i in range(unroll_factor):
+        context, element = ast.element_operation(context, ast.NodeSymbol.PLUS, main_index, i * step)
+        context, copy_statements = substitute_index(context, statements, index_name, element)
+        if rename_copy is not None:
+            context, copy_statements = rename_copy(context, copy_statements, i)
+        unrolled_statements = unrolled_statements + copy_statements
+    main_loop = ast.Node((ast.NodeSymbol.LOOP,), loop.shape, (main_index_name,), (
+        ast.Node((ast.NodeSymbol.BLOCK,), loop.child[0].shape, (), unrolled_statements),))
+
+    # remainder loop over a new index (index symbols are shared by
+    # other loops over the same index name)
+    remainder_index_name = ast.generate_unique_index_name(context)
+    context = ast.add_symbol(context, remainder_index_name, ast.NodeSymbol.INDEX, index_symbol.shape, index_symbol.type, (main_stop, stop, step))
+    remainder_context = rename_index(ast.create_context(ast=loop, symbol_table=context.symbol_table), index_name, remainder_index_name)
+    context = ast.create_context(ast=context.ast, symbol_table=remainder_context.symbol_table)
+    return context, (main_loop, remainder_context.ast)
+
+
+def substitute_index(context, statements, index_name, element):
+    """Replace loop index within statements by element (constant or symbolic)
+
+    Index vectors that reference the index are replaced by new vectors
+    in the symbol table with constant arithmetic folded.
+    """
+    vector_mapping = {}
+
+    def _substitute_index(context):
+        if context.ast.symbol in {(ast.NodeSymbol.ARRAY,), (ast.NodeSymbol.INDEX,)}:
+            array_name = context.ast.attrib[0]
+            if array_name == index_name:
+                context, node = ast.element_node(context, element)
+                return ast.create_context(ast=node, symbol_table=context.symbol_table)
+
+            node_symbol = context.symbol_table[array_name]
+            if node_symbol.symbol == ast.NodeSymbol.ARRAY and node_symbol.value is not None and \
+               any(index_name in ast.element_symbols(_) for _ in node_symbol.value):
+                if array_name not in vector_mapping:
+                    value = ()
+                    for vector_element in node_symbol.value:
+                        context, vector_element = ast.substitute_element(context, vector_element, index_name, element)
+                        value = value + (vector_element,)
+                    vector_mapping[array_name] = ast.generate_unique_array_name(context)
+                    context = ast.add_symbol(context, vector_mapping[array_name], node_symbol.symbol, node_symbol.shape, node_symbol.type, value)
+                return ast.replace_node_attributes(context, (vector_mapping[array_name],))
+        return context
+
+    substituted_statements = ()
+    for statement in statements:
+        statement_context = ast.node_traversal(ast.create_context(ast=statement, symbol_table=context.symbol_table), _substitute_index, traversal='postorder')
+        context = ast.create_context(ast=context.ast, symbol_table=statement_context.symbol_table)
+        substituted_statements = substituted_statements + (statement_context.ast,)
+    return context, substituted_statements
+
+
+# parallel loops
+def is_parallel(context, loop):
+    """Iterations of loop carry no dependencies and may run concurrently
+
+    No dependence is carried by the loop (see
+    :func:`moa.dependence.is_parallel`), so reductions into a scalar
+    are not parallel while scalars private to an iteration are. Only
+    unit step loops are considered since ``numba.prange`` requires
+    them.
+    """
+    if context.symbol_table[loop.attrib[0]].value[2] != 1:
+        return False
+    return dependence.is_parallel(context, loop)
+
+
+def is_parallel_loop(loop):
+    return loop.attrib[1:] == ('parallel',)
+
+
+def parallelize_loops(context):
+    """Mark the outermost parallel loop of each loop nest
+
+    Within each perfect nest the outermost loop that
+    :func:`is_parallel` is marked (``LOOP`` attribute ``'parallel'``)
+    and emitted as ``numba.prange`` by the python backend. Loops
+    nested within a parallel loop are not marked.
+    """
+    def _parallelize_statements(nodes):
+        statements = ()
+        for node in nodes:
+            if node.symbol == (ast.NodeSymbol.LOOP,):
+                node = _parallelize_nest(node)
+            elif node.symbol in {(ast.NodeSymbol.BLOCK,), (ast.NodeSymbol.FUNCTION,), (ast.NodeSymbol.CONDITION,)}:
+                node = ast.Node(node.symbol, node.shape, node.attrib, _parallelize_statements(node.child))
+            statements = statements + (node,)
+        return statements
+
+    def _parallelize_nest(node):
+        loops, statements = perfect_nest(node)
+        for i, loop in enumerate(loops):
+            if not loop.attrib[1:] and is_parallel(context, loop):
+                parallel_loop = ast.Node(loop.symbol, loop.shape, (loop.attrib[0], 'parallel'), loop.child)
+                return build_nest(loops[:i] + (parallel_loop,) + loops[i+1:], statements)
+        return build_nest(loops, _parallelize_statements(statements))
+
+    (node,) = _parallelize_statements((context.ast,))
+    return ast.create_context(ast=node, symbol_table=context.symbol_table)
+
+
+# parallel reductions
+_ASSOCIATIVE_REDUCTIONS = {
+    ast.NodeSymbol.PLUS: 0,
+    ast.NodeSymbol.TIMES: 1,
+}
+
+
+def _reduction_accumulator(context, loop, operations=_ASSOCIATIVE_REDUCTIONS):
+    """Accumulator and operation of loop that only reduces into one scalar"""
+    if context.symbol_table[loop.attrib[0]].value[2] != 1:
+        return None
+
+    statements = ast.assignment_nodes(loop.child[0].child)
+    if any(statement.child[0].symbol == (ast.NodeSymbol.PSI,) for statement in statements):
+        return None
+
+    accumulators = [name for name in dependence.written_scalars(statements) if not dependence.is_private_scalar(statements, name)]
+    if len(accumulators) != 1:
+        return None
+    accumulator_name = accumulators[0]
+
+    reduction_operations = set()
+    for statement in statements:
+        if accumulator_name not in ast.array_names(statement):
+            continue
+        target, value = statement.child
+        if target.symbol != (ast.NodeSymbol.ARRAY,) or target.attrib[0] != accumulator_name or \
+           value.symbol[0] not in operations or \
+           value.child[0].symbol != (ast.NodeSymbol.ARRAY,) or value.child[0].attrib[0] != accumulator_name or \
+           accumulator_name in ast.array_names(value.child[1]):
+            return None
+        reduction_operations.add(value.symbol[0])
+
+    if len(reduction_operations) != 1:
+        return None
+    return accumulator_name, reduction_operations.pop()
+
+
+def parallelize_reductions(context, num_partitions=8):
+    """Split reductions to a scalar into partial reductions combined by a tree
+
+    Applied to loops outside of any other loop that only accumulate
+    into a single scalar with an associative operation (``+`` or
+    ``*``), for example ``A.reduce('+')`` or a dot product. The
+    iterations are split into ``num_partitions`` contiguous chunks
+    each reduced into a private accumulator within a loop over the
+    chunks (which :func:`parallelize_loops` runs in parallel). The
+    partial results are combined pairwise in ``log2(num_partitions)``
+    steps.
+
+    .. code-block:: text
+
+       P = Array((p,))
+       LOOP t (acc_t = init; LOOP k in chunk t (acc_t = acc_t + x); P[t] = acc_t)
+       P[0] = P[0] + P[1]; P[2] = P[2] + P[3]; ...; P[0] = P[0] + P[2]; ...
+       acc = acc + P[0]
+
+    Floating point results may differ from the sequential order by
+    rounding.
+    """
+    def _parallelize_statements(context, nodes):
+        statements = ()
+        for node in nodes:
+            if node.symbol == (ast.NodeSymbol.LOOP,):
+                reduction = _reduction_accumulator(context, node)
+                if reduction is not None:
+                    context, loop_statements = _partition_reduction(context, node, *reduction, num_partitions)
+                    statements = statements + loop_statements
+                    continue
+            elif node.symbol in {(ast.NodeSymbol.BLOCK,), (ast.NodeSymbol.FUNCTION,), (ast.NodeSymbol.CONDITION,)}:
+                context, child = _parallelize_statements(context, node.child)
+                node = ast.Node(node.symbol, node.shape, node.attrib, child)
+            statements = statements + (node,)
+        return context, statements
+
+    context, (node,) = _parallelize_statements(context, (context.ast,))
+    return ast.create_context(ast=node, symbol_table=context.symbol_table)
+
+
+def _partition_reduction(context, loop, accumulator_name, operation, num_partitions):
+    index_name = loop.attrib[0]
+    index_symbol = context.symbol_table[index_name]
+    start, stop, step = index_symbol.value
+
+    partition_name = ast.generate_unique_index_name(context)
+    context = ast.add_symbol(context, partition_name, ast.NodeSymbol.INDEX, (), None, (0, num_partitions, 1))
+    partition_index = ast.Node((ast.NodeSymbol.INDEX,), (), (partition_name,), ())
+
+    # chunk t is [start + (t * length) // p, start + ((t + 1) * length) // p)
+    context, length = ast.element_operation(context, ast.NodeSymbol.MINUS, stop, start)
+    context, next_partition_index = ast.element_operation(context, ast.NodeSymbol.PLUS, partition_index, 1)
+    bounds = ()
+    for element in (partition_index, next_partition_index):
+        context, bound = ast.element_operation(context, ast.NodeSymbol.TIMES, element, length)
+        context, bound = ast.element_operation(context, ast.NodeSymbol.FLOORDIVIDE, bound, num_partitions)
+        context, bound = ast.element_operation(context, ast.NodeSymbol.PLUS, start, bound)
+        bounds = bounds + (bound,)
+
+    # chunk loop over a new index (index symbols are shared by other
+    # loops over the same index name)
+    chunk_index_name = ast.generate_unique_index_name(context)
+    context = ast.add_symbol(context, chunk_index_name, ast.NodeSymbol.INDEX, index_symbol.shape, index_symbol.type, (bounds[0], bounds[1], 1))
+
+    # partial accumulator private to each chunk
+    partial_name = ast.generate_unique_array_name(context)
+    context = ast.add_symbol(context, partial_name, ast.NodeSymbol.ARRAY, (), None, None)
+    partial_node = ast.Node((ast.NodeSymbol.ARRAY,), (), (partial_name,), ())
+    loop = rename_index(ast.create_context(ast=loop, symbol_table=context.symbol_table), index_name, chunk_index_name)
+    loop = rename_index(loop, accumulator_name, partial_name)
+    context, loop = loop, loop.ast
+
+    initial_name = ast.generate_unique_array_name(context)
+    context = ast.add_symbol(context, initial_name, ast.NodeSymbol.ARRAY, (), None, (_ASSOCIATIVE_REDUCTIONS[operation],))
+
+    partials_name = ast.generate_unique_array_name(context)
+    context = ast.add_symbol(context, partials_name, ast.NodeSymbol.ARRAY, (num_partitions,), None, None)
+
+    def _partials_element(context, element):
+        vector_name = ast.generate_unique_array_name(context)
+        context = ast.add_symbol(context, vector_name, ast.NodeSymbol.ARRAY, (1,), None, (element,))
+        return context, ast.Node((ast.NodeSymbol.PSI,), (), (), (
+            ast.Node((ast.NodeSymbol.ARRAY,), (1,), (vector_name,), ()),
+            ast.Node((ast.NodeSymbol.ARRAY,), (num_partitions,), (partials_name,), ())))
+
+    context, partial_store = _partials_element(context, partition_index)
+    partition_loop = ast.Node((ast.NodeSymbol.LOOP,), loop.shape, (partition_name,), (
+        ast.Node((ast.NodeSymbol.BLOCK,), loop.child[0].shape, (), (
+            ast.Node((ast.NodeSymbol.ASSIGN,), (), (), (partial_node, ast.Node((ast.NodeSymbol.ARRAY,), (), (initial_name,), ()))),
+            loop,
+            ast.Node((ast.NodeSymbol.ASSIGN,), (), (), (partial_store, partial_node)))),))
+
+    # pairwise combination of partial results
+    statements = (ast.Node((ast.NodeSymbol.INITIALIZE,), (num_partitions,), (partials_name,), ()), partition_loop)
+    stride = 1
+    while stride < num_partitions:
+        for i in range(0, num_partitions - stride, 2 * stride):
+            context, left = _partials_element(context, i)
+            context, right = _partials_element(context, i + stride)
+            statements = statements + (ast.Node((ast.NodeSymbol.ASSIGN,), (), (), (
+                left, ast.Node((operation,), (), (), (left, right)))),)
+        stride = stride * 2
+
+    context, result = _partials_element(context, 0)
+    accumulator_node = ast.Node((ast.NodeSymbol.ARRAY,), (), (accumulator_name,), ())
+    statements = statements + (ast.Node((ast.NodeSymbol.ASSIGN,), (), (), (
+        accumulator_node, ast.Node((operation,), (), (), (accumulator_node, result)))),)
+    return context, statements
+
+
+# multiple accumulators
+_INTERLEAVED_REDUCTIONS = {
+    **_ASSOCIATIVE_REDUCTIONS,
+    ast.NodeSymbol.MAXIMUM: float('-inf'),
+    ast.NodeSymbol.MINIMUM: float('inf'),
+}
+
+
+def interleave_accumulators(context, num_accumulators=4):
+    """Reduce innermost reduction loops into interleaved accumulators
+
+    Sequential accumulation ``acc = acc + x[k]`` is a chain of
+    dependent operations. Innermost loops that only reduce into a
+    single scalar (``+``, ``*``, ``max`` or ``min``) are unrolled by
+    ``num_accumulators`` where iteration ``k + j`` accumulates into
+    accumulator ``j``. The remaining iterations accumulate into the
+    first and the accumulators are combined pairwise at the end. The
+    independent chains allow instruction level parallelism and bound
+    the rounding error of long sums by the length of each chain.
+    """
+    def _interleave_statements(context, nodes):
+        statements = ()
+        for node in nodes:
+            if node.symbol == (ast.NodeSymbol.LOOP,) and not _nested_loops(node):
+                reduction = _reduction_accumulator(context, node, _INTERLEAVED_REDUCTIONS)
+                bounds = context.symbol_table[node.attrib[0]].value
+                if not ast.has_symbolic_elements(bounds) and len(range(*bounds)) < 2 * num_accumulators:
+                    reduction = None
+                if reduction is not None and num_accumulators > 1:
+                    context, loop_statements = _interleave_loop(context, node, *reduction, num_accumulators)
+                    statements = statements + loop_statements
+                    continue
+
+            if node.symbol in {(ast.NodeSymbol.LOOP,), (ast.NodeSymbol.BLOCK,), (ast.NodeSymbol.FUNCTION,), (ast.NodeSymbol.CONDITION,)}:
+                context, child = _interleave_statements(context, node.child)
+                node = ast.Node(node.symbol, node.shape, node.attrib, child)
+            statements = statements + (node,)
+        return context, statements
+
+    context, (node,) = _interleave_statements(context, (context.ast,))
+    return ast.create_context(ast=node, symbol_table=context.symbol_table)
+
+
+def _rename_statements(context, statements, name, new_name):
+    context = rename_index(ast.create_context(ast=ast.Node((ast.NodeSymbol.BLOCK,), (), (), statements), symbol_table=context.symbol_table), name, new_name)
+    return context, context.ast.child
+
+
+def _interleave_loop(context, loop, accumulator_name, operation, num_accumulators):
+    initial_name = ast.generate_unique_array_name(context)
+    context = ast.add_symbol(context, initial_name, ast.NodeSymbol.ARRAY, (), None, (_INTERLEAVED_REDUCTIONS[operation],))
+
+    accumulators = ()
+    for i in range(num_accumulators):
+        name = ast.generate_unique_array_name(context)
+        context = ast.add_symbol(context, name, ast.NodeSymbol.ARRAY, (), None, None)
+        accumulators = accumulators + (ast.Node((ast.NodeSymbol.ARRAY,), (), (name,), ()),)
+
+    def _rename_copy(context, statements, i):
+        return _rename_statements(context, statements, accumulator_name, accumulators[i].attrib[0])
+
+    context, (main_loop, remainder_loop) = _partially_unroll_loop(context, loop, num_accumulators, _rename_copy)
+    context, remainder_statements = _rename_statements(context, remainder_loop.child[0].child, accumulator_name, accumulators[0].attrib[0])
+    remainder_loop = ast.Node(remainder_loop.symbol, remainder_loop.shape, remainder_loop.attrib, (
+        ast.Node((ast.NodeSymbol.BLOCK,), remainder_loop.child[0].shape, (), remainder_statements),))
+
+    initializations = tuple(ast.Node((ast.NodeSymbol.ASSIGN,), (), (), (
+        accumulator, ast.Node((ast.NodeSymbol.ARRAY,), (), (initial_name,), ()))) for accumulator in accumulators)
+
+    # pairwise combination of accumulators
+    nodes = accumulators
+    while len(nodes) > 1:
+        nodes = tuple(ast.Node((operation,), (), (), nodes[i:i+2]) if i + 1 < len(nodes) else nodes[i] for i in range(0, len(nodes), 2))
+    accumulator_node = ast.Node((ast.NodeSymbol.ARRAY,), (), (accumulator_name,), ())
+    combination = ast.Node((ast.NodeSymbol.ASSIGN,), (), (), (
+        accumulator_node, ast.Node((operation,), (), (), (accumulator_node, nodes[0]))))
+    return context, initializations + (main_loop, remainder_loop, combination)
+
+
+# vectorization
+_VECTOR_SYMBOLS = {
+    (ast.NodeSymbol.ASSIGN,), (ast.NodeSymbol.PSI,),
+    (ast.NodeSymbol.ARRAY,), (ast.NodeSymbol.INDEX,),
+    (ast.NodeSymbol.PLUS,), (ast.NodeSymbol.MINUS,),
+    (ast.NodeSymbol.TIMES,), (ast.NodeSymbol.DIVIDE,),
+    (ast.NodeSymbol.FLOORDIVIDE,), (ast.NodeSymbol.MODULO,),
+    (ast.NodeSymbol.MAXIMUM,), (ast.NodeSymbol.MINIMUM,),
+}
+
+
+def _node_symbols(node):
+    symbols = {node.symbol}
+    for child in node.child:
+        symbols.update(_node_symbols(child))
+    return symbols
+
+
+def is_vectorizable(context, loop):
+    """Body of innermost loop may be evaluated as whole slice operations
+
+    The loop is parallel (see :func:`is_parallel`), its body is a
+    sequence of elementwise arithmetic assignments and the loop index
+    only appears as an element of psi indicies (at most once within
+    each). Arrays written within the loop are not read by other
+    statements of the loop since a slice is a view of the array.
+    """
+    index_name = loop.attrib[0]
+    statements = loop.child[0].child
+    if any(statement.symbol != (ast.NodeSymbol.ASSIGN,) for statement in statements):
+        return False
+
+    if not is_parallel(context, loop):
+        return False
+
+    written_arrays = set()
+    for statement in statements:
+        if not _node_symbols(statement) <= _VECTOR_SYMBOLS:
+            return False
+        if index_name in ast.array_names(statement):
+            return False
+        for node in ast.psi_nodes(statement):
+            vector = context.symbol_table[node.child[0].attrib[0]].value
+            if sum(ast.is_index_element(element, index_name) for element in vector) > 1:
+                return False
+            if any(not ast.is_index_element(element, index_name) and index_name in ast.element_symbols(element) for element in vector):
+                return False
+        if statement.child[0].symbol == (ast.NodeSymbol.PSI,):
+            written_arrays.add(statement.child[0].child[1].attrib[0])
+
+    for statement in statements:
+        read_arrays = {node.child[1].attrib[0] for node in ast.psi_nodes(statement.child[1])}
+        if statement.child[0].symbol == (ast.NodeSymbol.PSI,):
+            read_arrays = read_arrays - {statement.child[0].child[1].attrib[0]}
+        if read_arrays & written_arrays:
+            return False
+    return True
+
+
+def is_vector_loop(loop):
+    return loop.attrib[1:] == ('vector',)
+
+
+def vectorize_loops(context):
+    """Mark innermost loops evaluated as slice operations
+
+    Innermost loops that :func:`is_vectorizable` are marked (``LOOP``
+    attribute ``'vector'``). The python backend emits the body once
+    with the loop index replaced by the slice of its bounds,
+    ``C[i, j] = A[i, j] + B[i, j]`` within ``LOOP j`` becomes
+    ``C[i, 0:m] = A[i, 0:m] + B[i, 0:m]``, so that the loop runs
+    within numpy. Scalars private to an iteration become arrays of
+    the slice and must not be read outside of the loop.
+    """
+    def _vectorize_statements(nodes):
+        statements = ()
+        for i, node in enumerate(nodes):
+            if node.symbol == (ast.NodeSymbol.LOOP,) and not node.attrib[1:] and not _nested_loops(node):
+                scalar_names = dependence.written_scalars(ast.assignment_nodes(node.child[0].child))
+                other_names = set().union(*(ast.array_names(_) for _ in nodes[:i] + nodes[i+1:]))
+                if not (scalar_names & other_names) and is_vectorizable(context, node):
+                    node = ast.Node(node.symbol, node.shape, (node.attrib[0], 'vector'), node.child)
+            elif node.symbol in {(ast.NodeSymbol.LOOP,), (ast.NodeSymbol.BLOCK,), (ast.NodeSymbol.FUNCTION,), (ast.NodeSymbol.CONDITION,)}:
+                node = ast.Node(node.symbol, node.shape, node.attrib, _vectorize_statements(node.child))
+            statements = statements + (node,)
+        return statements
+
+    (node,) = _vectorize_statements((context.ast,))
+    return ast.create_context(ast=node, symbol_table=context.symbol_table)
@@ -14,7 +14,17 @@ def naive_reduction(context, include_conditions=True):
     """Simple backend does not simplify loops and directly converts moa reduced statement to ONF
 
     ONF AST is a language independent representation
+
+    A list of contexts (sharing one symbol table, the symbol table of
+    the last context is used) is reduced to a single function with a
+    loop nest for each expression returning every result.
     """
+    if not isinstance(context, ast.Context):
+        contexts = tuple(context)
+        context = contexts[-1]
+    else:
+        contexts = (context,)
+
     array_arguments = determine_function_arguments(context.symbol_table)
 
     function_body = ()
@@ -34,6 +44,33 @@ def naive_reduction(context, include_conditions=True):
             ast.Node((ast.NodeSymbol.NOT,), (), (), (shape_conditions,)),
             ast.Node((ast.NodeSymbol.BLOCK,), (), (), (ast.Node((ast.NodeSymbol.ERROR,), (), ('arguments do not match declared shape',), ()),)))),)
 
+    result_array_names = ()
+    previous_symbol_names = set()
+    for expression_context in contexts:
+        # indicies of each expression are created after the previous expression
+        index_names = expression_context.symbol_table.keys() - previous_symbol_names
+        previous_symbol_names = set(expression_context.symbol_table)
+
+        context, statements, array_names = _reduce_expression(
+            ast.create_context(ast=expression_context.ast, symbol_table=context.symbol_table), include_conditions, index_names)
+        function_body = function_body + statements
+        result_array_names = result_array_names + array_names
+
+    if len(result_array_names) == 1:
+        result_array_names = result_array_names[0]
+
+    shape = contexts[0].ast.shape if len(contexts) == 1 else None
+    context = ast.create_context(
+        ast=ast.Node((ast.NodeSymbol.FUNCTION,), shape, (tuple(arg.attrib[0] for arg in array_arguments), result_array_names), (
+            ast.Node((ast.NodeSymbol.BLOCK,), shape, (), function_body),)),
+        symbol_table=context.symbol_table)
+    return context
+
+
+def _reduce_expression(context, include_conditions, index_names):
+    """Statements computing the results of a DNF expression (or block of expressions)"""
+    function_body = ()
+
     # check for condition node in expression
     if context.ast.symbol == (ast.NodeSymbol.CONDITION,):
         condition_constraints = ast.select_node(context, (0,)).ast
@@ -43,53 +80,74 @@ def naive_reduction(context, include_conditions=True):
                 ast.Node((ast.NodeSymbol.BLOCK,), (), (), (ast.Node((ast.NodeSymbol.ERROR,), (), ('arguments have incompatible shape',), ()),)))),)
         context = ast.select_node(context, (1,))
 
-    indicies = tuple(determine_indicies(context))
+    indicies = tuple(determine_indicies(context, index_names))
+
+    # a block of expressions shares the index space and yields multiple results
+    if context.ast.symbol == (ast.NodeSymbol.BLOCK,):
+        expressions = context.ast.child
+    else:
+        expressions = (context.ast,)
 
     # eventually get shapes and match with conditions
-    result_array_name = ast.generate_unique_array_name(context)
-    context = ast.add_symbol(context, result_array_name, ast.NodeSymbol.ARRAY, context.ast.shape, None, None)
     result_index_name = ast.generate_unique_array_name(context)
     context = ast.add_symbol(context, result_index_name, ast.NodeSymbol.ARRAY, (len(indicies),), None, indicies)
-    result_initialization = (ast.Node((ast.NodeSymbol.INITIALIZE,), context.ast.shape, (result_array_name,), ()),)
 
-    # reduce node
-    context, initializations = rewrite_expression(ast.create_context(
-        ast=ast.Node((ast.NodeSymbol.ASSIGN,), context.ast.shape, (), (
+    result_array_names = ()
+    result_initialization = ()
+    assignments = ()
+    for expression in expressions:
+        result_array_name = ast.generate_unique_array_name(context)
+        context = ast.add_symbol(context, result_array_name, ast.NodeSymbol.ARRAY, context.ast.shape, None, None)
+        result_array_names = result_array_names + (result_array_name,)
+        result_initialization = result_initialization + (ast.Node((ast.NodeSymbol.INITIALIZE,), context.ast.shape, (result_array_name,), ()),)
+        assignments = assignments + (ast.Node((ast.NodeSymbol.ASSIGN,), context.ast.shape, (), (
             ast.Node((ast.NodeSymbol.PSI,), context.ast.shape, (), (
                 ast.Node((ast.NodeSymbol.ARRAY,), context.ast.shape, (result_index_name,), ()),
                 ast.Node((ast.NodeSymbol.ARRAY,), context.ast.shape, (result_array_name,), ()))),
-            context.ast)),
+            expression)),)
+
+    # reduce node
+    context = rewrite_expression(ast.create_context(
+        ast=ast.Node((ast.NodeSymbol.BLOCK,), context.ast.shape, (), assignments),
         symbol_table=context.symbol_table))
 
+    # arrays with column major or strided layout are indexed through their storage
+    context, storage_assignments = lower_layouts(context)
+
     # add array initializations
-    initializations = initializations + result_initialization
+    initializations = determine_constant_arrays(context) + storage_assignments + result_initialization
     function_body = function_body + initializations
 
-    if context.ast.symbol == (ast.NodeSymbol.BLOCK,):
-        loop_block = context.ast.child
-    else:
-        loop_block = (context.ast,)
+    loop_block = ()
+    for statement in context.ast.child:
+        if statement.symbol == (ast.NodeSymbol.BLOCK,):
+            loop_block = loop_block + statement.child
+        else:
+            loop_block = loop_block + (statement,)
 
     for index in indicies:
         loop_block = (ast.Node((ast.NodeSymbol.LOOP,), context.ast.shape, (index.attrib[0],), (
             ast.Node((ast.NodeSymbol.BLOCK,), context.ast.shape, (), loop_block),)),)
 
     function_body = function_body + loop_block
-
-    return ast.create_context(
-        ast=ast.Node((ast.NodeSymbol.FUNCTION,), context.ast.shape, (tuple(arg.attrib[0] for arg in array_arguments), result_array_name), (
-            ast.Node((ast.NodeSymbol.BLOCK,), context.ast.shape, (), function_body),)),
-        symbol_table=context.symbol_table)
+    return context, function_body, result_array_names
 
 
 def rewrite_expression(context):
-    initializations = ()
+    """Rewrite reductions into loops over scalar accumulators
 
+    Each reduction becomes ``acc = init; LOOP k (acc = acc op x)`` where
+    ``acc`` is a plain local scalar (no array is allocated for it) and
+    the expression continues with ``acc``. The result is stored once
+    per output element by the enclosing assignment.
+    """
     initialization_map = {
         ast.NodeSymbol.PLUS: 0,
         ast.NodeSymbol.MINUS: 0,
         ast.NodeSymbol.TIMES: 1,
         ast.NodeSymbol.DIVIDE: 1,
+        ast.NodeSymbol.MAXIMUM: float('-inf'),
+        ast.NodeSymbol.MINIMUM: float('inf'),
     }
 
     def _apply_operation_on_block(context):
@@ -109,13 +167,10 @@ def rewrite_expression(context):
             symbol_table=context.symbol_table)
 
     def _reduce_traversal(context):
-        nonlocal initializations
-
         if context.ast.symbol[0] == ast.NodeSymbol.REDUCE:
             array_name = ast.generate_unique_array_name(context)
             context = ast.add_symbol(context, array_name, ast.NodeSymbol.ARRAY, (), None, None)
 
-            initializations = initializations + (ast.Node((ast.NodeSymbol.INITIALIZE,), (), (array_name,), ()),)
             initial_value_name = ast.generate_unique_array_name(context)
             context = ast.add_symbol(context, initial_value_name, ast.NodeSymbol.ARRAY, (), None, (initialization_map[context.ast.symbol[1]],))
 
@@ -134,20 +189,238 @@ def rewrite_expression(context):
                             ast.Node((ast.NodeSymbol.ARRAY,), (), (array_name,), ()),
                             block_end)))),))
 
+            # multiple reduction indicies with last index innermost
+            loop_node = ast.Node((ast.NodeSymbol.LOOP,), context.ast.shape, (context.ast.attrib[-1],), (loop_block,))
+            for index_name in context.ast.attrib[-2::-1]:
+                loop_node = ast.Node((ast.NodeSymbol.LOOP,), context.ast.shape, (index_name,), (
+                    ast.Node((ast.NodeSymbol.BLOCK,), context.ast.shape, (), (loop_node,)),))
+
             context = ast.create_context(
                 ast=ast.Node((ast.NodeSymbol.BLOCK,), context.ast.shape, (), (
                     ast.Node((ast.NodeSymbol.ASSIGN,), (), (), (
                         ast.Node((ast.NodeSymbol.ARRAY,), (), (array_name,), ()),
                         ast.Node((ast.NodeSymbol.ARRAY,), (), (initial_value_name,), ()),)),
-                    ast.Node((ast.NodeSymbol.LOOP,), context.ast.shape, (context.ast.attrib[0],), (loop_block,)),
+                    loop_node,
                     ast.Node((ast.NodeSymbol.ARRAY,), (), (array_name,), ()))),
                 symbol_table=context.symbol_table)
         elif ast.is_operation(context):
             context = _apply_operation_on_block(context)
         return context
 
-    context = ast.node_traversal(context, _reduce_traversal, traversal='postorder')
-    return context, initializations
+    return ast.node_traversal(context, _reduce_traversal, traversal='postorder')
+
+
+def lower_layouts(context):
+    """Index arrays with non row major layout by flat offset into storage
+
+    <i j> psi A => <gamma(<i j>; A)> psi (storage A)
+
+    where gamma uses the strides of the layout of A. For a column
+    major A with shape <n m> the offset is i + (j * n). Returns the
+    assignments binding the storage of each array.
+    """
+    storage_names = {}
+
+    def _lower_layouts(context):
+        if context.ast.symbol != (ast.NodeSymbol.PSI,) or not ast.is_array(context, (1,)):
+            return context
+
+        array_name = ast.select_node(context, (1,)).ast.attrib[0]
+        array_symbol = context.symbol_table[array_name]
+        index = ast.select_array_node_symbol(context, (0,)).value
+        if array_symbol.layout is None or len(index) != len(array_symbol.shape):
+            return context
+
+        if array_name not in storage_names:
+            context, size = ast.storage_size(context, array_symbol.shape, array_symbol.layout)
+            storage_names[array_name] = ast.generate_unique_array_name(context)
+            context = ast.add_symbol(context, storage_names[array_name], ast.NodeSymbol.ARRAY, (size,), None, None)
+
+        context, offset = ast.gamma_index(context, index, array_symbol.shape, array_symbol.layout)
+        vector_name = ast.generate_unique_array_name(context)
+        context = ast.add_symbol(context, vector_name, ast.NodeSymbol.ARRAY, (1,), None, (offset,))
+
+        return ast.create_context(
+            ast=ast.Node((ast.NodeSymbol.PSI,), context.ast.shape, (), (
+                ast.Node((ast.NodeSymbol.ARRAY,), (1,), (vector_name,), ()),
+                ast.Node((ast.NodeSymbol.ARRAY,), context.symbol_table[storage_names[array_name]].shape, (storage_names[array_name],), ()))),
+            symbol_table=context.symbol_table)
+
+    context = ast.node_traversal(context, _lower_layouts, traversal='postorder')
+
+    storage_assignments = ()
+    for array_name, storage_name in storage_names.items():
+        storage_shape = context.symbol_table[storage_name].shape
+        storage_assignments = storage_assignments + (ast.Node((ast.NodeSymbol.ASSIGN,), storage_shape, (), (
+            ast.Node((ast.NodeSymbol.ARRAY,), storage_shape, (storage_name,), ()),
+            ast.Node((ast.NodeSymbol.STORAGE,), storage_shape, (), (
+                ast.Node((ast.NodeSymbol.ARRAY,), context.symbol_table[array_name].shape, (array_name,), ()),)))),)
+    return context, storage_assignments
+
+
+def _result_names(context):
+    result_names = context.ast.attrib[1]
+    return result_names if isinstance(result_names, tuple) else (result_names,)
+
+
+def _replace_result_array(context, result_name, array_name, replacement_statements=()):
+    """Replace result array by array_name and its initialization by statements"""
+    def _replace_array(context):
+        if context.ast.symbol == (ast.NodeSymbol.ARRAY,) and context.ast.attrib[0] == result_name:
+            return ast.replace_node_attributes(context, (array_name,))
+        return context
+
+    function_node = context.ast
+    statements = ()
+    for statement in function_node.child[0].child:
+        if statement.symbol == (ast.NodeSymbol.INITIALIZE,) and statement.attrib[0] == result_name:
+            statements = statements + replacement_statements
+        else:
+            statements = statements + (ast.node_traversal(
+                ast.create_context(ast=statement, symbol_table=context.symbol_table),
+                _replace_array, traversal='postorder').ast,)
+
+    argument_names, result_names = function_node.attrib
+    if isinstance(result_names, tuple):
+        result_names = tuple(array_name if name == result_name else name for name in result_names)
+    else:
+        result_names = array_name
+
+    return ast.create_context(
+        ast=ast.Node(function_node.symbol, function_node.shape, (argument_names, result_names), (
+            ast.Node((ast.NodeSymbol.BLOCK,), function_node.child[0].shape, (), statements),)),
+        symbol_table=context.symbol_table)
+
+
+def add_output_arguments(context, include_conditions=True):
+    """Write results into caller provided arrays instead of allocating them
+
+    Each result becomes an additional function argument (``out`` or
+    ``out0``, ``out1``, ... for several results) which is written and
+    returned. The dimension and shape of the output arrays are checked
+    where the results were allocated. An output array may only share
+    memory with an argument when :func:`can_write_in_place` proves
+    that the result can be written in place of the argument, otherwise
+    the generated function raises an error (``out is A`` in pure
+    python, ``numpy.shares_memory`` with numpy and numba).
+    """
+    argument_names = context.ast.attrib[0]
+    result_names = _result_names(context)
+    if len(result_names) == 1:
+        output_names = ('out',)
+    else:
+        output_names = tuple(f'out{i}' for i in range(len(result_names)))
+
+    for result_name, output_name in zip(result_names, output_names):
+        if output_name in context.symbol_table:
+            raise MOAONFReductionError(f'output argument "{output_name}" conflicts with array of the same name')
+
+        result_symbol = context.symbol_table[result_name]
+        context = ast.add_symbol(context, output_name, ast.NodeSymbol.ARRAY, result_symbol.shape, None, None)
+        output_node = ast.Node((ast.NodeSymbol.ARRAY,), result_symbol.shape, (output_name,), ())
+
+        statements = ()
+        if include_conditions:
+            value_name = ast.generate_unique_array_name(context)
+            context = ast.add_symbol(context, value_name, ast.NodeSymbol.ARRAY, (), None, (len(result_symbol.shape),))
+            condition = ast.Node((ast.NodeSymbol.EQUAL,), (), (), (
+                ast.Node((ast.NodeSymbol.DIM,), (), (), (output_node,)),
+                ast.Node((ast.NodeSymbol.ARRAY,), (), (value_name,), ())))
+
+            for i, element in enumerate(result_symbol.shape):
+                index_name = ast.generate_unique_array_name(context)
+                context = ast.add_symbol(context, index_name, ast.NodeSymbol.ARRAY, (1,), None, (i,))
+                if not ast.is_symbolic_element(element):
+                    element_name = ast.generate_unique_array_name(context)
+                    context = ast.add_symbol(context, element_name, ast.NodeSymbol.ARRAY, (), None, (element,))
+                    element = ast.Node((ast.NodeSymbol.ARRAY,), (), (element_name,), ())
+
+                # <i> psi shape out == element
+                condition = ast.Node((ast.NodeSymbol.AND,), (), (), (condition, ast.Node((ast.NodeSymbol.EQUAL,), (), (), (
+                    ast.Node((ast.NodeSymbol.PSI,), (), (), (
+                        ast.Node((ast.NodeSymbol.ARRAY,), (1,), (index_name,), ()),
+                        ast.Node((ast.NodeSymbol.SHAPE,), (len(result_symbol.shape),), (), (output_node,)))),
+                    element))))
+
+            statements = (ast.Node((ast.NodeSymbol.CONDITION,), (), (), (
+                ast.Node((ast.NodeSymbol.NOT,), (), (), (condition,)),
+                ast.Node((ast.NodeSymbol.BLOCK,), (), (), (ast.Node((ast.NodeSymbol.ERROR,), (), ('output argument has invalid shape',), ()),)))),)
+
+            # aliased arguments (and previous outputs) unless writing in place is safe
+            overlap = None
+            aliased_names = [name for name in argument_names if not can_write_in_place(context, result_name, name)]
+            for name in aliased_names + list(output_names[:output_names.index(output_name)]):
+                node = ast.Node((ast.NodeSymbol.OVERLAP,), (), (), (
+                    output_node, ast.Node((ast.NodeSymbol.ARRAY,), context.symbol_table[name].shape, (name,), ())))
+                overlap = node if overlap is None else ast.Node((ast.NodeSymbol.OR,), (), (), (overlap, node))
+
+            if overlap is not None:
+                statements = statements + (ast.Node((ast.NodeSymbol.CONDITION,), (), (), (
+                    overlap,
+                    ast.Node((ast.NodeSymbol.BLOCK,), (), (), (ast.Node((ast.NodeSymbol.ERROR,), (), ('output argument overlaps with an argument',), ()),)))),)
+
+        context = _replace_result_array(context, result_name, output_name, statements)
+
+    function_node = context.ast
+    return ast.create_context(
+        ast=ast.Node(function_node.symbol, function_node.shape, (function_node.attrib[0] + output_names, function_node.attrib[1]), function_node.child),
+        symbol_table=context.symbol_table)
+
+
+def can_write_in_place(context, result_name, array_name):
+    """Result may be written into argument array_name (aliasing analysis)
+
+    The argument must have the shape and row major layout of the
+    result. Every element of the argument is only read through the
+    index vector that the result is written with (the element of the
+    current iteration) and never after the first statement writing
+    the result, so that no value is read after it was overwritten.
+    """
+    function_node = context.ast
+    if array_name not in function_node.attrib[0]:
+        return False
+
+    array_symbol = context.symbol_table[array_name]
+    if array_symbol.layout is not None or array_symbol.shape != context.symbol_table[result_name].shape:
+        return False
+
+    def _vector(node):
+        return context.symbol_table[node.child[0].attrib[0]].value
+
+    result_vector = None
+    result_written = False
+    for statement in ast.assignment_nodes(function_node.child):
+        array_nodes = [node for node in ast.psi_nodes(statement) if node.child[1].symbol == (ast.NodeSymbol.ARRAY,) and node.child[1].attrib[0] == array_name]
+        if result_written and array_nodes:
+            return False
+
+        target = statement.child[0]
+        if target.symbol == (ast.NodeSymbol.PSI,) and target.child[1].attrib[0] == result_name:
+            if result_vector not in {None, _vector(target)}:
+                return False
+            result_vector = _vector(target)
+            result_written = True
+
+        for node in array_nodes:
+            if result_vector is not None and _vector(node) != result_vector:
+                return False
+            result_vector = _vector(node)
+    return True
+
+
+def write_in_place(context, array_name):
+    """Write the result of the function into argument array_name
+
+    Raises an error when :func:`can_write_in_place` does not prove
+    that overwriting the argument is safe.
+    """
+    result_names = _result_names(context)
+    if len(result_names) != 1:
+        raise MOAONFReductionError('in place evaluation requires a single result')
+
+    if not can_write_in_place(context, result_names[0], array_name):
+        raise MOAONFReductionError(f'result cannot be written in place of argument "{array_name}"')
+    return _replace_result_array(context, result_names[0], array_name)
 
 
 def determine_dimension_conditions(context, function_arguments):
@@ -162,21 +435,32 @@ def determine_dimension_conditions(context, function_arguments):
             ast.Node((ast.NodeSymbol.DIM,), (), (), (array,)),
             ast.Node((ast.NodeSymbol.ARRAY,), (), (value_name,), ()))))
 
-    node = dimension_conditions[0]
-    for dimension_condition in dimension_conditions[1:]:
-        node = ast.Node((ast.NodeSymbol.AND,), (), (), (dimension_condition, node))
+    node = ()
+    if dimension_conditions:
+        node = dimension_conditions[0]
+        for dimension_condition in dimension_conditions[1:]:
+            node = ast.Node((ast.NodeSymbol.AND,), (), (), (dimension_condition, node))
     return context, node
 
 
 def determine_shape_conditions(context, function_arguments):
     shape_conditions = []
     assignments = []
+    assigned_names = set()
     for array in function_arguments:
         for i, element in enumerate(array.shape):
             array_name = ast.generate_unique_array_name(context)
             context = ast.add_symbol(context, array_name, ast.NodeSymbol.ARRAY, (1,), None, (i,))
 
-            if ast.is_symbolic_element(element):
+            if ast.is_symbolic_element(element) and element.attrib[0] in assigned_names:
+                # dimension shared with previous argument n == <i> psi shape A
+                shape_conditions.append(ast.Node((ast.NodeSymbol.EQUAL,), (), (), (
+                    ast.Node((ast.NodeSymbol.ARRAY,), (), (element.attrib[0],), ()),
+                    ast.Node((ast.NodeSymbol.PSI,), (), (), (
+                        ast.Node((ast.NodeSymbol.ARRAY,), (1,), (array_name,), ()),
+                        ast.Node((ast.NodeSymbol.SHAPE,), (len(array.shape),), (), (array,)))))))
+            elif ast.is_symbolic_element(element):
+                assigned_names.add(element.attrib[0])
                 # <i> psi shape A
                 assignments.append(ast.Node((ast.NodeSymbol.ASSIGN,), (), (), (
                     ast.Node((ast.NodeSymbol.ARRAY,), (), (element.attrib[0],), ()),
@@ -220,39 +504,199 @@ def determine_function_arguments(symbol_table):
                 raise NotImplementedError('cannot have implicit array with unknown shape')
             elif ast.has_symbolic_elements(symbol_node.value):
                 for element in symbol_node.value:
-                    if ast.is_symbolic_element(element) and symbol_table[element.attrib[0]].symbol != ast.NodeSymbol.INDEX:
-                        array_arguments.add(element.attrib[0])
+                    for element_name in ast.element_symbols(element):
+                        element_symbol = symbol_table[element_name]
+                        if element_symbol.symbol != ast.NodeSymbol.INDEX and element_symbol.value is None:
+                            array_arguments.add(element_name)
         else: # user defined
             if symbol_node.shape is None:
                 array_arguments.add(symbol_name)
             elif ast.has_symbolic_elements(symbol_node.shape):
                 array_arguments.add(symbol_name)
                 for element in symbol_node.shape:
-                    if ast.is_symbolic_element(element):
-                        dependent_arguments.add(element.attrib[0])
+                    dependent_arguments.update(ast.element_symbols(element))
 
             if symbol_node.value is None:
                 array_arguments.add(symbol_name)
             elif ast.has_symbolic_elements(symbol_node.value):
                 array_arguments.add(symbol_name)
                 for element in symbol_node.value:
-                    if ast.is_symbolic_element(element):
-                        dependent_arguments.add(element.attrib[0])
+                    dependent_arguments.update(ast.element_symbols(element))
     return tuple(ast.Node((ast.NodeSymbol.ARRAY,), symbol_table[array_name].shape, (array_name,), ()) for array_name in sorted(array_arguments - dependent_arguments))
 
 
-def determine_indicies(context):
+def determine_constant_arrays(context):
+    """Initialize arrays with compile time known values that are indexed in expression
+
+    Scalar constants are materialized as literals by the backend so
+    only non scalar arrays become precomputed tables.
+    """
+    constant_arrays = []
+
+    def _constant_arrays(context):
+        if context.ast.symbol == (ast.NodeSymbol.PSI,) and ast.is_array(context, (1,)):
+            array_name = ast.select_node(context, (1,)).ast.attrib[0]
+            node_symbol = context.symbol_table[array_name]
+            if node_symbol.value is not None and not ast.has_symbolic_elements(node_symbol.value) and array_name not in constant_arrays:
+                constant_arrays.append(array_name)
+        return context
+
+    ast.node_traversal(context, _constant_arrays, traversal='postorder')
+    return tuple(ast.Node((ast.NodeSymbol.INITIALIZE,), context.symbol_table[array_name].shape, (array_name,), ()) for array_name in constant_arrays)
+
+
+def determine_indicies(context, symbol_names=None):
+    """Indicies of the loops over the result of the expression
+
+    Restricted to ``symbol_names`` when given (the indicies of one
+    expression among several sharing a symbol table).
+    """
     indicies = set()
     for symbol_name, symbol_node in context.symbol_table.items():
-        if symbol_node.symbol == ast.NodeSymbol.INDEX:
+        if symbol_node.symbol == ast.NodeSymbol.INDEX and (symbol_names is None or symbol_name in symbol_names):
             indicies.add(symbol_name)
 
     # find indicies in reductions (they should not be included)
     reduction_indicies = set()
     def _reduce_indicies(context):
         if context.ast.symbol[0] == ast.NodeSymbol.REDUCE:
-            reduction_indicies.add(context.ast.attrib[0])
+            reduction_indicies.update(context.ast.attrib)
         return context
 
     ast.node_traversal(context, _reduce_indicies, traversal='postorder')
-    return tuple(ast.Node((ast.NodeSymbol.ARRAY,), (), (i,), ()) for i in sorted(indicies - reduction_indicies))
+    # symbol table insertion order matches order of dimensions
+    return tuple(ast.Node((ast.NodeSymbol.ARRAY,), (), (i,), ()) for i in context.symbol_table if i in indicies - reduction_indicies)
+
+
+def temporary_lifetimes(context):
+    """Top level statements between which each temporary array is live
+
+    Temporaries are the arrays initialized within the function that
+    are neither results nor compile time tables, for example the
+    partial results of parallel reductions. Returns a mapping of
+    temporary name to the index of the first and last statement of
+    the function body referencing it.
+    """
+    function_node = context.ast
+    result_names = _result_names(context)
+
+    lifetimes = {}
+    for i, statement in enumerate(function_node.child[0].child):
+        if statement.symbol == (ast.NodeSymbol.INITIALIZE,):
+            array_name = statement.attrib[0]
+            if array_name not in result_names and context.symbol_table[array_name].value is None:
+                lifetimes[array_name] = (i, i)
+            continue
+
+        for node in ast.array_nodes(statement):
+            array_name = node.attrib[0]
+            if array_name in lifetimes:
+                lifetimes[array_name] = (lifetimes[array_name][0], i)
+    return lifetimes
+
+
+def plan_memory(context):
+    """Place temporaries with disjoint lifetimes in one shared arena
+
+    Each temporary of compile time known shape that is only accessed
+    by full psi indices is assigned an offset within a single flat
+    array (first fit, largest temporaries first) such that temporaries
+    live at the same time never overlap. Accesses become flat offsets
+    into the arena
+
+    <i j> psi T => <offset + gamma(<i j>; T)> psi arena
+
+    Returns the new context and the number of elements of the arena,
+    the peak temporary memory of the function. Temporaries with
+    symbolic shape keep their own allocation and are not counted.
+    """
+    function_node = context.ast
+    lifetimes = temporary_lifetimes(context)
+
+    def _vector_length(node):
+        return len(context.symbol_table[node.child[0].attrib[0]].value)
+
+    references = {name: 0 for name in lifetimes}
+    psi_accesses = {name: 0 for name in lifetimes}
+    for node in ast.array_nodes(function_node):
+        if node.attrib[0] in references:
+            references[node.attrib[0]] += 1
+
+    def _count_psi_accesses(context):
+        if context.ast.symbol == (ast.NodeSymbol.PSI,) and ast.is_array(context, (1,)):
+            array_name = ast.select_node(context, (1,)).ast.attrib[0]
+            if array_name in psi_accesses and _vector_length(context.ast) == len(context.symbol_table[array_name].shape):
+                psi_accesses[array_name] += 1
+        return context
+
+    ast.node_traversal(context, _count_psi_accesses, traversal='postorder')
+
+    sizes = {}
+    for name in lifetimes:
+        shape = context.symbol_table[name].shape
+        if references[name] == psi_accesses[name] and not ast.has_symbolic_elements(shape):
+            size = 1
+            for bound in shape:
+                size = size * bound
+            sizes[name] = size
+
+    if not sizes:
+        return context, 0
+
+    offsets = {}
+    for name in sorted(sizes, key=lambda name: (-sizes[name], lifetimes[name][0])):
+        start, stop = lifetimes[name]
+        offset = 0
+        for other_offset, other_name in sorted((offsets[other], other) for other in offsets):
+            other_start, other_stop = lifetimes[other_name]
+            if other_stop < start or stop < other_start:
+                continue
+            if offset + sizes[name] <= other_offset:
+                break
+            offset = max(offset, other_offset + sizes[other_name])
+        offsets[name] = offset
+    arena_size = max(offsets[name] + sizes[name] for name in offsets)
+
+    arena_name = ast.generate_unique_array_name(context)
+    context = ast.add_symbol(context, arena_name, ast.NodeSymbol.ARRAY, (arena_size,), None, None)
+
+    def _arena_access(context):
+        if context.ast.symbol != (ast.NodeSymbol.PSI,) or not ast.is_array(context, (1,)):
+            return context
+
+        array_name = ast.select_node(context, (1,)).ast.attrib[0]
+        if array_name not in offsets:
+            return context
+
+        index = ast.select_array_node_symbol(context, (0,)).value
+        context, offset = ast.gamma_index(context, index, context.symbol_table[array_name].shape)
+        context, offset = ast.element_operation(context, ast.NodeSymbol.PLUS, offsets[array_name], offset)
+        vector_name = ast.generate_unique_array_name(context)
+        context = ast.add_symbol(context, vector_name, ast.NodeSymbol.ARRAY, (1,), None, (offset,))
+
+        return ast.create_context(
+            ast=ast.Node((ast.NodeSymbol.PSI,), context.ast.shape, (), (
+                ast.Node((ast.NodeSymbol.ARRAY,), (1,), (vector_name,), ()),
+                ast.Node((ast.NodeSymbol.ARRAY,), (arena_size,), (arena_name,), ()))),
+            symbol_table=context.symbol_table)
+
+    # the arena is allocated in place of the first temporary
+    statements = ()
+    arena_initialized = False
+    for statement in function_node.child[0].child:
+        if statement.symbol == (ast.NodeSymbol.INITIALIZE,) and statement.attrib[0] in offsets:
+            if not arena_initialized:
+                statements = statements + (ast.Node((ast.NodeSymbol.INITIALIZE,), (arena_size,), (arena_name,), ()),)
+                arena_initialized = True
+            continue
+
+        statement_context = ast.node_traversal(
+            ast.create_context(ast=statement, symbol_table=context.symbol_table),
+            _arena_access, traversal='postorder')
+        context = ast.create_context(ast=context.ast, symbol_table=statement_context.symbol_table)
+        statements = statements + (statement_context.ast,)
+
+    return ast.create_context(
+        ast=ast.Node(function_node.symbol, function_node.shape, function_node.attrib, (
+            ast.Node((ast.NodeSymbol.BLOCK,), function_node.child[0].shape, (), statements),)),
+        symbol_table=context.symbol_table), arena_size
@@ -0,0 +1,901 @@
+import itertools
+import operator
+from functools import reduce
+
+from . import ast
+from .analysis import metric_flops
+
+
+# constant arrays
+def constant_array_symbol(context, selection=()):
+    """Symbol node of array with compile time known shape and values
+
+    Returns None if the selected node is not an array or either its
+    shape or value contains symbolic elements.
+    """
+    context = ast.select_node(context, selection)
+    if not ast.is_array(context):
+        return None
+
+    node_symbol = ast.select_array_node_symbol(context)
+    if node_symbol.symbol != ast.NodeSymbol.ARRAY or node_symbol.shape is None or node_symbol.value is None:
+        return None
+    elif ast.has_symbolic_elements(node_symbol.shape) or ast.has_symbolic_elements(node_symbol.value):
+        return None
+    return node_symbol
+
+
+def _add_constant_array(context, shape, value):
+    array_name = ast.generate_unique_array_name(context)
+    context = ast.add_symbol(context, array_name, ast.NodeSymbol.ARRAY, shape, None, tuple(value))
+    return ast.create_context(
+        ast=ast.Node((ast.NodeSymbol.ARRAY,), shape, (array_name,), ()),
+        symbol_table=context.symbol_table)
+
+
+def _row_major_offset(index, shape):
+    offset = 0
+    for element, bound in zip(index, shape):
+        offset = offset * bound + element
+    return offset
+
+
+def _num_elements(shape):
+    return reduce(operator.mul, shape, 1)
+
+
+# constant folding
+def fold_constants(context):
+    """Postorder traversal evaluating operations on compile time known arrays
+
+    Arrays with known shape and values (``LazyArray(value=...)`` and
+    scalar literals) are evaluated in the compiler and replaced by a
+    new constant array. Afterwards scalars are materialized as
+    literals and constant arrays indexed with unknown indicies become
+    precomputed tables. Valid after shape analysis and after reduction
+    to DNF.
+    """
+    return ast.node_traversal(context, _fold_replacement, traversal='postorder')
+
+
+def _fold_replacement(context):
+    fold_rules = {
+        (ast.NodeSymbol.PLUS,): _fold_plus_minus_times_divide,
+        (ast.NodeSymbol.MINUS,): _fold_plus_minus_times_divide,
+        (ast.NodeSymbol.TIMES,): _fold_plus_minus_times_divide,
+        (ast.NodeSymbol.DIVIDE,): _fold_plus_minus_times_divide,
+        (ast.NodeSymbol.PSI,): _fold_psi,
+        (ast.NodeSymbol.TRANSPOSE,): _fold_transpose,
+        (ast.NodeSymbol.TRANSPOSEV,): _fold_transposev,
+        (ast.NodeSymbol.RAV,): _fold_ravel,
+        (ast.NodeSymbol.RESHAPE,): _fold_reshape,
+        (ast.NodeSymbol.REDUCE, ast.NodeSymbol.PLUS): _fold_reduce,
+        (ast.NodeSymbol.REDUCE, ast.NodeSymbol.MINUS): _fold_reduce,
+        (ast.NodeSymbol.REDUCE, ast.NodeSymbol.TIMES): _fold_reduce,
+        (ast.NodeSymbol.REDUCE, ast.NodeSymbol.DIVIDE): _fold_reduce,
+        (ast.NodeSymbol.REDUCE, ast.NodeSymbol.MAXIMUM): _fold_reduce,
+        (ast.NodeSymbol.REDUCE, ast.NodeSymbol.MINIMUM): _fold_reduce,
+    }
+
+    fold_function = fold_rules.get(context.ast.symbol)
+    if fold_function is None or any(constant_array_symbol(context, (i,)) is None for i in range(ast.num_node_children(context))):
+        return context
+    return fold_function(context)
+
+
+_OPERATION_MAP = {
+    ast.NodeSymbol.PLUS: operator.add,
+    ast.NodeSymbol.MINUS: operator.sub,
+    ast.NodeSymbol.TIMES: operator.mul,
+    ast.NodeSymbol.DIVIDE: operator.truediv,
+    ast.NodeSymbol.MAXIMUM: max,
+    ast.NodeSymbol.MINIMUM: min,
+}
+
+
+def _fold_plus_minus_times_divide(context):
+    """Elementwise operation with scalar extension"""
+    left_symbol = constant_array_symbol(context, (0,))
+    right_symbol = constant_array_symbol(context, (1,))
+    operation = _OPERATION_MAP[context.ast.symbol[0]]
+
+    shape = right_symbol.shape if left_symbol.shape == () else left_symbol.shape
+    left_value = left_symbol.value * _num_elements(shape) if left_symbol.shape == () else left_symbol.value
+    right_value = right_symbol.value * _num_elements(shape) if right_symbol.shape == () else right_symbol.value
+    return _add_constant_array(context, shape, map(operation, left_value, right_value))
+
+
+def _fold_psi(context):
+    """<i j> psi A with known A => subarray of A"""
+    index = constant_array_symbol(context, (0,)).value
+    array_symbol = constant_array_symbol(context, (1,))
+
+    shape = array_symbol.shape[len(index):]
+    offset = _row_major_offset(index, array_symbol.shape) * _num_elements(shape)
+    return _add_constant_array(context, shape, array_symbol.value[offset:offset + _num_elements(shape)])
+
+
+def _transpose_values(array_symbol, transpose_vector):
+    """Values of transposed array where array dimension k becomes dimension transpose_vector[k]"""
+    shape = [None] * len(array_symbol.shape)
+    for dimension, bound in zip(transpose_vector, array_symbol.shape):
+        shape[dimension] = bound
+    shape = tuple(shape)
+
+    value = ()
+    for index in itertools.product(*(range(bound) for bound in shape)):
+        array_index = tuple(index[dimension] for dimension in transpose_vector)
+        value = value + (array_symbol.value[_row_major_offset(array_index, array_symbol.shape)],)
+    return shape, value
+
+
+def _fold_transpose(context):
+    array_symbol = constant_array_symbol(context, (0,))
+    transpose_vector = tuple(range(len(array_symbol.shape)))[::-1]
+    return _add_constant_array(context, *_transpose_values(array_symbol, transpose_vector))
+
+
+def _fold_transposev(context):
+    vector = constant_array_symbol(context, (0,)).value
+    array_symbol = constant_array_symbol(context, (1,))
+    transpose_order = sorted(vector)
+    transpose_vector = tuple(transpose_order.index(element) for element in vector)
+    return _add_constant_array(context, *_transpose_values(array_symbol, transpose_vector))
+
+
+def _fold_ravel(context):
+    array_symbol = constant_array_symbol(context, (0,))
+    return _add_constant_array(context, (len(array_symbol.value),), array_symbol.value)
+
+
+def _fold_reshape(context):
+    shape = constant_array_symbol(context, (0,)).value
+    return _add_constant_array(context, tuple(shape), constant_array_symbol(context, (1,)).value)
+
+
+def _fold_reduce(context):
+    """Reduction over axes matching loop evaluation order of onf"""
+    initial_value_map = {
+        ast.NodeSymbol.PLUS: 0,
+        ast.NodeSymbol.MINUS: 0,
+        ast.NodeSymbol.TIMES: 1,
+        ast.NodeSymbol.DIVIDE: 1,
+        ast.NodeSymbol.MAXIMUM: float('-inf'),
+        ast.NodeSymbol.MINIMUM: float('inf'),
+    }
+
+    array_symbol = constant_array_symbol(context, (0,))
+    operation = context.ast.symbol[1]
+    axes = context.ast.attrib or (0,)
+
+    shape = tuple(bound for i, bound in enumerate(array_symbol.shape) if i not in axes)
+    reduced_shape = tuple(array_symbol.shape[axis] for axis in axes)
+
+    value = ()
+    for index in itertools.product(*(range(bound) for bound in shape)):
+        elements = ()
+        for reduced_index in itertools.product(*(range(bound) for bound in reduced_shape)):
+            array_index = list(index)
+            for axis, element in zip(axes, reduced_index):
+                array_index.insert(axis, element)
+            elements = elements + (array_symbol.value[_row_major_offset(array_index, array_symbol.shape)],)
+        value = value + (reduce(_OPERATION_MAP[operation], elements, initial_value_map[operation]),)
+    return _add_constant_array(context, shape, value)
+
+
+# identities
+def remove_identities(context):
+    """Postorder traversal removing operations with identity elements
+
+    x + 0, 0 + x, x - 0, x * 1, 1 * x, x / 1 => x
+    x * 0, 0 * x => 0
+
+    Assumes the expression is in DNF (every operation is on
+    scalars). Note that ``x * 0 => 0`` does not propagate ``nan`` or
+    ``inf`` values within x.
+    """
+    return ast.node_traversal(context, _identity_replacement, traversal='postorder')
+
+
+def _scalar_value(context, selection):
+    node_symbol = constant_array_symbol(context, selection)
+    if node_symbol is None or node_symbol.shape != ():
+        return None
+    return node_symbol.value[0]
+
+
+def _identity_replacement(context):
+    symbol = context.ast.symbol
+    if symbol not in {(ast.NodeSymbol.PLUS,), (ast.NodeSymbol.MINUS,), (ast.NodeSymbol.TIMES,), (ast.NodeSymbol.DIVIDE,)}:
+        return context
+
+    left_value = _scalar_value(context, (0,))
+    right_value = _scalar_value(context, (1,))
+
+    def _keep(selection):
+        node = ast.select_node(context, selection).ast
+        return ast.create_context(
+            ast=ast.Node(node.symbol, context.ast.shape, node.attrib, node.child),
+            symbol_table=context.symbol_table)
+
+    if symbol in {(ast.NodeSymbol.PLUS,), (ast.NodeSymbol.MINUS,)} and right_value == 0:
+        return _keep((0,))
+    elif symbol == (ast.NodeSymbol.PLUS,) and left_value == 0:
+        return _keep((1,))
+    elif symbol in {(ast.NodeSymbol.TIMES,), (ast.NodeSymbol.DIVIDE,)} and right_value == 1:
+        return _keep((0,))
+    elif symbol == (ast.NodeSymbol.TIMES,) and left_value == 1:
+        return _keep((1,))
+    elif symbol == (ast.NodeSymbol.TIMES,) and right_value == 0:
+        return _keep((1,))
+    elif symbol == (ast.NodeSymbol.TIMES,) and left_value == 0:
+        return _keep((0,))
+    return context
+
+
+# algebraic simplification
+SYMBOLIC_BOUND = 1024
+
+
+def simplify(context):
+    """Postorder traversal applying algebraic rewrites that reduce flops
+
+    Rewrites are only accepted when ``metric_flops`` of the rewritten
+    expression decreases. Must be applied after shape analysis and
+    before reduction to DNF. Reassociation may change floating point
+    rounding.
+    """
+    return ast.node_traversal(context, _simplify_replacement, traversal='postorder')
+
+
+def _flops(context):
+    return metric_flops(context, symbolic_bound=SYMBOLIC_BOUND)
+
+
+def _simplify_replacement(context):
+    simplify_rules = (
+        _simplify_factor,
+        _simplify_scalar_chain,
+        _simplify_reduce_scalar,
+    )
+
+    flops = _flops(context)
+    for simplify_function in simplify_rules:
+        node = simplify_function(context.ast)
+        if node is None:
+            continue
+
+        simplified_context = ast.create_context(ast=node, symbol_table=context.symbol_table)
+        if _flops(simplified_context) < flops:
+            # rewritten subexpressions may allow further simplification
+            return simplify(simplified_context)
+    return context
+
+
+def _is_scalar(node):
+    return node.shape == ()
+
+
+def _binary_node(symbol, left, right):
+    shape = right.shape if _is_scalar(left) else left.shape
+    return ast.Node((symbol,), shape, (), (left, right))
+
+
+def _simplify_factor(node):
+    """(x * y) (+-) (x * z) => x * (y (+-) z) and (y / x) (+-) (z / x) => (y (+-) z) / x"""
+    if node.symbol not in {(ast.NodeSymbol.PLUS,), (ast.NodeSymbol.MINUS,)}:
+        return None
+
+    operation = node.symbol[0]
+    left, right = node.child
+    if left.symbol != right.symbol:
+        return None
+
+    if left.symbol == (ast.NodeSymbol.TIMES,):
+        for i, j in itertools.product((0, 1), repeat=2):
+            if left.child[i] == right.child[j]:
+                factor = left.child[i]
+                remainder = _binary_node(operation, left.child[1-i], right.child[1-j])
+                children = (factor, remainder) if i == 0 else (remainder, factor)
+                return ast.Node((ast.NodeSymbol.TIMES,), node.shape, (), children)
+    elif left.symbol == (ast.NodeSymbol.DIVIDE,) and left.child[1] == right.child[1]:
+        remainder = _binary_node(operation, left.child[0], right.child[0])
+        return ast.Node((ast.NodeSymbol.DIVIDE,), node.shape, (), (remainder, left.child[1]))
+    return None
+
+
+def _simplify_scalar_chain(node):
+    """(x op1 s) op2 t => x op3 (s op4 t) for array x and scalars s, t
+
+    Commutative operations (+*) are allowed to have the scalar on
+    either side.
+    """
+    commutative = {ast.NodeSymbol.PLUS, ast.NodeSymbol.TIMES}
+    chain_rules = {
+        # (outer, inner): (outer, scalar)
+        (ast.NodeSymbol.PLUS, ast.NodeSymbol.PLUS): (ast.NodeSymbol.PLUS, ast.NodeSymbol.PLUS),
+        (ast.NodeSymbol.MINUS, ast.NodeSymbol.PLUS): (ast.NodeSymbol.PLUS, ast.NodeSymbol.MINUS),
+        (ast.NodeSymbol.PLUS, ast.NodeSymbol.MINUS): (ast.NodeSymbol.MINUS, ast.NodeSymbol.MINUS),
+        (ast.NodeSymbol.MINUS, ast.NodeSymbol.MINUS): (ast.NodeSymbol.MINUS, ast.NodeSymbol.PLUS),
+        (ast.NodeSymbol.TIMES, ast.NodeSymbol.TIMES): (ast.NodeSymbol.TIMES, ast.NodeSymbol.TIMES),
+        (ast.NodeSymbol.DIVIDE, ast.NodeSymbol.TIMES): (ast.NodeSymbol.TIMES, ast.NodeSymbol.DIVIDE),
+        (ast.NodeSymbol.TIMES, ast.NodeSymbol.DIVIDE): (ast.NodeSymbol.DIVIDE, ast.NodeSymbol.DIVIDE),
+        (ast.NodeSymbol.DIVIDE, ast.NodeSymbol.DIVIDE): (ast.NodeSymbol.DIVIDE, ast.NodeSymbol.TIMES),
+    }
+
+    def _split_scalar(node):
+        """op(x, s) => (x, s) where s is scalar and x is not"""
+        if len(node.symbol) != 1 or len(node.child) != 2:
+            return None
+        left, right = node.child
+        if _is_scalar(right) and not _is_scalar(left):
+            return left, right
+        elif node.symbol[0] in commutative and _is_scalar(left) and not _is_scalar(right):
+            return right, left
+        return None
+
+    outer_split = _split_scalar(node)
+    if outer_split is None:
+        return None
+    inner_node, t = outer_split
+
+    inner_split = _split_scalar(inner_node)
+    if inner_split is None:
+        return None
+    x, s = inner_split
+
+    rule = chain_rules.get((node.symbol[0], inner_node.symbol[0]))
+    if rule is None:
+        return None
+
+    outer_operation, scalar_operation = rule
+    return ast.Node((outer_operation,), node.shape, (), (
+        x, ast.Node((scalar_operation,), (), (), (s, t))))
+
+
+def _simplify_reduce_scalar(node):
+    """(+-)red (s * x) => s * (+-)red x and (+-)red (x / s) => ((+-)red x) / s for scalar s"""
+    if node.symbol not in {(ast.NodeSymbol.REDUCE, ast.NodeSymbol.PLUS), (ast.NodeSymbol.REDUCE, ast.NodeSymbol.MINUS)}:
+        return None
+
+    child = node.child[0]
+    if child.symbol == (ast.NodeSymbol.TIMES,):
+        for i in (0, 1):
+            if _is_scalar(child.child[i]) and not _is_scalar(child.child[1-i]):
+                reduce_node = ast.Node(node.symbol, node.shape, node.attrib, (child.child[1-i],))
+                children = (child.child[i], reduce_node) if i == 0 else (reduce_node, child.child[i])
+                return ast.Node((ast.NodeSymbol.TIMES,), node.shape, (), children)
+    elif child.symbol == (ast.NodeSymbol.DIVIDE,) and _is_scalar(child.child[1]) and not _is_scalar(child.child[0]):
+        reduce_node = ast.Node(node.symbol, node.shape, node.attrib, (child.child[0],))
+        return ast.Node((ast.NodeSymbol.DIVIDE,), node.shape, (), (reduce_node, child.child[1]))
+    return None
+
+
+# common subexpression elimination
+_SUBEXPRESSION_SYMBOLS = {
+    (ast.NodeSymbol.PSI,),
+    (ast.NodeSymbol.PLUS,), (ast.NodeSymbol.MINUS,),
+    (ast.NodeSymbol.TIMES,), (ast.NodeSymbol.DIVIDE,),
+    (ast.NodeSymbol.FLOORDIVIDE,), (ast.NodeSymbol.MODULO,),
+}
+
+
+def eliminate_common_subexpressions(context):
+    """Bind repeated loads and computations within a block to temporaries
+
+    Applied to ONF. Within each block identical psi loads, arithmetic
+    operations and index arithmetic that are evaluated more than once
+    and do not read arrays assigned within the block are computed
+    once and assigned to a scalar temporary before the first statement
+    that uses them.
+
+    Returns the context and number of eliminated operations.
+    """
+    num_eliminated = 0
+
+    def _block_replacement(context):
+        nonlocal num_eliminated
+        if context.ast.symbol != (ast.NodeSymbol.BLOCK,):
+            return context
+        context, block_eliminated = _eliminate_block_subexpressions(context)
+        num_eliminated += block_eliminated
+        return context
+
+    context = ast.node_traversal(context, _block_replacement, traversal='postorder')
+    return context, num_eliminated
+
+
+def _vector_elements(context, node):
+    return context.symbol_table[node.child[0].attrib[0]].value
+
+
+def _subexpression_key(context, element):
+    """Hashable key of element ignoring node shapes and names of index vectors"""
+    if not ast.is_symbolic_element(element):
+        return element
+    elif element.symbol == (ast.NodeSymbol.ARRAY,) and _scalar_value(ast.create_context(ast=element, symbol_table=context.symbol_table), ()) is not None:
+        # constants with equal values are stored under different names
+        return element.symbol, context.symbol_table[element.attrib[0]].value
+    elif element.symbol == (ast.NodeSymbol.PSI,):
+        return (element.symbol, tuple(_subexpression_key(context, _) for _ in _vector_elements(context, element)), _subexpression_key(context, element.child[1]))
+    return (element.symbol, element.attrib, tuple(_subexpression_key(context, _) for _ in element.child))
+
+
+def _subexpressions(context, element):
+    """All subexpressions of element including index arithmetic within psi"""
+    if not ast.is_symbolic_element(element):
+        return
+
+    if element.symbol in _SUBEXPRESSION_SYMBOLS:
+        yield element
+
+    children = element.child
+    if element.symbol == (ast.NodeSymbol.PSI,):
+        children = _vector_elements(context, element) + element.child[1:]
+    for child in children:
+        yield from _subexpressions(context, child)
+
+
+def _subexpression_leaves(context, element):
+    if not ast.is_symbolic_element(element):
+        return
+    elif element.symbol in {(ast.NodeSymbol.ARRAY,), (ast.NodeSymbol.INDEX,)}:
+        yield element
+        return
+
+    children = element.child
+    if element.symbol == (ast.NodeSymbol.PSI,):
+        children = _vector_elements(context, element) + element.child[1:]
+    for child in children:
+        yield from _subexpression_leaves(context, child)
+
+
+def _num_operations(context, element):
+    return sum(1 for _ in _subexpressions(context, element))
+
+
+def _replace_subexpression(context, element, key, replacement_node):
+    """Replace all occurrences of subexpression with key in element"""
+    if not ast.is_symbolic_element(element) or element.symbol in {(ast.NodeSymbol.ARRAY,), (ast.NodeSymbol.INDEX,)}:
+        return context, element
+    elif element.symbol in _SUBEXPRESSION_SYMBOLS and _subexpression_key(context, element) == key:
+        return context, replacement_node
+
+    children = ()
+    for child in element.child:
+        context, child = _replace_subexpression(context, child, key, replacement_node)
+        children = children + (child,)
+
+    if element.symbol == (ast.NodeSymbol.PSI,):
+        vector_elements = ()
+        for vector_element in _vector_elements(context, element):
+            context, vector_element = _replace_subexpression(context, vector_element, key, replacement_node)
+            vector_elements = vector_elements + (vector_element,)
+
+        if vector_elements != _vector_elements(context, element):
+            vector_name = ast.generate_unique_array_name(context)
+            context = ast.add_symbol(context, vector_name, ast.NodeSymbol.ARRAY, (len(vector_elements),), None, vector_elements)
+            children = (ast.Node((ast.NodeSymbol.ARRAY,), children[0].shape, (vector_name,), ()),) + children[1:]
+
+    return context, ast.Node(element.symbol, element.shape, element.attrib, children)
+
+
+def _assigned_names(node):
+    """Names of arrays assigned within node"""
+    names = set()
+    if node.symbol == (ast.NodeSymbol.ASSIGN,):
+        target = node.child[0]
+        if target.symbol == (ast.NodeSymbol.PSI,):
+            target = target.child[1]
+        names.add(target.attrib[0])
+
+    for child in node.child:
+        names.update(_assigned_names(child))
+    return names
+
+
+def _eliminate_block_subexpressions(context):
+    statements = context.ast.child
+    assigned_names = _assigned_names(context.ast)
+
+    num_eliminated = 0
+    while True:
+        candidates = {}
+        for index, statement in enumerate(statements):
+            if statement.symbol != (ast.NodeSymbol.ASSIGN,):
+                continue
+
+            for subexpression in _subexpressions(context, statement):
+                if {_.attrib[0] for _ in _subexpression_leaves(context, subexpression)} & assigned_names:
+                    continue
+
+                key = _subexpression_key(context, subexpression)
+                if key in candidates:
+                    candidates[key][1] += 1
+                else:
+                    candidates[key] = [index, 1, subexpression]
+
+        repeated = [(key, first_index, count, subexpression) for key, (first_index, count, subexpression) in candidates.items() if count > 1]
+        if not repeated:
+            break
+
+        # largest subexpression first since it contains the smaller
+        key, first_index, count, subexpression = max(repeated, key=lambda _: (_num_operations(context, _[3]), -_[1]))
+
+        temporary_name = ast.generate_unique_array_name(context)
+        context = ast.add_symbol(context, temporary_name, ast.NodeSymbol.ARRAY, (), None, None)
+        temporary_node = ast.Node((ast.NodeSymbol.ARRAY,), (), (temporary_name,), ())
+
+        new_statements = ()
+        for statement in statements:
+            if statement.symbol == (ast.NodeSymbol.ASSIGN,):
+                context, statement = _replace_subexpression(context, statement, key, temporary_node)
+            new_statements = new_statements + (statement,)
+
+        temporary_assignment = ast.Node((ast.NodeSymbol.ASSIGN,), (), (), (temporary_node, subexpression))
+        statements = new_statements[:first_index] + (temporary_assignment,) + new_statements[first_index:]
+        num_eliminated += (count - 1) * _num_operations(context, subexpression)
+
+    return ast.create_context(
+        ast=ast.Node(context.ast.symbol, context.ast.shape, context.ast.attrib, statements),
+        symbol_table=context.symbol_table), num_eliminated
+
+
+# loop invariant code motion
+def hoist_loop_invariants(context):
+    """Hoist loads and computations out of loops they do not depend on
+
+    Applied to ONF. A subexpression within a loop is invariant when it
+    references neither the index of the loop (or of loops nested
+    within it) nor an array assigned within the loop. Loops are
+    visited outermost first so each invariant is assigned to a scalar
+    temporary directly before the outermost loop where it is still
+    valid. For example in the inner product ``A[i, k]`` is loaded
+    once per ``k`` rather than within the loop over ``j``.
+
+    Returns the context and number of hoisted subexpressions.
+    """
+    num_hoisted = 0
+
+    def _hoist_statements(context, statements):
+        nonlocal num_hoisted
+        hoisted_statements = ()
+        for statement in statements:
+            if statement.symbol == (ast.NodeSymbol.LOOP,):
+                context, assignments, statement = _hoist_loop_invariants(context, statement)
+                num_hoisted += len(assignments)
+                hoisted_statements = hoisted_statements + assignments
+
+            if statement.symbol in {(ast.NodeSymbol.LOOP,), (ast.NodeSymbol.BLOCK,), (ast.NodeSymbol.FUNCTION,), (ast.NodeSymbol.CONDITION,)}:
+                context, child = _hoist_statements(context, statement.child)
+                statement = ast.Node(statement.symbol, statement.shape, statement.attrib, child)
+            hoisted_statements = hoisted_statements + (statement,)
+        return context, hoisted_statements
+
+    context, (node,) = _hoist_statements(context, (context.ast,))
+    return ast.create_context(ast=node, symbol_table=context.symbol_table), num_hoisted
+
+
+def _loop_indicies(node):
+    names = set()
+    if node.symbol == (ast.NodeSymbol.LOOP,):
+        names.add(node.attrib[0])
+    for child in node.child:
+        names.update(_loop_indicies(child))
+    return names
+
+
+def _loop_assignments(node):
+    if node.symbol == (ast.NodeSymbol.ASSIGN,):
+        return (node,)
+    return tuple(statement for child in node.child for statement in _loop_assignments(child))
+
+
+def _replace_loop_subexpression(context, node, key, replacement_node):
+    if node.symbol == (ast.NodeSymbol.ASSIGN,):
+        return _replace_subexpression(context, node, key, replacement_node)
+
+    children = ()
+    for child in node.child:
+        context, child = _replace_loop_subexpression(context, child, key, replacement_node)
+        children = children + (child,)
+    return context, ast.Node(node.symbol, node.shape, node.attrib, children)
+
+
+def _hoist_loop_invariants(context, loop_node):
+    variant_names = _assigned_names(loop_node) | _loop_indicies(loop_node)
+
+    assignments = ()
+    while True:
+        invariants = []
+        for statement in _loop_assignments(loop_node):
+            for subexpression in _subexpressions(context, statement):
+                if not ({_.attrib[0] for _ in _subexpression_leaves(context, subexpression)} & variant_names):
+                    invariants.append(subexpression)
+        if not invariants:
+            break
+
+        # largest subexpression first since it contains the smaller
+        subexpression = max(invariants, key=lambda _: _num_operations(context, _))
+        key = _subexpression_key(context, subexpression)
+
+        temporary_name = ast.generate_unique_array_name(context)
+        context = ast.add_symbol(context, temporary_name, ast.NodeSymbol.ARRAY, (), None, None)
+        temporary_node = ast.Node((ast.NodeSymbol.ARRAY,), (), (temporary_name,), ())
+
+        context, loop_node = _replace_loop_subexpression(context, loop_node, key, temporary_node)
+        assignments = assignments + (ast.Node((ast.NodeSymbol.ASSIGN,), (), (), (temporary_node, subexpression)),)
+
+    return context, assignments, loop_node
+
+
+# compile time conditions
+_COMPARISON_MAP = {
+    (ast.NodeSymbol.EQUAL,): operator.eq,
+    (ast.NodeSymbol.NOTEQUAL,): operator.ne,
+    (ast.NodeSymbol.LESSTHAN,): operator.lt,
+    (ast.NodeSymbol.LESSTHANEQUAL,): operator.le,
+    (ast.NodeSymbol.GREATERTHAN,): operator.gt,
+    (ast.NodeSymbol.GREATERTHANEQUAL,): operator.ge,
+}
+
+
+def simplify_conditions(context):
+    """Remove conditions that are known at compile time
+
+    Comparisons of known scalars and of identical elements (``n ==
+    n`` from arguments sharing a symbolic dimension) are evaluated,
+    ``and``, ``or`` and ``not`` of known values are simplified and
+    conditions with a known test are either inlined or removed. Checks
+    that depend on the shapes of arguments remain. Applied to ONF.
+    """
+    def _simplify_statements(context, statements):
+        simplified_statements = ()
+        for statement in statements:
+            if statement.symbol == (ast.NodeSymbol.CONDITION,):
+                test_context = ast.node_traversal(
+                    ast.create_context(ast=statement.child[0], symbol_table=context.symbol_table),
+                    _condition_replacement, traversal='postorder')
+                context = ast.create_context(ast=context.ast, symbol_table=test_context.symbol_table)
+                test_value = _scalar_value(test_context, ())
+                if test_value is not None:
+                    if test_value:
+                        context, block = _simplify_statements(context, statement.child[1].child)
+                        simplified_statements = simplified_statements + block
+                    continue
+                statement = ast.Node(statement.symbol, statement.shape, statement.attrib, (test_context.ast,) + statement.child[1:])
+
+            if statement.symbol in {(ast.NodeSymbol.LOOP,), (ast.NodeSymbol.BLOCK,), (ast.NodeSymbol.FUNCTION,), (ast.NodeSymbol.CONDITION,)}:
+                context, child = _simplify_statements(context, statement.child)
+                statement = ast.Node(statement.symbol, statement.shape, statement.attrib, child)
+            simplified_statements = simplified_statements + (statement,)
+        return context, simplified_statements
+
+    context, (node,) = _simplify_statements(context, (context.ast,))
+    return ast.create_context(ast=node, symbol_table=context.symbol_table)
+
+
+def _condition_replacement(context):
+    symbol = context.ast.symbol
+    if symbol in _COMPARISON_MAP:
+        left_value = _scalar_value(context, (0,))
+        right_value = _scalar_value(context, (1,))
+        if left_value is not None and right_value is not None:
+            return _add_constant_array(context, (), (_COMPARISON_MAP[symbol](left_value, right_value),))
+        elif context.ast.child[0] == context.ast.child[1]:
+            return _add_constant_array(context, (), (_COMPARISON_MAP[symbol](0, 0),))
+    elif symbol in {(ast.NodeSymbol.AND,), (ast.NodeSymbol.OR,)}:
+        # value that decides the result (False for and, True for or)
+        absorbing_value = symbol == (ast.NodeSymbol.OR,)
+        for i in range(2):
+            value = _scalar_value(context, (i,))
+            if value is None:
+                continue
+            elif bool(value) == absorbing_value:
+                return _add_constant_array(context, (), (absorbing_value,))
+            return ast.select_node(context, (1 - i,))
+    elif symbol == (ast.NodeSymbol.NOT,):
+        value = _scalar_value(context, (0,))
+        if value is not None:
+            return _add_constant_array(context, (), (not value,))
+    return context
+
+
+# strength reduction
+def reduce_strength(context):
+    """Index row major arrays by flat offsets advanced within loops
+
+    Applied to ONF. Every full psi index of a row major array is
+    lowered to a flat offset into its storage (as
+    :func:`moa.onf.lower_layouts` does for other layouts). Within each
+    loop an offset that is affine in the loop index is assigned to a
+    scalar before the loop and incremented by its stride at the end of
+    every iteration instead of being recomputed
+
+    for j: C[i, j] = A[i, j] => o = i * m; for j: C[o] = A[o]; o = o + 1
+
+    Offsets are not advanced by parallel loops themselves (the scalar
+    would carry a dependence) and vector loops are left unchanged.
+    """
+    storage_names = {}
+    function_node = context.ast
+
+    def _lower_psi(context):
+        if context.ast.symbol != (ast.NodeSymbol.PSI,) or not ast.is_array(context, (1,)):
+            return context
+
+        array_name = ast.select_node(context, (1,)).ast.attrib[0]
+        array_symbol = context.symbol_table[array_name]
+        index = ast.select_array_node_symbol(context, (0,)).value
+        if array_name in storage_arrays or array_symbol.layout is not None or \
+           index is None or len(array_symbol.shape) == 0 or len(index) != len(array_symbol.shape):
+            return context
+
+        if array_name not in storage_names:
+            context, size = ast.storage_size(context, array_symbol.shape)
+            storage_names[array_name] = ast.generate_unique_array_name(context)
+            context = ast.add_symbol(context, storage_names[array_name], ast.NodeSymbol.ARRAY, (size,), None, None)
+
+        context, offset = ast.gamma_index(context, index, array_symbol.shape)
+        vector_name = ast.generate_unique_array_name(context)
+        context = ast.add_symbol(context, vector_name, ast.NodeSymbol.ARRAY, (1,), None, (offset,))
+
+        return ast.create_context(
+            ast=ast.Node((ast.NodeSymbol.PSI,), context.ast.shape, (), (
+                ast.Node((ast.NodeSymbol.ARRAY,), (1,), (vector_name,), ()),
+                ast.Node((ast.NodeSymbol.ARRAY,), context.symbol_table[storage_names[array_name]].shape, (storage_names[array_name],), ()))),
+            symbol_table=context.symbol_table)
+
+    def _lower_statements(context, statements):
+        lowered_statements = ()
+        for statement in statements:
+            if statement.symbol == (ast.NodeSymbol.ASSIGN,):
+                statement_context = ast.node_traversal(
+                    ast.create_context(ast=statement, symbol_table=context.symbol_table),
+                    _lower_psi, traversal='postorder')
+                context = ast.create_context(ast=context.ast, symbol_table=statement_context.symbol_table)
+                statement = statement_context.ast
+            elif statement.symbol in {(ast.NodeSymbol.LOOP,), (ast.NodeSymbol.BLOCK,), (ast.NodeSymbol.CONDITION,)} and \
+                    'vector' not in statement.attrib[1:]:
+                context, child = _lower_statements(context, statement.child)
+                statement = ast.Node(statement.symbol, statement.shape, statement.attrib, child)
+            lowered_statements = lowered_statements + (statement,)
+        return context, lowered_statements
+
+    def _reduce_statements(context, statements):
+        reduced_statements = ()
+        for statement in statements:
+            if statement.symbol in {(ast.NodeSymbol.LOOP,), (ast.NodeSymbol.BLOCK,), (ast.NodeSymbol.CONDITION,)} and \
+                    'vector' not in statement.attrib[1:]:
+                context, child = _reduce_statements(context, statement.child)
+                statement = ast.Node(statement.symbol, statement.shape, statement.attrib, child)
+                if statement.symbol == (ast.NodeSymbol.LOOP,) and statement.attrib[1:] == ():
+                    context, initializations, statement = _incremental_offsets(context, statement, set(storage_names.values()))
+                    reduced_statements = reduced_statements + initializations
+            reduced_statements = reduced_statements + (statement,)
+        return context, reduced_statements
+
+    # storage of arrays (views) are not lowered again
+    storage_arrays = {statement.child[0].attrib[0] for statement in _loop_assignments(function_node) if statement.child[1].symbol == (ast.NodeSymbol.STORAGE,)}
+
+    context, statements = _lower_statements(context, function_node.child[0].child)
+    context, statements = _reduce_statements(context, statements)
+
+    # storage is bound before the first statement using it
+    bound_statements = ()
+    for statement in statements:
+        referenced_names = ast.array_names(statement)
+        for array_name, storage_name in list(storage_names.items()):
+            if storage_name not in referenced_names:
+                continue
+            storage_shape = context.symbol_table[storage_name].shape
+            bound_statements = bound_statements + (ast.Node((ast.NodeSymbol.ASSIGN,), storage_shape, (), (
+                ast.Node((ast.NodeSymbol.ARRAY,), storage_shape, (storage_name,), ()),
+                ast.Node((ast.NodeSymbol.STORAGE,), storage_shape, (), (
+                    ast.Node((ast.NodeSymbol.ARRAY,), context.symbol_table[array_name].shape, (array_name,), ()),)))),)
+            del storage_names[array_name]
+        bound_statements = bound_statements + (statement,)
+
+    return ast.create_context(
+        ast=ast.Node(function_node.symbol, function_node.shape, function_node.attrib, (
+            ast.Node((ast.NodeSymbol.BLOCK,), function_node.child[0].shape, (), bound_statements),)),
+        symbol_table=context.symbol_table)
+
+
+def _index_coefficient(context, element, index_name):
+    """Coefficient of index within element or None when not linear
+
+    ((i * m) + j) with index i => m
+    """
+    if index_name not in ast.element_symbols(element):
+        return context, 0
+    elif element.symbol in {(ast.NodeSymbol.ARRAY,), (ast.NodeSymbol.INDEX,)}:
+        return context, 1
+    elif element.symbol in {(ast.NodeSymbol.PLUS,), (ast.NodeSymbol.MINUS,)}:
+        context, left = _index_coefficient(context, element.child[0], index_name)
+        context, right = _index_coefficient(context, element.child[1], index_name)
+        if left is None or right is None:
+            return context, None
+        return ast.element_operation(context, element.symbol[0], left, right)
+    elif element.symbol == (ast.NodeSymbol.TIMES,):
+        left, right = element.child
+        if index_name in ast.element_symbols(right):
+            left, right = right, left
+        if index_name in ast.element_symbols(right):
+            return context, None
+        context, coefficient = _index_coefficient(context, left, index_name)
+        if coefficient is None:
+            return context, None
+        return ast.element_operation(context, ast.NodeSymbol.TIMES, coefficient, right)
+    return context, None
+
+
+def _incremental_offsets(context, loop_node, storage_names):
+    """Offsets of statements directly within loop advanced by their stride"""
+    index_name = loop_node.attrib[0]
+    start, _, step = context.symbol_table[index_name].value
+    if ast.is_symbolic_element(step):
+        return context, (), loop_node
+    variant_names = _assigned_names(loop_node)
+
+    def _flat_psi_nodes(node):
+        nodes = ()
+        if node.symbol == (ast.NodeSymbol.PSI,) and node.child[1].attrib[0] in storage_names:
+            nodes = (node,)
+        return nodes + tuple(psi_node for child in node.child for psi_node in _flat_psi_nodes(child))
+
+    offsets = {}
+    statements = loop_node.child[0].child
+    for statement in statements:
+        if statement.symbol != (ast.NodeSymbol.ASSIGN,):
+            continue
+        for node in _flat_psi_nodes(statement):
+            offset = _vector_elements(context, node)[0]
+            if set(ast.element_symbols(offset)) & variant_names or ast.is_index_element(offset, index_name):
+                continue
+            context, coefficient = _index_coefficient(context, offset, index_name)
+            if coefficient is None or coefficient == 0:
+                continue
+
+            key = _subexpression_key(context, offset)
+            if key not in offsets:
+                offset_name = ast.generate_unique_array_name(context)
+                context = ast.add_symbol(context, offset_name, ast.NodeSymbol.ARRAY, (), None, None)
+                vector_name = ast.generate_unique_array_name(context)
+                context = ast.add_symbol(context, vector_name, ast.NodeSymbol.ARRAY, (1,), None, (ast.Node((ast.NodeSymbol.ARRAY,), (), (offset_name,), ()),))
+                offsets[key] = (offset_name, vector_name, offset, coefficient)
+
+    if not offsets:
+        return context, (), loop_node
+
+    def _replace_offset(context):
+        if context.ast.symbol == (ast.NodeSymbol.PSI,) and context.ast.child[1].attrib[0] in storage_names:
+            key = _subexpression_key(context, _vector_elements(context, context.ast)[0])
+            if key in offsets:
+                return ast.create_context(
+                    ast=ast.Node(context.ast.symbol, context.ast.shape, context.ast.attrib, (
+                        ast.Node((ast.NodeSymbol.ARRAY,), (1,), (offsets[key][1],), ()),) + context.ast.child[1:]),
+                    symbol_table=context.symbol_table)
+        return context
+
+    replaced_statements = ()
+    for statement in statements:
+        if statement.symbol == (ast.NodeSymbol.ASSIGN,):
+            statement_context = ast.node_traversal(ast.create_context(ast=statement, symbol_table=context.symbol_table), _replace_offset, traversal='postorder')
+            context = ast.create_context(ast=context.ast, symbol_table=statement_context.symbol_table)
+            statement = statement_context.ast
+        replaced_statements = replaced_statements + (statement,)
+
+    initializations = ()
+    increments = ()
+    for offset_name, _, offset, coefficient in offsets.values():
+        offset_node = ast.Node((ast.NodeSymbol.ARRAY,), (), (offset_name,), ())
+        context, initial_offset = ast.substitute_element(context, offset, index_name, start)
+        context, initial_offset = ast.element_node(context, initial_offset)
+        initializations = initializations + (ast.Node((ast.NodeSymbol.ASSIGN,), (), (), (offset_node, initial_offset)),)
+        context, stride = ast.element_operation(context, ast.NodeSymbol.TIMES, coefficient, step)
+        context, increment = ast.element_operation(context, ast.NodeSymbol.PLUS, offset_node, stride)
+        increments = increments + (ast.Node((ast.NodeSymbol.ASSIGN,), (), (), (offset_node, increment)),)
+
+    return context, initializations, ast.Node(loop_node.symbol, loop_node.shape, loop_node.attrib, (
+        ast.Node((ast.NodeSymbol.BLOCK,), loop_node.child[0].shape, (), replaced_statements + increments),))
@@ -88,8 +88,12 @@ def _shape_replacement(context):
         (ast.NodeSymbol.ARRAY,): _shape_array,
         (ast.NodeSymbol.TRANSPOSE,): _shape_transpose,
         (ast.NodeSymbol.TRANSPOSEV,): _shape_transpose_vector,
+        (ast.NodeSymbol.RAV,): _shape_ravel,
+        (ast.NodeSymbol.RESHAPE,): _shape_reshape,
+        (ast.NodeSymbol.SLICE,): _shape_slice,
         (ast.NodeSymbol.ASSIGN,): _shape_assign,
         (ast.NodeSymbol.SHAPE,): _shape_shape,
+        (ast.NodeSymbol.BLOCK,): _shape_block,
         (ast.NodeSymbol.PSI,): _shape_psi,
         (ast.NodeSymbol.PLUS,): _shape_plus_minus_divide_times,
         (ast.NodeSymbol.MINUS,): _shape_plus_minus_divide_times,
@@ -103,6 +107,8 @@ def _shape_replacement(context):
         (ast.NodeSymbol.REDUCE, ast.NodeSymbol.MINUS): _shape_reduce_plus_minus_divide_times,
         (ast.NodeSymbol.REDUCE, ast.NodeSymbol.TIMES): _shape_reduce_plus_minus_divide_times,
         (ast.NodeSymbol.REDUCE, ast.NodeSymbol.DIVIDE): _shape_reduce_plus_minus_divide_times,
+        (ast.NodeSymbol.REDUCE, ast.NodeSymbol.MAXIMUM): _shape_reduce_plus_minus_divide_times,
+        (ast.NodeSymbol.REDUCE, ast.NodeSymbol.MINIMUM): _shape_reduce_plus_minus_divide_times,
         (ast.NodeSymbol.DOT, ast.NodeSymbol.PLUS  , ast.NodeSymbol.PLUS):   _shape_inner_plus_minus_divide_times,
         (ast.NodeSymbol.DOT, ast.NodeSymbol.MINUS , ast.NodeSymbol.PLUS):   _shape_inner_plus_minus_divide_times,
         (ast.NodeSymbol.DOT, ast.NodeSymbol.TIMES , ast.NodeSymbol.PLUS):   _shape_inner_plus_minus_divide_times,
@@ -144,6 +150,25 @@ def _shape_array(context):
     return ast.replace_node_shape(context, shape)
 
 
+# Control
+def _shape_block(context):
+    """Block of expressions evaluated together (share index space)"""
+    shape = ast.select_node_shape(context, (0,))
+    conditions = ()
+    for i in range(1, ast.num_node_children(context)):
+        if shape == ast.select_node_shape(context, (i,)):
+            continue
+        elif len(shape) != dimension(context, (i,)):
+            raise MOAShapeError('BLOCK requires the dimension of all expressions to be same')
+
+        context, block_conditions, shape = compare_tuples(ast.NodeSymbol.EQUAL, context,
+                                                          shape, ast.select_node_shape(context, (i,)), 'BLOCK')
+        conditions = conditions + block_conditions
+
+    context = ast.replace_node_shape(context, shape)
+    return apply_node_conditions(context, conditions)
+
+
 # Unary Operations
 def _shape_transpose(context):
     shape = ast.select_node_shape(context, (0,))[::-1]
@@ -169,6 +194,11 @@ def _shape_transpose_vector(context):
     return ast.replace_node_shape(context, shape)
 
 
+def _shape_ravel(context):
+    context, total = ast.element_product(context, ast.select_node_shape(context, (0,)))
+    return ast.replace_node_shape(context, (total,))
+
+
 def _shape_assign(context):
     if dimension(context, (0,)) != dimension(context, (1,)):
         raise MOAShapeError('ASSIGN requires that the dimension of the left and right nodes to be same')
@@ -208,10 +238,154 @@ def _shape_psi(context):
     return apply_node_conditions(context, conditions)
 
 
+def _shape_reshape(context):
+    if not is_vector(context, (0,)):
+        raise MOAShapeError('RESHAPE requires left node to be vector')
+
+    left_node_symbol = ast.select_array_node_symbol(context, (0,))
+    if left_node_symbol.value is None or ast.has_symbolic_elements(left_node_symbol.shape):
+        raise MOAShapeError('RESHAPE requires left node to be vector with known elements')
+
+    shape = left_node_symbol.value
+    context, left_total = ast.element_product(context, shape)
+    context, right_total = ast.element_product(context, ast.select_node_shape(context, (1,)))
+    context, conditions, _ = compare_tuples(ast.NodeSymbol.EQUAL, context,
+                                            (left_total,), (right_total,), 'RESHAPE')
+
+    context = ast.replace_node_shape(context, shape)
+    return apply_node_conditions(context, conditions)
+
+
+def _resolve_negative_element(context, element, bound):
+    if element is not None and not ast.is_symbolic_element(element) and element < 0:
+        return ast.element_operation(context, ast.NodeSymbol.MINUS, bound, -element)
+    return context, element
+
+
+def normalize_slice(context, start, stop, step, bound):
+    """Resolve python slice semantics of (start, stop, step) on dimension of size bound
+
+    Returns normalized (start, stop, step) along with the number of
+    elements in the slice. When any element is symbolic the slice is
+    assumed to be within bounds and conditions checking this are
+    returned. Symbolic steps are assumed to be positive.
+    """
+    step = 1 if step is None else step
+    if step == 0:
+        raise MOAShapeError('SLICE requires step to be non zero')
+
+    if not any(ast.is_symbolic_element(element) for element in (start, stop, step, bound)):
+        start, stop, step = slice(start, stop, step).indices(bound)
+        return context, (), (start, stop, step), len(range(start, stop, step))
+
+    # (left, right) elements required to satisfy left < right and left <= right
+    lessthan_elements = ((0, step),) if ast.is_symbolic_element(step) else ()
+    lessthanequal_elements = ()
+    start_supplied, stop_supplied = start is not None, stop is not None
+
+    context, start = _resolve_negative_element(context, start, bound)
+    context, stop = _resolve_negative_element(context, stop, bound)
+
+    if not ast.is_symbolic_element(step) and step < 0:
+        if start_supplied:
+            lessthan_elements = lessthan_elements + ((start, bound),)
+        else:
+            context, start = ast.element_operation(context, ast.NodeSymbol.MINUS, bound, 1)
+
+        if stop_supplied:
+            lessthanequal_elements = lessthanequal_elements + ((-1, stop),)
+        else:
+            stop = -1
+
+        if start_supplied or stop_supplied:
+            lessthanequal_elements = lessthanequal_elements + ((stop, start),)
+
+        # (start - stop - step - 1) // -step
+        context, length = ast.element_operation(context, ast.NodeSymbol.MINUS, start, stop)
+        context, length = ast.element_operation(context, ast.NodeSymbol.MINUS, length, step + 1)
+        context, length = ast.element_operation(context, ast.NodeSymbol.FLOORDIVIDE, length, -step)
+    else:
+        if start_supplied:
+            lessthanequal_elements = lessthanequal_elements + ((0, start),)
+        else:
+            start = 0
+
+        if stop_supplied:
+            lessthanequal_elements = lessthanequal_elements + ((stop, bound),)
+        else:
+            stop = bound
+
+        if start_supplied or stop_supplied:
+            lessthanequal_elements = lessthanequal_elements + ((start, stop),)
+
+        # (stop - start + step - 1) // step
+        context, step_offset = ast.element_operation(context, ast.NodeSymbol.MINUS, step, 1)
+        context, length = ast.element_operation(context, ast.NodeSymbol.MINUS, stop, start)
+        context, length = ast.element_operation(context, ast.NodeSymbol.PLUS, length, step_offset)
+        context, length = ast.element_operation(context, ast.NodeSymbol.FLOORDIVIDE, length, step)
+
+    conditions = ()
+    for comparison, elements in [(ast.NodeSymbol.LESSTHAN, lessthan_elements), (ast.NodeSymbol.LESSTHANEQUAL, lessthanequal_elements)]:
+        if elements:
+            left_elements, right_elements = zip(*elements)
+            context, comparison_conditions, _ = compare_tuples(comparison, context, left_elements, right_elements, 'SLICE')
+            conditions = conditions + comparison_conditions
+    return context, conditions, (start, stop, step), length
+
+
+def _shape_slice(context):
+    left_node_symbol = ast.select_array_node_symbol(context, (0,))
+    if len(left_node_symbol.shape) != 2 or left_node_symbol.shape[1] != 3:
+        raise MOAShapeError('SLICE requires left node to have shape <n 3>')
+
+    right_shape = ast.select_node_shape(context, (1,))
+    num_slices = left_node_symbol.shape[0]
+    if num_slices > len(right_shape):
+        raise MOAShapeError('SLICE requires number of slices be no greater than dimension of right node')
+
+    conditions = ()
+    slices = ()
+    shape = ()
+    for i in range(num_slices):
+        start, stop, step = left_node_symbol.value[i*3:(i+1)*3]
+        context, slice_conditions, normalized_slice, length = normalize_slice(context, start, stop, step, right_shape[i])
+        conditions = conditions + slice_conditions
+        slices = slices + normalized_slice
+        shape = shape + (length,)
+
+    # replace slice vector with normalized slices
+    array_name = ast.generate_unique_array_name(context)
+    context = ast.add_symbol(context, array_name, ast.NodeSymbol.ARRAY, left_node_symbol.shape, None, slices)
+    context = ast.replace_node(context, ast.Node((ast.NodeSymbol.ARRAY,), left_node_symbol.shape, (array_name,), ()), (0,))
+
+    context = ast.replace_node_shape(context, shape + right_shape[num_slices:])
+    return apply_node_conditions(context, conditions)
+
+
+def reduction_axes(context, selection=()):
+    """Normalized axes of reduction node (default is leading axis)"""
+    context = ast.select_node(context, selection)
+    array_dimension = dimension(context, (0,))
+
+    axes = ()
+    for axis in (context.ast.attrib or (0,)):
+        if not isinstance(axis, int) or not (-array_dimension <= axis < array_dimension):
+            raise MOAShapeError(f'REDUCE axis {axis} is out of bounds for array of dimension {array_dimension}')
+        axes = axes + (axis % array_dimension,)
+
+    if len(set(axes)) != len(axes):
+        raise MOAShapeError(f'REDUCE axes {context.ast.attrib} must be unique')
+    return tuple(sorted(axes))
+
+
 def _shape_reduce_plus_minus_divide_times(context):
     if dimension(context, (0,)) == 0:
         return ast.select_node(context, (0,))
-    shape = ast.select_node_shape(context, (0,))[1:]
+
+    axes = reduction_axes(context)
+    shape = tuple(bound for i, bound in enumerate(ast.select_node_shape(context, (0,))) if i not in axes)
+    if context.ast.attrib:
+        context = ast.replace_node_attributes(context, axes)
     return ast.replace_node_shape(context, shape)
 
 
@@ -52,7 +52,7 @@ def assert_symbol_table_equal(left_symbol_table, right_symbol_table):
         raise ValueError(f'left symbol table is missing keys {left_symbol_table.keys() - right_symbol_table.keys()} and right is missing keys {right_symbol_table.keys() - left_symbol_table.keys()}')
 
     for key in left_symbol_table:
-        for attr in {'symbol', 'shape', 'type', 'value'}:
+        for attr in {'symbol', 'shape', 'type', 'value', 'layout'}:
             left_value = getattr(left_symbol_table[key], attr)
             right_value = getattr(right_symbol_table[key], attr)
             if left_value != right_value:
@@ -25,22 +25,29 @@ _NODE_LABEL_MAP = {
     (ast.NodeSymbol.RAV,): "rav",
     (ast.NodeSymbol.TRANSPOSE,): "transpose(Ø)",
     (ast.NodeSymbol.TRANSPOSEV,): "transpose(Ø)",
+    (ast.NodeSymbol.STORAGE,): "storage",
     (ast.NodeSymbol.REDUCE, ast.NodeSymbol.PLUS): 'reduce (+)',
     (ast.NodeSymbol.REDUCE, ast.NodeSymbol.MINUS): 'reduce (-)',
     (ast.NodeSymbol.REDUCE, ast.NodeSymbol.TIMES): 'reduce (*)',
     (ast.NodeSymbol.REDUCE, ast.NodeSymbol.DIVIDE): 'reduce (/)',
+    (ast.NodeSymbol.REDUCE, ast.NodeSymbol.MAXIMUM): 'reduce (max)',
+    (ast.NodeSymbol.REDUCE, ast.NodeSymbol.MINIMUM): 'reduce (min)',
     # Binary
     (ast.NodeSymbol.ASSIGN,): 'assign',
     (ast.NodeSymbol.PLUS,): "+",
     (ast.NodeSymbol.MINUS,): "-",
     (ast.NodeSymbol.TIMES,): "*",
     (ast.NodeSymbol.DIVIDE,): "/",
+    (ast.NodeSymbol.MAXIMUM,): "max",
+    (ast.NodeSymbol.MINIMUM,): "min",
     (ast.NodeSymbol.PSI,): "psi(Ψ)",
     (ast.NodeSymbol.DIM,): "dim(δ)",
     (ast.NodeSymbol.TAU,): "tau(τ)",
     (ast.NodeSymbol.TAKE,): "take(▵)",
     (ast.NodeSymbol.DROP,): "drop(▿)",
     (ast.NodeSymbol.CAT,): "cat(++)",
+    (ast.NodeSymbol.RESHAPE,): "reshape(ρ)",
+    (ast.NodeSymbol.SLICE,): "slice",
     (ast.NodeSymbol.DOT, ast.NodeSymbol.PLUS): 'outer (+)',
     (ast.NodeSymbol.DOT, ast.NodeSymbol.MINUS): 'outer (-)',
     (ast.NodeSymbol.DOT, ast.NodeSymbol.TIMES): 'outer (*)',
@@ -119,10 +126,12 @@ def _node_label(context):
     elif context.ast.symbol == (ast.NodeSymbol.FUNCTION,):
         arguments, result = context.ast.attrib[0], context.ast.attrib[1]
         if arguments is not None and result is not None:
+            if isinstance(result, tuple): # multiple outputs
+                result = '(' + ', '.join(result) + ')'
             node_label['value'] = symbolic_tuple_string(context, arguments, start='(', end=')') + ' -> ' + result
     elif context.ast.symbol[0] == ast.NodeSymbol.REDUCE:
         if context.ast.attrib:
-            node_label['value'] = context.ast.attrib[0]
+            node_label['value'] = ' '.join(str(_) for _ in context.ast.attrib)
 
     return node_label
 
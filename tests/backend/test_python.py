@@ -112,3 +112,55 @@ def test_python_backend_materialize_scalar():
 def test_python_backend_integration(symbol_table, tree, expected_source):
     context = ast.create_context(ast=tree, symbol_table=symbol_table)
     assert expected_source == backend.generate_python_source(context)
+
+
+@pytest.mark.parametrize('use_numba, num_threads, expected_source', [
+    (False, None, 'for _i0 in range(0, 3, 1):\n    A[_i0] = 1'),
+    (True, None, '@numba.jit(parallel=True)\ndef f(A):\n    for _i0 in numba.prange(0, 3, 1):\n        A[_i0] = 1\n    return A'),
+    (True, 4, '@numba.jit(parallel=True)\ndef f(A):\n    numba.set_num_threads(min(4, numba.config.NUMBA_NUM_THREADS))\n    for _i0 in numba.prange(0, 3, 1):\n        A[_i0] = 1\n    return A'),
+])
+def test_python_backend_parallel_loop(use_numba, num_threads, expected_source):
+    symbol_table = {
+        'A': ast.SymbolNode(ast.NodeSymbol.ARRAY, (3,), None, None),
+        '_i0': ast.SymbolNode(ast.NodeSymbol.INDEX, (), None, (0, 3, 1)),
+        '_a1': ast.SymbolNode(ast.NodeSymbol.ARRAY, (1,), None, (ast.Node((ast.NodeSymbol.INDEX,), (), ('_i0',), ()),)),
+        '_a2': ast.SymbolNode(ast.NodeSymbol.ARRAY, (), None, (1,)),
+    }
+    tree = ast.Node((ast.NodeSymbol.LOOP,), (), ('_i0', 'parallel'), (
+        ast.Node((ast.NodeSymbol.BLOCK,), (), (), (
+            ast.Node((ast.NodeSymbol.ASSIGN,), (), (), (
+                ast.Node((ast.NodeSymbol.PSI,), (), (), (
+                    ast.Node((ast.NodeSymbol.ARRAY,), (1,), ('_a1',), ()),
+                    ast.Node((ast.NodeSymbol.ARRAY,), (3,), ('A',), ()))),
+                ast.Node((ast.NodeSymbol.ARRAY,), (), ('_a2',), ()))),)),))
+    if use_numba:
+        tree = ast.Node((ast.NodeSymbol.FUNCTION,), (), (('A',), 'A'), (ast.Node((ast.NodeSymbol.BLOCK,), (), (), (tree,)),))
+
+    context = ast.create_context(ast=tree, symbol_table=symbol_table)
+    source = backend.generate_python_source(context, materialize_scalars=True, use_numba=use_numba, num_threads=num_threads)
+    assert '\n'.join(line for line in source.splitlines() if line.strip()) == expected_source
+
+
+def test_python_backend_vector_loop():
+    symbol_table = {
+        'A': ast.SymbolNode(ast.NodeSymbol.ARRAY, (3,), None, None),
+        'B': ast.SymbolNode(ast.NodeSymbol.ARRAY, (3,), None, None),
+        '_i0': ast.SymbolNode(ast.NodeSymbol.INDEX, (), None, (0, 3, 1)),
+        '_a1': ast.SymbolNode(ast.NodeSymbol.ARRAY, (1,), None, (ast.Node((ast.NodeSymbol.INDEX,), (), ('_i0',), ()),)),
+    }
+    tree = ast.Node((ast.NodeSymbol.LOOP,), (), ('_i0', 'vector'), (
+        ast.Node((ast.NodeSymbol.BLOCK,), (), (), (
+            ast.Node((ast.NodeSymbol.ASSIGN,), (), (), (
+                ast.Node((ast.NodeSymbol.PSI,), (), (), (
+                    ast.Node((ast.NodeSymbol.ARRAY,), (1,), ('_a1',), ()),
+                    ast.Node((ast.NodeSymbol.ARRAY,), (3,), ('A',), ()))),
+                ast.Node((ast.NodeSymbol.MAXIMUM,), (), (), (
+                    ast.Node((ast.NodeSymbol.PSI,), (), (), (
+                        ast.Node((ast.NodeSymbol.ARRAY,), (1,), ('_a1',), ()),
+                        ast.Node((ast.NodeSymbol.ARRAY,), (3,), ('B',), ()))),
+                    ast.Node((ast.NodeSymbol.ARRAY,), (3,), ('A',), ()))))),)),))
+    tree = ast.Node((ast.NodeSymbol.FUNCTION,), (), (('A', 'B'), 'A'), (ast.Node((ast.NodeSymbol.BLOCK,), (), (), (tree,)),))
+
+    context = ast.create_context(ast=tree, symbol_table=symbol_table)
+    source = backend.generate_python_source(context, materialize_scalars=True, use_numpy=True)
+    assert '\n'.join(line for line in source.splitlines() if line.strip()) == 'def f(A, B):\n    A[slice(0, 3, 1)] = numpy.maximum(B[slice(0, 3, 1)], A)\n    return A'
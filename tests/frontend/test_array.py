@@ -13,6 +13,45 @@ def test_array_single_array():
     testing.assert_context_equal(context, expression.context)
 
 
+def test_array_single_array_value():
+    expression = LazyArray(shape=(2, 2), value=[1, 2, 3, 4])
+    node = ast.Node((ast.NodeSymbol.ARRAY,), None, ('_a0',), ())
+    symbol_table = {'_a0': ast.SymbolNode(ast.NodeSymbol.ARRAY, (2, 2), None, (1, 2, 3, 4))}
+    context = ast.create_context(ast=node, symbol_table=symbol_table)
+
+    testing.assert_context_equal(context, expression.context)
+
+
+def test_array_single_array_value_invalid():
+    with pytest.raises(ValueError):
+        LazyArray(shape=(2, 2), value=(1, 2, 3))
+
+    with pytest.raises(ValueError):
+        LazyArray(shape=('n',), value=(1, 2, 3))
+
+
+def test_array_single_array_column():
+    expression = LazyArray(name='A', shape=('n', 3), fmt='column')
+    node = ast.Node((ast.NodeSymbol.ARRAY,), None, ('A',), ())
+    symbol_table = {
+        'n': ast.SymbolNode(ast.NodeSymbol.ARRAY, (), None, None),
+        'A': ast.SymbolNode(ast.NodeSymbol.ARRAY, (ast.Node((ast.NodeSymbol.ARRAY,), (), ('n',), ()), 3), None, None, 'column'),
+    }
+    context = ast.create_context(ast=node, symbol_table=symbol_table)
+    testing.assert_context_equal(context, expression.context)
+
+
+@pytest.mark.parametrize("fmt, strides", [
+    ('diagonal', None),
+    ('strided', None),
+    ('strided', (1,)),
+    ('column', (1, 2)),
+])
+def test_array_single_array_invalid_format(fmt, strides):
+    with pytest.raises(ValueError):
+        LazyArray(name='A', shape=(2, 3), fmt=fmt, strides=strides)
+
+
 def test_array_single_array_symbolic():
     expression = LazyArray(name='A', shape=('n', 3))
     node = ast.Node((ast.NodeSymbol.ARRAY,), None, ('A',), ())
@@ -102,6 +141,31 @@ def test_array_transpose_with_vector():
     testing.assert_context_equal(context, expression.context)
 
 
+def test_array_ravel():
+    expression = LazyArray(name='A', shape=(2, 3)).ravel()
+    node = ast.Node((ast.NodeSymbol.RAV,), None, (), (
+        ast.Node((ast.NodeSymbol.ARRAY,), None, ('A',), ()),))
+    symbol_table = {'A': ast.SymbolNode(ast.NodeSymbol.ARRAY, (2, 3), None, None)}
+    context = ast.create_context(ast=node, symbol_table=symbol_table)
+
+    testing.assert_context_equal(context, expression.context)
+
+
+def test_array_reshape_symbolic():
+    expression = LazyArray(name='A', shape=('n', 3)).reshape((3, 'n'))
+    node = ast.Node((ast.NodeSymbol.RESHAPE,), None, (), (
+        ast.Node((ast.NodeSymbol.ARRAY,), None, ('_a2',), ()),
+        ast.Node((ast.NodeSymbol.ARRAY,), None, ('A',), ()),))
+    symbol_table = {
+        'A': ast.SymbolNode(ast.NodeSymbol.ARRAY, (ast.Node((ast.NodeSymbol.ARRAY,), (), ('n',), ()), 3), None, None),
+        'n': ast.SymbolNode(ast.NodeSymbol.ARRAY, (), None, None),
+        '_a2': ast.SymbolNode(ast.NodeSymbol.ARRAY, (2,), None, (3, ast.Node((ast.NodeSymbol.ARRAY,), (), ('n',), ()))),
+    }
+    context = ast.create_context(ast=node, symbol_table=symbol_table)
+
+    testing.assert_context_equal(context, expression.context)
+
+
 @pytest.mark.parametrize("symbol", [
     '+', '-', '*', '/'
 ])
@@ -154,12 +218,12 @@ def test_array_inner_product(left_symbol, right_symbol):
 
 
 @pytest.mark.parametrize("symbol", [
-    '+', '-', '*', '/'
+    '+', '-', '*', '/', 'max', 'min'
 ])
 def test_array_reduce(symbol):
     expression = LazyArray(name='A', shape=(2, 3)).reduce(symbol)
 
-    expected_tree = ast.Node((ast.NodeSymbol.REDUCE, LazyArray.OPPERATION_MAP[symbol]), None, (), (
+    expected_tree = ast.Node((ast.NodeSymbol.REDUCE, LazyArray.REDUCE_OPPERATION_MAP[symbol]), None, (), (
         ast.Node((ast.NodeSymbol.ARRAY,), None, ('A',), ()),))
     expected_symbol_table = {
         'A': ast.SymbolNode(ast.NodeSymbol.ARRAY, (2, 3), None, None),
@@ -169,6 +233,28 @@ def test_array_reduce(symbol):
     testing.assert_context_equal(expected_context, expression.context)
 
 
+@pytest.mark.parametrize("axis, attrib", [
+    (1, (1,)),
+    ((0, -1), (0, -1)),
+])
+def test_array_reduce_axis(axis, attrib):
+    expression = LazyArray(name='A', shape=(2, 3)).reduce('+', axis=axis)
+
+    expected_tree = ast.Node((ast.NodeSymbol.REDUCE, ast.NodeSymbol.PLUS), None, attrib, (
+        ast.Node((ast.NodeSymbol.ARRAY,), None, ('A',), ()),))
+    expected_symbol_table = {
+        'A': ast.SymbolNode(ast.NodeSymbol.ARRAY, (2, 3), None, None),
+    }
+    expected_context = ast.create_context(ast=expected_tree, symbol_table=expected_symbol_table)
+
+    testing.assert_context_equal(expected_context, expression.context)
+
+
+def test_array_reduce_multiple_axes_not_associative():
+    with pytest.raises(ValueError):
+        LazyArray(name='A', shape=(2, 3)).reduce('-', axis=(0, 1))
+
+
 
 def test_array_index_int():
     expression = LazyArray(name='A', shape=(2, 3))[0]
@@ -199,32 +285,29 @@ def test_array_index_symbol():
     testing.assert_context_equal(context, expression.context)
 
 
-@pytest.mark.xfail
 def test_array_index_stride():
     expression = LazyArray(name='A', shape=(2, 3))[1:2]
-    tree = ast.Node((ast.NodeSymbol.PSI,), None, (), (
-        ast.Node((ast.NodeSymbol.ARRAY,), None, ('_a2',), ()),
+    tree = ast.Node((ast.NodeSymbol.SLICE,), None, (), (
+        ast.Node((ast.NodeSymbol.ARRAY,), None, ('_a1',), ()),
         ast.Node((ast.NodeSymbol.ARRAY,), None, ('A',), ())))
     symbol_table = {
         'A': ast.SymbolNode(ast.NodeSymbol.ARRAY, (2, 3), None, None),
-        'n': ast.SymbolNode(ast.NodeSymbol.ARRAY, (), None, None),
-        '_a2': ast.SymbolNode(ast.NodeSymbol.ARRAY, (1,), None, (Node(ast.NodeSymbol.ARRAY, (), 'n'),)),
+        '_a1': ast.SymbolNode(ast.NodeSymbol.ARRAY, (1, 3), None, (1, 2, None)),
     }
     context = ast.create_context(ast=tree, symbol_table=symbol_table)
 
     testing.assert_context_equal(context, expression.context)
 
 
-@pytest.mark.xfail
-def test_array_index_stride_reverse():
-    expression = LazyArray(name='A', shape=(2, 3))[1:2:-1]
-    tree = ast.Node(ast.NodeSymbol.PSI, None, (), (
-                    ast.Node(ast.NodeSymbol.ARRAY, None, ('_a2',), ()),
-                    ast.Node(ast.NodeSymbol.ARRAY, None, ('A',), ())))
+def test_array_index_stride_symbolic():
+    expression = LazyArray(name='A', shape=(2, 3))[::-1, 'n'::2, :]
+    tree = ast.Node((ast.NodeSymbol.SLICE,), None, (), (
+        ast.Node((ast.NodeSymbol.ARRAY,), None, ('_a2',), ()),
+        ast.Node((ast.NodeSymbol.ARRAY,), None, ('A',), ())))
     symbol_table = {
-        'A': SymbolNode(ast.NodeSymbol.ARRAY, (2, 3), None, None),
-        'n': SymbolNode(ast.NodeSymbol.ARRAY, (), None, None),
-        '_a2': SymbolNode(ast.NodeSymbol.ARRAY, (1,), None, (Node(ast.NodeSymbol.ARRAY, (), 'n'),)),
+        'A': ast.SymbolNode(ast.NodeSymbol.ARRAY, (2, 3), None, None),
+        'n': ast.SymbolNode(ast.NodeSymbol.ARRAY, (), None, None),
+        '_a2': ast.SymbolNode(ast.NodeSymbol.ARRAY, (2, 3), None, (None, None, -1, ast.Node((ast.NodeSymbol.ARRAY,), (), ('n',), ()), None, 2)),
     }
     context = ast.create_context(ast=tree, symbol_table=symbol_table)
 
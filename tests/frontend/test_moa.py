@@ -20,6 +20,7 @@ from moa import ast
     ('take', ('TAKE',)),
     ('drop', ('DROP',)),
     ('cat', ('CAT',)),
+    ('rho', ('RESHAPE',)),
     ('iota', ('IOTA',)),
     ('dim', ('DIM',)),
     ('tau', ('TAU',)),
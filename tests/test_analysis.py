@@ -1,3 +1,5 @@
+import pytest
+
 from moa import ast, analysis, shape, dnf, visualize
 
 
@@ -23,3 +25,24 @@ def test_metric_flops():
     context = dnf.reduce_to_dnf(context)
 
     assert analysis.metric_flops(context) == 10
+
+
+def test_metric_flops_symbolic():
+    n = ast.Node((ast.NodeSymbol.ARRAY,), (), ('n',), ())
+    tree = ast.Node((ast.NodeSymbol.TIMES,), None, (), (
+        ast.Node((ast.NodeSymbol.ARRAY,), None, ('A',), ()),
+        ast.Node((ast.NodeSymbol.ARRAY,), None, ('s',), ())))
+
+    symbol_table = {
+        'n': ast.SymbolNode(ast.NodeSymbol.ARRAY, (), None, None),
+        's': ast.SymbolNode(ast.NodeSymbol.ARRAY, (), None, None),
+        'A': ast.SymbolNode(ast.NodeSymbol.ARRAY, (n, 10), None, None),
+    }
+
+    context = ast.create_context(ast=tree, symbol_table=symbol_table)
+    context = shape.calculate_shapes(context)
+
+    with pytest.raises(ValueError):
+        analysis.metric_flops(context)
+
+    assert analysis.metric_flops(context, symbolic_bound=5) == 50
@@ -33,6 +33,29 @@ def test_array_get_index():
         a[1, 1, 1] == 10
 
 
+def test_array_get_index_column():
+    a = Array(shape=(2, 3), value=(1, 4, 2, 5, 3, 6), fmt='column')
+    assert a.strides == (1, 2)
+    assert a[0, 1] == 2
+    assert a[1, 0] == 4
+    assert a[1, 2] == 6
+
+
+def test_array_get_index_strided():
+    a = Array(shape=(2, 2), value=(1, 2, 3, 4, 5, 6, 7), fmt='strided', strides=(4, 2))
+    assert a[0, 1] == 3
+    assert a[1, 0] == 5
+    assert a[1, 1] == 7
+
+
+def test_array_invalid_format():
+    with pytest.raises(ValueError):
+        Array(shape=(2, 2), fmt='diagonal')
+
+    with pytest.raises(ValueError):
+        Array(shape=(2, 2), fmt='strided')
+
+
 def test_array_set_index():
     a = Array(shape=(1, 2, 3), value=(1, 2, 3, 4, 5, 6), fmt='row')
     a[0, 1, 1] = 10
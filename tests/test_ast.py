@@ -185,7 +185,7 @@ def test_add_symbol_table_idempodent():
     context_copy = copy.deepcopy(context)
     new_context = ast.add_symbol(context, 'A', ast.NodeSymbol.ARRAY, (3, 4), None, None)
     assert context == context_copy
-    assert new_context == ast.Context(ast=None, symbol_table={'A': (ast.NodeSymbol.ARRAY, (3, 4), None, None)})
+    assert new_context == ast.Context(ast=None, symbol_table={'A': ast.SymbolNode(ast.NodeSymbol.ARRAY, (3, 4), None, None)})
 
 
 def test_symbol_table_unique_array():
@@ -216,6 +216,45 @@ def test_has_symbolic_elements(elements, result):
     assert ast.has_symbolic_elements(elements) == result
 
 
+@pytest.mark.parametrize('index, shape', [
+    ((1, 2, 3), (2, 3, 4)),
+    ((0,), (5,)),
+    ((), ()),
+])
+def test_ravel_unravel_index_constant(index, shape):
+    context = ast.create_context()
+    context, offset = ast.ravel_index(context, index, shape)
+    context, new_index = ast.unravel_index(context, offset, shape)
+    assert new_index == index
+    assert context.symbol_table == {}
+
+
+@pytest.mark.parametrize('layout, index, shape, offset, size', [
+    (None, (1, 2, 3), (2, 3, 4), 23, 24),
+    ('column', (1, 2, 3), (2, 3, 4), 1 + 2*2 + 3*6, 24),
+    ((1, 4), (1, 2), (2, 3), 9, 10),
+])
+def test_gamma_index_constant(layout, index, shape, offset, size):
+    context = ast.create_context()
+    assert ast.gamma_index(context, index, shape, layout)[1] == offset
+    assert ast.storage_size(context, shape, layout)[1] == size
+
+
+def test_element_operation_identity():
+    context = ast.create_context(symbol_table={'n': ast.SymbolNode(ast.NodeSymbol.ARRAY, (), None, None)})
+    n = ast.Node((ast.NodeSymbol.ARRAY,), (), ('n',), ())
+
+    assert ast.element_operation(context, ast.NodeSymbol.PLUS, 0, n)[1] == n
+    assert ast.element_operation(context, ast.NodeSymbol.TIMES, n, 1)[1] == n
+    assert ast.element_operation(context, ast.NodeSymbol.TIMES, 0, n)[1] == 0
+    assert ast.element_operation(context, ast.NodeSymbol.MODULO, n, 1)[1] == 0
+
+    new_context, element = ast.element_operation(context, ast.NodeSymbol.TIMES, n, 3)
+    assert element == ast.Node((ast.NodeSymbol.TIMES,), (), (), (n, ast.Node((ast.NodeSymbol.ARRAY,), (), ('_a1',), ())))
+    assert new_context.symbol_table['_a1'] == ast.SymbolNode(ast.NodeSymbol.ARRAY, (), None, (3,))
+    assert ast.element_symbols(element) == ('n', '_a1')
+
+
 def test_join_symbol_tables_simple():
     left_tree = ast.Node((ast.NodeSymbol.PLUS,), None, (), (
         ast.Node((ast.NodeSymbol.ARRAY,), None, ('A',), ()),
@@ -336,3 +375,19 @@ def test_preorder_replacement():
 
     testing.assert_context_equal(context, context_copy)
     testing.assert_context_equal(new_context, expected_context)
+
+
+def test_node_collection():
+    read = ast.Node((ast.NodeSymbol.PSI,), (), (), (
+        ast.Node((ast.NodeSymbol.ARRAY,), (1,), ('_a1',), ()),
+        ast.Node((ast.NodeSymbol.ARRAY,), (3,), ('A',), ())))
+    write = ast.Node((ast.NodeSymbol.ASSIGN,), (), (), (
+        ast.Node((ast.NodeSymbol.ARRAY,), (), ('s',), ()),
+        ast.Node((ast.NodeSymbol.PLUS,), (), (), (ast.Node((ast.NodeSymbol.ARRAY,), (), ('s',), ()), read))))
+    loop = ast.Node((ast.NodeSymbol.LOOP,), (), ('_i0',), (
+        ast.Node((ast.NodeSymbol.BLOCK,), (), (), (write,)),))
+
+    assert ast.assignment_nodes((loop, write)) == (write, write)
+    assert ast.psi_nodes(loop) == (read,)
+    assert [node.attrib[0] for node in ast.array_nodes(loop)] == ['s', 's', '_a1', 'A']
+    assert ast.array_names(loop) == {'s', '_a1', 'A'}
@@ -38,3 +38,20 @@ def test_lenore_example_1_symbols():
     C = local_dict['f'](A=A, B=B, i=i)
     assert C.shape == (2,)
     assert C.value == [8, 14]
+
+
+def test_compiler_multiple_contexts():
+    _A = LazyArray(name='A', shape=(2, 3))
+    _B = LazyArray(name='B', shape=(2, 3))
+    _C = LazyArray(name='C', shape=(2, 3))
+    python_source = compiler([(_A + _B).context, _C.T.context])
+
+    local_dict = {}
+    exec(python_source, globals(), local_dict)
+
+    A = Array((2, 3), (1, 2, 3, 4, 5, 6))
+    B = Array((2, 3), (7, 8, 9, 10, 11, 12))
+    D, E = local_dict['f'](A, B, A)
+    assert D.value == [8, 10, 12, 14, 16, 18]
+    assert E.shape == (3, 2)
+    assert E.value == [1, 4, 2, 5, 3, 6]
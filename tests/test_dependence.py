@@ -0,0 +1,115 @@
+import pytest
+
+from moa import ast, dependence, loop
+from moa.frontend import LazyArray
+from moa.shape import calculate_shapes
+from moa.dnf import reduce_to_dnf
+from moa.onf import reduce_to_onf
+
+
+def _onf(expression):
+    return reduce_to_onf(reduce_to_dnf(calculate_shapes(expression.context)), include_conditions=False)
+
+
+def _loops(node):
+    loops = (node,) if node.symbol == (ast.NodeSymbol.LOOP,) else ()
+    return loops + tuple(nested_loop for child in node.child for nested_loop in _loops(child))
+
+
+def _index(name):
+    return ast.Node((ast.NodeSymbol.ARRAY,), (), (name,), ())
+
+
+def _plus(element, constant):
+    return ast.Node((ast.NodeSymbol.PLUS,), (), (), (element, constant))
+
+
+def _times(constant, element):
+    return ast.Node((ast.NodeSymbol.TIMES,), (), (), (constant, element))
+
+
+def _nest(index_names, write_vector, read_vector):
+    """Loop nest over index_names of A[write_vector] = A[read_vector]"""
+    symbol_table = {
+        'A': ast.SymbolNode(ast.NodeSymbol.ARRAY, (20,) * len(write_vector), None, None),
+        '_w': ast.SymbolNode(ast.NodeSymbol.ARRAY, (len(write_vector),), None, write_vector),
+        '_r': ast.SymbolNode(ast.NodeSymbol.ARRAY, (len(read_vector),), None, read_vector),
+    }
+    for index_name in index_names:
+        symbol_table[index_name] = ast.SymbolNode(ast.NodeSymbol.INDEX, (), None, (1, 9, 1))
+
+    def _element(vector_name):
+        return ast.Node((ast.NodeSymbol.PSI,), (), (), (
+            ast.Node((ast.NodeSymbol.ARRAY,), (len(write_vector),), (vector_name,), ()),
+            ast.Node((ast.NodeSymbol.ARRAY,), symbol_table['A'].shape, ('A',), ())))
+
+    statements = (ast.Node((ast.NodeSymbol.ASSIGN,), (), (), (
+        _element('_w'), _element('_r'))),)
+    for index_name in index_names[::-1]:
+        statements = (ast.Node((ast.NodeSymbol.LOOP,), (), (index_name,), (
+            ast.Node((ast.NodeSymbol.BLOCK,), (), (), statements),)),)
+    return ast.create_context(ast=statements[0], symbol_table=symbol_table)
+
+
+@pytest.mark.parametrize("element, form", [
+    (3, {None: 3}),
+    (_plus(_index('i'), _index('_c')), {'i': 1, None: 5}),
+    (_index('i'), {'i': 1}),
+    (_plus(_times(2, _index('i')), _index('n')), {'i': 2, 'n': 1}),
+    (ast.Node((ast.NodeSymbol.MINUS,), (), (), (_index('n'), _plus(_index('i'), 1))), {'n': 1, 'i': -1, None: -1}),
+    (_times(_index('i'), _index('j')), None),
+    (ast.Node((ast.NodeSymbol.FLOORDIVIDE,), (), (), (_index('i'), 2)), None),
+])
+def test_affine_element(element, form):
+    context = ast.create_context(ast=None, symbol_table={'_c': ast.SymbolNode(ast.NodeSymbol.ARRAY, (), None, (5,))})
+    assert dependence.affine_element(context, element) == form
+
+
+@pytest.mark.parametrize("write_vector, read_vector, directions, parallel", [
+    ((_index('i'),), (_index('i'),), {('=',)}, True),
+    ((_index('i'),), (_plus(_index('i'), -1),), {('<',)}, False),
+    ((_index('i'),), (_plus(_index('i'), 1),), {('<',)}, False),
+    ((_times(2, _index('i')),), (_plus(_times(2, _index('i')), 1),), set(), True),
+    ((_index('i'),), (3,), {('<',), ('=',)}, False),
+])
+def test_dependences_single_loop(write_vector, read_vector, directions, parallel):
+    context = _nest(('i',), write_vector, read_vector)
+    assert {dependence.direction for dependence in dependence.dependences(context, context.ast)} == directions
+    assert dependence.is_parallel(context, context.ast) == parallel
+
+
+@pytest.mark.parametrize("read_vector, outer_parallel, inner_parallel, interchange", [
+    ((_index('i'), _index('j')), True, True, True),
+    ((_plus(_index('i'), -1), _index('j')), False, True, True),
+    ((_plus(_index('i'), -1), _plus(_index('j'), 1)), False, True, False),
+    ((_index('i'), _plus(_index('j'), -1)), True, False, True),
+])
+def test_dependences_loop_nest(read_vector, outer_parallel, inner_parallel, interchange):
+    context = _nest(('i', 'j'), (_index('i'), _index('j')), read_vector)
+    outer = context.ast
+    inner = outer.child[0].child[0]
+    assert dependence.is_parallel(context, outer) == outer_parallel
+    assert dependence.is_parallel(context, inner) == inner_parallel
+    assert dependence.can_interchange(context, outer, inner) == interchange
+
+
+@pytest.mark.parametrize("expression, parallel", [
+    (lambda: LazyArray(name='A', shape=('n', 'm')) + LazyArray(name='B', shape=('n', 'm')), [True, True]),
+    (lambda: LazyArray(name='A', shape=('n', 'm')).reduce('+', axis=1), [True, False]),
+    (lambda: LazyArray(name='A', shape=('n', 'm')).reduce('+', axis=0), [True, False]),
+    (lambda: LazyArray(name='A', shape=('n', 'k')).inner('+', '*', LazyArray(name='B', shape=('k', 'm'))), [True, True, False]),
+    (lambda: LazyArray(name='A', shape=('n',)).outer('*', LazyArray(name='B', shape=('m',))).T, [True, True]),
+    (lambda: LazyArray(name='A', shape=('n',)).reduce('+'), [False]),
+])
+def test_is_parallel_onf(expression, parallel):
+    context = _onf(expression())
+    assert [dependence.is_parallel(context, node) for node in _loops(context.ast)] == parallel
+    assert [loop.is_parallel(context, node) for node in _loops(context.ast)] == parallel
+
+
+def test_can_interchange_inner_product():
+    context = _onf(LazyArray(name='A', shape=('n', 'k')).inner('+', '*', LazyArray(name='B', shape=('k', 'm'))))
+    outer, inner, reduction = _loops(context.ast)
+    assert dependence.can_interchange(context, outer, inner)
+    # the reduction loop is not perfectly nested within the result loops
+    assert not dependence.can_interchange(context, inner, reduction)
@@ -363,3 +363,129 @@ def test_reduce_psi_plus_minus_times_divide_scalar(operation):
 #     assert symbol_table_copy == symbol_table
 #     assert new_tree == expected_tree
 #     assert new_symbol_table == symbol_table
+
+
+def test_reduce_psi_ravel():
+    symbol_table = {
+        '_i0': ast.SymbolNode(ast.NodeSymbol.INDEX, (), None, (0, 12, 1)),
+        '_a1': ast.SymbolNode(ast.NodeSymbol.ARRAY, (1,), None, (ast.Node((ast.NodeSymbol.ARRAY,), (), ('_i0',), ()),)),
+        'A': ast.SymbolNode(ast.NodeSymbol.ARRAY, (3, 4), None, None),
+    }
+    tree = ast.Node((ast.NodeSymbol.PSI,), (), (), (
+        ast.Node((ast.NodeSymbol.ARRAY,), (1,), ('_a1',), ()),
+        ast.Node((ast.NodeSymbol.RAV,), (12,), (), (
+            ast.Node((ast.NodeSymbol.ARRAY,), (3, 4), ('A',), ()),))))
+
+    i0 = ast.Node((ast.NodeSymbol.ARRAY,), (), ('_i0',), ())
+    expected_symbol_table = {
+        **symbol_table,
+        '_a3': ast.SymbolNode(ast.NodeSymbol.ARRAY, (), None, (4,)),
+        '_a4': ast.SymbolNode(ast.NodeSymbol.ARRAY, (), None, (4,)),
+        '_a5': ast.SymbolNode(ast.NodeSymbol.ARRAY, (2,), None, (
+            ast.Node((ast.NodeSymbol.FLOORDIVIDE,), (), (), (i0, ast.Node((ast.NodeSymbol.ARRAY,), (), ('_a4',), ()))),
+            ast.Node((ast.NodeSymbol.MODULO,), (), (), (i0, ast.Node((ast.NodeSymbol.ARRAY,), (), ('_a3',), ()))))),
+    }
+    expected_tree = ast.Node((ast.NodeSymbol.PSI,), (), (), (
+        ast.Node((ast.NodeSymbol.ARRAY,), (2,), ('_a5',), ()),
+        ast.Node((ast.NodeSymbol.ARRAY,), (3, 4), ('A',), ())))
+
+    testing.assert_transformation(tree, symbol_table, expected_tree, expected_symbol_table, dnf._reduce_psi_ravel)
+
+
+def test_reduce_psi_reshape_shared_trailing_dimension():
+    symbol_table = {
+        '_a0': ast.SymbolNode(ast.NodeSymbol.ARRAY, (3,), None, (2, 3, 4)),
+        '_i1': ast.SymbolNode(ast.NodeSymbol.INDEX, (), None, (0, 2, 1)),
+        '_i2': ast.SymbolNode(ast.NodeSymbol.INDEX, (), None, (0, 3, 1)),
+        '_i3': ast.SymbolNode(ast.NodeSymbol.INDEX, (), None, (0, 4, 1)),
+        '_a4': ast.SymbolNode(ast.NodeSymbol.ARRAY, (3,), None, (
+            ast.Node((ast.NodeSymbol.ARRAY,), (), ('_i1',), ()),
+            ast.Node((ast.NodeSymbol.ARRAY,), (), ('_i2',), ()),
+            ast.Node((ast.NodeSymbol.ARRAY,), (), ('_i3',), ()))),
+        'A': ast.SymbolNode(ast.NodeSymbol.ARRAY, (6, 4), None, None),
+    }
+    tree = ast.Node((ast.NodeSymbol.PSI,), (), (), (
+        ast.Node((ast.NodeSymbol.ARRAY,), (3,), ('_a4',), ()),
+        ast.Node((ast.NodeSymbol.RESHAPE,), (2, 3, 4), (), (
+            ast.Node((ast.NodeSymbol.ARRAY,), (3,), ('_a0',), ()),
+            ast.Node((ast.NodeSymbol.ARRAY,), (6, 4), ('A',), ())))))
+
+    expected_symbol_table = {
+        **symbol_table,
+        '_a6': ast.SymbolNode(ast.NodeSymbol.ARRAY, (), None, (3,)),
+        '_a7': ast.SymbolNode(ast.NodeSymbol.ARRAY, (2,), None, (
+            ast.Node((ast.NodeSymbol.PLUS,), (), (), (
+                ast.Node((ast.NodeSymbol.TIMES,), (), (), (
+                    ast.Node((ast.NodeSymbol.ARRAY,), (), ('_i1',), ()),
+                    ast.Node((ast.NodeSymbol.ARRAY,), (), ('_a6',), ()))),
+                ast.Node((ast.NodeSymbol.ARRAY,), (), ('_i2',), ()))),
+            ast.Node((ast.NodeSymbol.ARRAY,), (), ('_i3',), ()))),
+    }
+    expected_tree = ast.Node((ast.NodeSymbol.PSI,), (), (), (
+        ast.Node((ast.NodeSymbol.ARRAY,), (2,), ('_a7',), ()),
+        ast.Node((ast.NodeSymbol.ARRAY,), (6, 4), ('A',), ())))
+
+    testing.assert_transformation(tree, symbol_table, expected_tree, expected_symbol_table, dnf._reduce_psi_reshape)
+
+
+def test_reduce_psi_slice():
+    symbol_table = {
+        '_a0': ast.SymbolNode(ast.NodeSymbol.ARRAY, (1, 3), None, (4, -1, -2)),
+        '_i1': ast.SymbolNode(ast.NodeSymbol.INDEX, (), None, (0, 3, 1)),
+        '_i2': ast.SymbolNode(ast.NodeSymbol.INDEX, (), None, (0, 6, 1)),
+        '_a3': ast.SymbolNode(ast.NodeSymbol.ARRAY, (2,), None, (
+            ast.Node((ast.NodeSymbol.ARRAY,), (), ('_i1',), ()),
+            ast.Node((ast.NodeSymbol.ARRAY,), (), ('_i2',), ()))),
+        'A': ast.SymbolNode(ast.NodeSymbol.ARRAY, (5, 6), None, None),
+    }
+    tree = ast.Node((ast.NodeSymbol.PSI,), (), (), (
+        ast.Node((ast.NodeSymbol.ARRAY,), (2,), ('_a3',), ()),
+        ast.Node((ast.NodeSymbol.SLICE,), (3, 6), (), (
+            ast.Node((ast.NodeSymbol.ARRAY,), (1, 3), ('_a0',), ()),
+            ast.Node((ast.NodeSymbol.ARRAY,), (5, 6), ('A',), ())))))
+
+    expected_symbol_table = {
+        **symbol_table,
+        '_a5': ast.SymbolNode(ast.NodeSymbol.ARRAY, (), None, (-2,)),
+        '_a6': ast.SymbolNode(ast.NodeSymbol.ARRAY, (), None, (4,)),
+        '_a7': ast.SymbolNode(ast.NodeSymbol.ARRAY, (2,), None, (
+            ast.Node((ast.NodeSymbol.PLUS,), (), (), (
+                ast.Node((ast.NodeSymbol.ARRAY,), (), ('_a6',), ()),
+                ast.Node((ast.NodeSymbol.TIMES,), (), (), (
+                    ast.Node((ast.NodeSymbol.ARRAY,), (), ('_i1',), ()),
+                    ast.Node((ast.NodeSymbol.ARRAY,), (), ('_a5',), ()))))),
+            ast.Node((ast.NodeSymbol.ARRAY,), (), ('_i2',), ()))),
+    }
+    expected_tree = ast.Node((ast.NodeSymbol.PSI,), (), (), (
+        ast.Node((ast.NodeSymbol.ARRAY,), (2,), ('_a7',), ()),
+        ast.Node((ast.NodeSymbol.ARRAY,), (5, 6), ('A',), ())))
+
+    testing.assert_transformation(tree, symbol_table, expected_tree, expected_symbol_table, dnf._reduce_psi_slice)
+
+
+def test_reduce_psi_reduce_axes():
+    symbol_table = {
+        '_i0': ast.SymbolNode(ast.NodeSymbol.INDEX, (), None, (0, 4, 1)),
+        '_a1': ast.SymbolNode(ast.NodeSymbol.ARRAY, (1,), None, (ast.Node((ast.NodeSymbol.ARRAY,), (), ('_i0',), ()),)),
+        '_a2': ast.SymbolNode(ast.NodeSymbol.ARRAY, (3, 4, 5), None, None),
+    }
+    tree = ast.Node((ast.NodeSymbol.PSI,), (4,), (), (
+        ast.Node((ast.NodeSymbol.ARRAY,), (1,), ('_a1',), ()),
+        ast.Node((ast.NodeSymbol.REDUCE, ast.NodeSymbol.PLUS), (4,), (0, 2), (
+            ast.Node((ast.NodeSymbol.ARRAY,), (3, 4, 5), ('_a2',), ()),))))
+
+    expected_tree = ast.Node((ast.NodeSymbol.REDUCE, ast.NodeSymbol.PLUS), (4,), ('_i3', '_i4'), (
+        ast.Node((ast.NodeSymbol.PSI,), (4,), (), (
+            ast.Node((ast.NodeSymbol.ARRAY,), (3,), ('_a5',), ()),
+            ast.Node((ast.NodeSymbol.ARRAY,), (3, 4, 5), ('_a2',), ()))),))
+    expected_symbol_table = {
+        **symbol_table,
+        '_i3': ast.SymbolNode(ast.NodeSymbol.INDEX, (), None, (0, 3, 1)),
+        '_i4': ast.SymbolNode(ast.NodeSymbol.INDEX, (), None, (0, 5, 1)),
+        '_a5': ast.SymbolNode(ast.NodeSymbol.ARRAY, (3,), None, (
+            ast.Node((ast.NodeSymbol.ARRAY,), (), ('_i3',), ()),
+            ast.Node((ast.NodeSymbol.ARRAY,), (), ('_i0',), ()),
+            ast.Node((ast.NodeSymbol.ARRAY,), (), ('_i4',), ()))),
+    }
+
+    testing.assert_transformation(tree, symbol_table, expected_tree, expected_symbol_table, dnf._reduce_psi_reduce_plus_minus_times_divide)
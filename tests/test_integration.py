@@ -1,6 +1,7 @@
 import pytest
 
-from moa.frontend import LazyArray
+from moa.frontend import LazyArray, compile_fused
+from moa.onf import MOAONFReductionError
 from moa.array import Array
 
 
@@ -57,3 +58,757 @@ def test_array_frontend_transpose_vector_outer_scalar_addition():
 
     assert D.shape == (4, 3)
     assert D.value == [21, 51, 81, 22, 54, 86, 23, 57, 91, 24, 60, 96]
+
+
+def test_array_reshape_transpose():
+    _A = LazyArray(name='A', shape=(6, 4))
+
+    expression = _A.reshape((2, 3, 4)).transpose([2, 0, 1])
+
+    local_dict = {}
+    exec(expression.compile(), globals(), local_dict)
+
+    A = Array(shape=(6, 4), value=tuple(range(24)))
+    B = local_dict['f'](A=A)
+
+    assert B.shape == (3, 4, 2)
+    assert B.value == [0, 12, 1, 13, 2, 14, 3, 15, 4, 16, 5, 17, 6, 18, 7, 19, 8, 20, 9, 21, 10, 22, 11, 23]
+
+
+def test_array_ravel_reshape_symbolic():
+    _A = LazyArray(name='A', shape=('n', 'm'))
+
+    expression = (_A.ravel() + 1).reshape(('m', 'n'))
+
+    local_dict = {}
+    exec(expression.compile(), globals(), local_dict)
+
+    A = Array(shape=(2, 3), value=tuple(range(6)))
+    B = local_dict['f'](A=A)
+
+    assert B.shape == (3, 2)
+    assert B.value == [1, 2, 3, 4, 5, 6]
+
+
+@pytest.mark.parametrize('shape', [
+    (5, 6), ('n', 'm')
+])
+def test_array_strided_slice(shape):
+    _A = LazyArray(name='A', shape=shape)
+    _B = LazyArray(name='A', shape=shape)
+
+    expression = _A[::2, 1:-1] + _B[::-2, 4:0:-1]
+
+    local_dict = {}
+    exec(expression.compile(), globals(), local_dict)
+
+    A = Array(shape=(5, 6), value=tuple(range(30)))
+    B = local_dict['f'](A=A)
+
+    assert B.shape == (3, 4)
+    assert B.value == [29] * 12
+
+
+def test_array_strided_slice_symbolic_step():
+    _A = LazyArray(name='A', shape=('n', 'm'))
+
+    expression = _A[1]['s':'e':'k']
+
+    local_dict = {}
+    exec(expression.compile(), globals(), local_dict)
+
+    A = Array(shape=(5, 6), value=tuple(range(30)))
+    B = local_dict['f'](A=A, s=Array((), (1,)), e=Array((), (6,)), k=Array((), (2,)))
+
+    assert B.shape == (3,)
+    assert B.value == [7, 9, 11]
+
+
+@pytest.mark.parametrize('constant_folding', [True, False])
+def test_array_constant_folding(constant_folding):
+    _A = LazyArray(name='A', shape=('n',))
+    _W = LazyArray(shape=(3,), value=(1, 2, 3))
+
+    expression = (_A * 1 + 0) * (_W * 2 - 1)
+
+    source = expression.compile(constant_folding=constant_folding)
+    assert ('Array((3,), (1, 3, 5))' in source) == constant_folding
+    assert ('* 1)' in source) != constant_folding
+
+    local_dict = {}
+    exec(source, globals(), local_dict)
+
+    A = Array(shape=(3,), value=(1, 2, 3))
+    B = local_dict['f'](A=A)
+
+    assert B.shape == (3,)
+    assert B.value == [1, 6, 15]
+
+
+@pytest.mark.parametrize('include_conditions', [True, False])
+def test_array_constant_expression(include_conditions):
+    _W = LazyArray(name='W', shape=(3,), value=(1, 2, 3))
+
+    expression = (_W * 2).reduce('+')
+
+    source = expression.compile(include_conditions=include_conditions)
+    assert 'def f():' in source
+
+    local_dict = {}
+    exec(source, globals(), local_dict)
+
+    B = local_dict['f']()
+
+    assert B.shape == ()
+    assert B.value == [12]
+
+
+def test_array_constant_table():
+    _A = LazyArray(name='A', shape=(3, 2))
+    _W = LazyArray(shape=(3, 2), value=(1, 2, 3, 4, 5, 6))
+
+    expression = _A + _W.T.T * 10
+
+    source = expression.compile()
+    assert 'Array((3, 2), (10, 20, 30, 40, 50, 60))' in source
+
+    local_dict = {}
+    exec(source, globals(), local_dict)
+
+    A = Array(shape=(3, 2), value=(1, 1, 1, 1, 1, 1))
+    B = local_dict['f'](A=A)
+
+    assert B.shape == (3, 2)
+    assert B.value == [11, 21, 31, 41, 51, 61]
+
+
+@pytest.mark.parametrize('simplify_expressions', [True, False])
+def test_array_simplification(simplify_expressions):
+    _A = LazyArray(name='A', shape=(3, 2))
+    _B = LazyArray(name='B', shape=(3, 2))
+    _C = LazyArray(name='C', shape=(3, 2))
+    _D = LazyArray(name='A', shape=(3, 2))
+
+    expression = ((_A * _B + _C * _D) * 2 * 3).reduce('+')
+
+    source = expression.compile(simplify_expressions=simplify_expressions)
+    assert ('* 6)' in source) == simplify_expressions
+
+    local_dict = {}
+    exec(source, globals(), local_dict)
+
+    A = Array(shape=(3, 2), value=(1, 2, 3, 4, 5, 6))
+    B = Array(shape=(3, 2), value=(1, 1, 1, 1, 1, 1))
+    C = Array(shape=(3, 2), value=(0, 1, 2, 3, 4, 5))
+    D = local_dict['f'](A=A, B=B, C=C)
+
+    assert D.shape == (2,)
+    assert D.value == [210, 336]
+
+
+def test_array_common_subexpression_elimination():
+    _A = LazyArray(name='A', shape=(6,)).reshape((2, 3))
+    _B = LazyArray(name='B', shape=(6,)).reshape((2, 3))
+    _C = LazyArray(name='A', shape=(6,)).reshape((2, 3))
+
+    expression = (_A + _B) * _C
+
+    assert expression.analysis()['eliminated_subexpressions'] == 5
+
+    source = expression.compile()
+    assert source.count('* 3)') == 1
+
+    local_dict = {}
+    exec(source, globals(), local_dict)
+
+    A = Array(shape=(6,), value=(1, 2, 3, 4, 5, 6))
+    B = Array(shape=(6,), value=(1, 1, 1, 1, 1, 1))
+    C = local_dict['f'](A=A, B=B)
+
+    assert C.shape == (2, 3)
+    assert C.value == [2, 6, 12, 20, 30, 42]
+
+
+@pytest.mark.parametrize('operation, axis, expected_shape, expected_value', [
+    ('+', 1, (2, 4), [12, 15, 18, 21, 48, 51, 54, 57]),
+    ('-', -1, (2, 3), [-6, -22, -38, -54, -70, -86]),
+    ('+', (0, 2), (3,), [60, 92, 124]),
+    ('*', (1, 2), (2,), [0, 647647525324800]),
+])
+def test_array_reduction_axis(operation, axis, expected_shape, expected_value):
+    _A = LazyArray(name='A', shape=('n', 3, 4))
+
+    expression = _A.reduce(operation, axis=axis)
+
+    local_dict = {}
+    exec(expression.compile(), globals(), local_dict)
+
+    A = Array(shape=(2, 3, 4), value=tuple(range(24)))
+    B = local_dict['f'](A=A)
+
+    assert B.shape == expected_shape
+    assert B.value == expected_value
+
+
+@pytest.mark.parametrize('operation, expected_value', [
+    ('max', [9, 10, 11]),
+    ('min', [-2, -11, 0]),
+])
+def test_array_reduction_maximum_minimum(operation, expected_value):
+    _A = LazyArray(name='A', shape=('n', 3))
+
+    expression = _A.reduce(operation)
+
+    local_dict = {}
+    exec(expression.compile(), globals(), local_dict)
+
+    A = Array(shape=(4, 3), value=(3, -11, 5, -2, 10, 0, 9, 1, 11, 4, 7, 2))
+    B = local_dict['f'](A=A)
+
+    assert B.shape == (3,)
+    assert B.value == expected_value
+
+
+def test_array_fused_sum_sum_of_squares():
+    _A1 = LazyArray(name='A', shape=(2, 'n'))
+    _A2 = LazyArray(name='A', shape=(2, 'n'))
+    _A3 = LazyArray(name='A', shape=(2, 'n'))
+
+    source = compile_fused([_A1.reduce('+', axis=1), (_A2 * _A3).reduce('+', axis=1)])
+    # single sweep with shared loads
+    assert source.count('for ') == 2
+    assert source.count('A[') == 1
+
+    local_dict = {}
+    exec(source, globals(), local_dict)
+
+    A = Array(shape=(2, 3), value=(1, 2, 3, 4, 5, 6))
+    S, SS = local_dict['f'](A=A)
+
+    assert S.shape == SS.shape == (2,)
+    assert S.value == [6, 15]
+    assert SS.value == [14, 77]
+
+
+def test_array_fused_minimum_maximum():
+    _A1 = LazyArray(name='A', shape=(4, 3))
+    _A2 = LazyArray(name='A', shape=(4, 3))
+
+    source = compile_fused([_A1.reduce('min'), _A2.reduce('max')])
+    assert source.count('for ') == 2
+
+    local_dict = {}
+    exec(source, globals(), local_dict)
+
+    A = Array(shape=(4, 3), value=(3, -11, 5, -2, 10, 0, 9, 1, 11, 4, 7, 2))
+    B, C = local_dict['f'](A=A)
+
+    assert B.value == [-2, -11, 0]
+    assert C.value == [9, 10, 11]
+
+
+@pytest.mark.parametrize("fusion, num_loops", [
+    (True, 2),
+    (False, 6),
+])
+def test_array_fused_different_shapes(fusion, num_loops):
+    def _A():
+        return LazyArray(name='A', shape=('n', 'm'))
+
+    def _B():
+        return LazyArray(name='B', shape=('n', 'm'))
+
+    source = compile_fused([_A() + _B(), (_A() + _B()).reduce('+', axis=1), _A() * _B()], fusion=fusion)
+    assert source.count('for ') == num_loops
+    if fusion:
+        # single sweep with shared loads
+        assert source.count('A[') == 1 and source.count('B[') == 1
+
+    local_dict = {}
+    exec(source, globals(), local_dict)
+
+    A = Array(shape=(2, 3), value=(1, 2, 3, 4, 5, 6))
+    B = Array(shape=(2, 3), value=(6, 5, 4, 3, 2, 1))
+    C, D, E = local_dict['f'](A=A, B=B)
+
+    assert C.shape == E.shape == (2, 3) and D.shape == (2,)
+    assert C.value == [7, 7, 7, 7, 7, 7]
+    assert D.value == [21, 21]
+    assert E.value == [6, 10, 12, 12, 10, 6]
+
+
+def test_array_column_major():
+    _A = LazyArray(name='A', shape=('n', 'm'), fmt='column')
+    _B = LazyArray(name='B', shape=('n', 'm'))
+
+    source = (_A + _B).compile()
+    assert 'A.storage(' in source
+    assert '(_i4 + (_i5 * n))' in source
+
+    local_dict = {}
+    exec(source, globals(), local_dict)
+
+    A = Array(shape=(2, 3), value=(1, 4, 2, 5, 3, 6), fmt='column')
+    B = Array(shape=(2, 3), value=(1, 1, 1, 1, 1, 1))
+    C = local_dict['f'](A=A, B=B)
+
+    assert C.shape == (2, 3)
+    assert C.value == [2, 3, 4, 5, 6, 7]
+
+
+def test_array_strided():
+    _A = LazyArray(name='A', shape=(2, 3), fmt='strided', strides=(1, 's'))
+
+    expression = _A.reduce('+', axis=1)
+
+    local_dict = {}
+    exec(expression.compile(), globals(), local_dict)
+
+    A = Array(shape=(2, 3), value=tuple(range(10)), fmt='strided', strides=(1, 4))
+    B = local_dict['f'](A=A, s=Array((), (4,)))
+
+    assert B.shape == (2,)
+    assert B.value == [12, 15]
+
+
+@pytest.mark.parametrize("reorder_loops", [True, False])
+def test_array_transpose_loop_interchange(reorder_loops):
+    _A = LazyArray(name='A', shape=(3, 2))
+    _B = LazyArray(name='B', shape=(2, 3))
+
+    source = (_A.T + _B).compile(reorder_loops=reorder_loops)
+    assert source.index('range(0, 2, 1)') < source.index('range(0, 3, 1)') or not reorder_loops
+
+    local_dict = {}
+    exec(source, globals(), local_dict)
+
+    A = Array(shape=(3, 2), value=(1, 2, 3, 4, 5, 6))
+    B = Array(shape=(2, 3), value=(1, 1, 1, 1, 1, 1))
+    C = local_dict['f'](A=A, B=B)
+
+    assert C.shape == (2, 3)
+    assert C.value == [2, 4, 6, 3, 5, 7]
+
+
+@pytest.mark.parametrize("tile_sizes", [2, (2, 3, 4), None])
+def test_array_inner_product_tiling(tile_sizes):
+    _A = LazyArray(name='A', shape=('n', 'm'))
+    _B = LazyArray(name='B', shape=('m', 'k'))
+
+    source = _A.inner('+', '*', _B).compile(tiling=True, tile_sizes=tile_sizes)
+    assert 'min(' in source
+
+    local_dict = {}
+    exec(source, globals(), local_dict)
+
+    A = Array(shape=(3, 5), value=tuple(range(15)))
+    B = Array(shape=(5, 2), value=tuple(range(10)))
+    C = local_dict['f'](A=A, B=B)
+
+    assert C.shape == (3, 2)
+    assert C.value == [60, 70, 160, 195, 260, 320]
+
+
+@pytest.mark.parametrize("fusion", [True, False])
+def test_array_sibling_reduction_fusion(fusion):
+    _A = LazyArray(name='A', shape=('n',))
+    _B = LazyArray(name='B', shape=('n',))
+
+    source = (_A.reduce('+') + _B.reduce('*')).compile(fusion=fusion)
+    assert source.count('for ') == (1 if fusion else 2)
+
+    local_dict = {}
+    exec(source, globals(), local_dict)
+
+    A = Array(shape=(3,), value=(1, 2, 3))
+    B = Array(shape=(3,), value=(2, 3, 4))
+    C = local_dict['f'](A=A, B=B)
+
+    assert C.shape == ()
+    assert C.value == [30]
+
+
+@pytest.mark.parametrize("hoist_invariants", [True, False])
+def test_array_outer_product_reduction_hoisting(hoist_invariants):
+    _A = LazyArray(name='A', shape=('n',))
+    _B = LazyArray(name='B', shape=('m',))
+
+    source = _A.outer('*', _B).reduce('+', axis=1).compile(hoist_invariants=hoist_invariants)
+    assert ('(A[_i4] * B[' not in source) == hoist_invariants
+
+    local_dict = {}
+    exec(source, globals(), local_dict)
+
+    A = Array(shape=(2,), value=(1, 2))
+    B = Array(shape=(3,), value=(1, 2, 3))
+    C = local_dict['f'](A=A, B=B)
+
+    assert C.shape == (2,)
+    assert C.value == [6, 12]
+
+
+def test_array_reduction_scalar_accumulator():
+    _A = LazyArray(name='A', shape=('n', 'm'))
+
+    source = _A.reduce('+', axis=1).compile()
+    assert 'Array(())' not in source
+    assert source.count('] = ') == 1
+
+    local_dict = {}
+    exec(source, globals(), local_dict)
+
+    A = Array(shape=(2, 3), value=(1, 2, 3, 4, 5, 6))
+    B = local_dict['f'](A=A)
+
+    assert B.shape == (2,)
+    assert B.value == [6, 15]
+
+
+def test_array_matrix_vector_unrolling():
+    _R = LazyArray(name='R', shape=(3, 3))
+    _v = LazyArray(name='v', shape=(3,))
+
+    source = _R.inner('+', '*', _v).compile(unrolling=True)
+    assert 'for ' not in source
+
+    local_dict = {}
+    exec(source, globals(), local_dict)
+
+    R = Array(shape=(3, 3), value=(0, -1, 0, 1, 0, 0, 0, 0, 1))
+    v = Array(shape=(3,), value=(1, 2, 3))
+    w = local_dict['f'](R=R, v=v)
+
+    assert w.shape == (3,)
+    assert w.value == [-2, 1, 3]
+
+
+@pytest.mark.parametrize("n", [0, 1, 3, 4, 7])
+def test_array_reduction_partial_unrolling(n):
+    _A = LazyArray(name='A', shape=('n',))
+
+    source = _A.reduce('+').compile(unrolling=True, unroll_factor=4)
+    assert source.count('for ') == 2
+
+    local_dict = {}
+    exec(source, globals(), local_dict)
+
+    A = Array(shape=(n,), value=tuple(range(n)))
+    B = local_dict['f'](A=A)
+
+    assert B.value == [sum(range(n))]
+
+
+@pytest.mark.parametrize("options", [
+    {'unrolling': True, 'unroll_factor': 2},
+    {'accumulators': 2},
+])
+def test_array_tiling_partial_unrolling(options):
+    A = Array(shape=(3, 5), value=tuple(range(15)))
+    B = Array(shape=(5, 2), value=tuple(range(10)))
+
+    _A = LazyArray(name='A', shape=('n', 'm'))
+    local_dict = {}
+    exec(_A.reduce('+').compile(tiling=True, tile_sizes=2, **options), globals(), local_dict)
+    assert local_dict['f'](A=A).value == [15, 18, 21, 24, 27]
+
+    _A = LazyArray(name='A', shape=('n', 'm'))
+    _B = LazyArray(name='B', shape=('m', 'k'))
+    local_dict = {}
+    exec(_A.inner('+', '*', _B).compile(tiling=True, tile_sizes=2, **options), globals(), local_dict)
+    assert local_dict['f'](A=A, B=B).value == [60, 70, 160, 195, 260, 320]
+
+
+def test_array_parallel_python_backend():
+    _A = LazyArray(name='A', shape=('n', 'm'))
+    _B = LazyArray(name='B', shape=('n', 'm'))
+
+    source = (_A * _B).compile(parallel=True)
+    assert 'prange' not in source
+
+    local_dict = {}
+    exec(source, globals(), local_dict)
+
+    A = Array(shape=(2, 2), value=(1, 2, 3, 4))
+    B = Array(shape=(2, 2), value=(2, 2, 2, 2))
+    C = local_dict['f'](A=A, B=B)
+
+    assert C.value == [2, 4, 6, 8]
+
+
+@pytest.mark.parametrize("options", [{}, {'vectorize': True}])
+def test_array_parallel_reduction_without_numba(options):
+    _A = LazyArray(name='A', shape=('n',))
+
+    # chunks would run sequentially so reductions are not split
+    source = _A.reduce('+').compile(parallel=True, **options)
+    assert source.count('for ') == 1
+
+
+@pytest.mark.parametrize("operation, n, expected", [
+    ('+', 0, 0),
+    ('+', 3, 3),
+    ('+', 10, 45),
+    ('*', 6, 720),
+])
+def test_array_parallel_reduction(operation, n, expected):
+    _A = LazyArray(name='A', shape=('n',))
+
+    source = _A.reduce(operation).compile(parallel=True, num_partitions=4)
+    assert source.count('for ') == 2
+
+    local_dict = {}
+    exec(source, globals(), local_dict)
+
+    start = 1 if operation == '*' else 0
+    A = Array(shape=(n,), value=tuple(range(start, n + start)))
+    B = local_dict['f'](A=A)
+
+    assert B.value == [expected]
+
+
+@pytest.mark.parametrize("operation, values, expected", [
+    ('+', tuple(range(11)), 55),
+    ('*', (1, 2, 3, 4, 5), 120),
+    ('max', (3, 9, 2, 7, 1, 8, 4), 9),
+    ('min', (3, 9, 2, 7, 1, 8, 4), 1),
+])
+def test_array_reduction_accumulators(operation, values, expected):
+    _A = LazyArray(name='A', shape=('n',))
+
+    source = _A.reduce(operation).compile(accumulators=2)
+    assert source.count('for ') == 2
+
+    local_dict = {}
+    exec(source, globals(), local_dict)
+
+    A = Array(shape=(len(values),), value=values)
+    B = local_dict['f'](A=A)
+
+    assert B.value == [expected]
+
+
+def test_array_vectorized_numpy_backend():
+    numpy = pytest.importorskip('numpy')
+
+    _A = LazyArray(name='A', shape=('n', 'm'))
+    _B = LazyArray(name='B', shape=('m', 'n'))
+
+    source = (_A * 2 + _B.T).compile(vectorize=True)
+    assert source.count('for ') == 1
+
+    local_dict = {}
+    exec(source, {'numpy': numpy}, local_dict)
+
+    A = numpy.arange(12.0).reshape(3, 4)
+    B = numpy.arange(12.0).reshape(4, 3)
+    C = local_dict['f'](A=A, B=B)
+
+    assert numpy.array_equal(C, A * 2 + B.T)
+
+
+def test_array_shared_symbolic_dimension():
+    _A = LazyArray(name='A', shape=('n', 'm'))
+    _B = LazyArray(name='B', shape=('n', 'm'))
+
+    source = (_A + _B).compile()
+    assert '(n == n)' not in source
+
+    local_dict = {}
+    exec(source, globals(), local_dict)
+
+    A = Array(shape=(2, 2), value=(1, 2, 3, 4))
+    B = Array(shape=(2, 2), value=(1, 1, 1, 1))
+    assert local_dict['f'](A=A, B=B).value == [2, 3, 4, 5]
+
+    B = Array(shape=(2, 3), value=(1, 1, 1, 1, 1, 1))
+    with pytest.raises(Exception, match='do not match declared shape'):
+        local_dict['f'](A=A, B=B)
+
+
+def test_array_output_argument():
+    _A = LazyArray(name='A', shape=('n', 'm'))
+    _B = LazyArray(name='B', shape=('n', 'm'))
+
+    source = (_A + _B).compile(out=True)
+    assert 'Array(' not in source
+
+    local_dict = {}
+    exec(source, globals(), local_dict)
+
+    A = Array(shape=(2, 2), value=(1, 2, 3, 4))
+    B = Array(shape=(2, 2), value=(1, 1, 1, 1))
+    C = Array(shape=(2, 2), value=(0, 0, 0, 0))
+    assert local_dict['f'](A=A, B=B, out=C) is C
+    assert C.value == [2, 3, 4, 5]
+
+    with pytest.raises(Exception, match='output argument has invalid shape'):
+        local_dict['f'](A=A, B=B, out=Array(shape=(2, 3), value=(0,) * 6))
+
+
+def test_array_output_argument_aliasing():
+    _A = LazyArray(name='A', shape=('n', 'n'))
+
+    local_dict = {}
+    exec(_A.transpose().compile(out=True), globals(), local_dict)
+
+    A = Array(shape=(2, 2), value=(1, 2, 3, 4))
+    with pytest.raises(Exception, match='output argument overlaps'):
+        local_dict['f'](A=A, out=A)
+
+    # elementwise results may be written in place of their argument
+    _A = LazyArray(name='A', shape=('n', 'n'))
+    local_dict = {}
+    exec((_A * 2).compile(out=True), globals(), local_dict)
+    assert local_dict['f'](A=A, out=A).value == [2, 4, 6, 8]
+
+
+def test_array_output_argument_aliasing_numpy():
+    numpy = pytest.importorskip('numpy')
+
+    _A = LazyArray(name='A', shape=('n', 'n'))
+
+    local_dict = {}
+    exec(_A.transpose().compile(vectorize=True, out=True), {'numpy': numpy}, local_dict)
+
+    A = numpy.arange(4.).reshape(2, 2)
+    assert (local_dict['f'](A=A, out=numpy.zeros((2, 2))) == A.T).all()
+    for out in (A, A.T, A[:, :]):
+        with pytest.raises(Exception, match='output argument overlaps'):
+            local_dict['f'](A=A, out=out)
+
+
+def test_array_fused_output_arguments():
+    _A1 = LazyArray(name='A', shape=(2, 3))
+    _A2 = LazyArray(name='A', shape=(2, 3))
+
+    source = compile_fused([_A1.reduce('+'), _A2 * 2], out=True)
+
+    local_dict = {}
+    exec(source, globals(), local_dict)
+
+    A = Array(shape=(2, 3), value=(1, 2, 3, 4, 5, 6))
+    B = Array(shape=(3,), value=(0, 0, 0))
+    C = Array(shape=(2, 3), value=(0,) * 6)
+    local_dict['f'](A=A, out0=B, out1=C)
+
+    assert B.value == [5, 7, 9]
+    assert C.value == [2, 4, 6, 8, 10, 12]
+
+
+def test_array_in_place():
+    _A = LazyArray(name='A', shape=('n', 'm'))
+    _B = LazyArray(name='B', shape=('n', 'm'))
+
+    source = (_A * 2 + _B).compile(inplace='A')
+    assert 'Array(' not in source
+
+    local_dict = {}
+    exec(source, globals(), local_dict)
+
+    A = Array(shape=(2, 2), value=(1, 2, 3, 4))
+    B = Array(shape=(2, 2), value=(1, 1, 1, 1))
+    assert local_dict['f'](A=A, B=B) is A
+    assert A.value == [3, 5, 7, 9]
+
+
+@pytest.mark.parametrize("expression, inplace", [
+    (lambda: LazyArray(name='A', shape=('n', 'n')).T + LazyArray(name='B', shape=('n', 'n')), 'A'),
+    (lambda: LazyArray(name='A', shape=('n', 'n')).reduce('+'), 'A'),
+    (lambda: LazyArray(name='A', shape=('n',)) + LazyArray(name='B', shape=('n',), fmt='strided', strides=(2,)), 'B'),
+    (lambda: LazyArray(name='A', shape=('n',)) + 1, 'B'),
+])
+def test_array_in_place_unsafe(expression, inplace):
+    with pytest.raises(MOAONFReductionError):
+        expression().compile(inplace=inplace)
+
+
+@pytest.mark.parametrize("memory_planning, allocations", [
+    (True, 2),
+    (False, 3),
+])
+def test_array_memory_planning(memory_planning, allocations):
+    _A = LazyArray(name='A', shape=('n',))
+    _B = LazyArray(name='B', shape=('m',))
+
+    source = (_A.reduce('+') + _B.reduce('*')).compile(parallel=True, num_partitions=4, memory_planning=memory_planning)
+    assert source.count('Array(') == allocations
+
+    local_dict = {}
+    exec(source, globals(), local_dict)
+
+    A = Array(shape=(5,), value=(1, 2, 3, 4, 5))
+    B = Array(shape=(4,), value=(1, 2, 3, 4))
+    assert local_dict['f'](A=A, B=B).value == [15 + 24]
+
+
+@pytest.mark.parametrize("expression, arguments, expected", [
+    (lambda: LazyArray(name='A', shape=('n', 'm')) + LazyArray(name='B', shape=('n', 'm')),
+     {'A': ((2, 3), (1, 2, 3, 4, 5, 6)), 'B': ((2, 3), (1, 1, 1, 1, 1, 1))}, [2, 3, 4, 5, 6, 7]),
+    (lambda: LazyArray(name='A', shape=('n', 'k')).inner('+', '*', LazyArray(name='B', shape=('k', 'm'))),
+     {'A': ((2, 2), (1, 2, 3, 4)), 'B': ((2, 2), (5, 6, 7, 8))}, [19, 22, 43, 50]),
+    (lambda: LazyArray(name='A', shape=('n', 'm')).reduce('+', axis=0),
+     {'A': ((2, 3), (1, 2, 3, 4, 5, 6))}, [5, 7, 9]),
+    (lambda: LazyArray(name='A', shape=('n', 'm'))[::2, 1:].T,
+     {'A': ((3, 3), tuple(range(9)))}, [1, 7, 2, 8]),
+])
+def test_array_strength_reduction(expression, arguments, expected):
+    source = expression().compile(strength_reduction=True)
+    assert '.storage(' in source
+
+    local_dict = {}
+    exec(source, globals(), local_dict)
+
+    arrays = {name: Array(shape=shape, value=value) for name, (shape, value) in arguments.items()}
+    assert local_dict['f'](**arrays).value == expected
+
+
+@pytest.mark.parametrize("collapse, num_loops", [
+    (True, 1),
+    (False, 3),
+])
+def test_array_collapse_loops(collapse, num_loops):
+    _A = LazyArray(name='A', shape=('n', 'm', 'k'))
+    _B = LazyArray(name='B', shape=('n', 'm', 'k'))
+
+    source = (_A * _B + 1).compile(collapse=collapse)
+    assert source.count('for ') == num_loops
+
+    local_dict = {}
+    exec(source, globals(), local_dict)
+
+    A = Array(shape=(2, 1, 3), value=(1, 2, 3, 4, 5, 6))
+    B = Array(shape=(2, 1, 3), value=(2, 2, 2, 3, 3, 3))
+    C = local_dict['f'](A=A, B=B)
+
+    assert C.shape == (2, 1, 3)
+    assert C.value == [3, 5, 7, 13, 16, 19]
+
+
+def test_array_collapse_loops_numpy_output_argument():
+    numpy = pytest.importorskip('numpy')
+
+    _A = LazyArray(name='A', shape=('n', 'm'))
+
+    source = (_A * 2).compile(vectorize=True, collapse=True, out=True)
+
+    local_dict = {}
+    exec(source, {'numpy': numpy}, local_dict)
+
+    A = numpy.arange(12.).reshape(4, 3)
+    out = numpy.zeros((4, 3))
+    assert local_dict['f'](A=A, out=out) is out
+    assert (out == A * 2).all()
+
+    # reshape of a non contiguous output would write into a copy
+    with pytest.raises(Exception, match='not C contiguous'):
+        local_dict['f'](A=A, out=numpy.zeros((3, 4)).T)
+
+
+def test_array_storage_numba_source():
+    _A = LazyArray(name='A', shape=('n', 'm'), fmt='column')
+    _B = LazyArray(name='B', shape=('n', 'm'))
+
+    # row major storage is a contiguous view, other layouts are strided views
+    source = (_A + _B).compile(use_numba=True, strength_reduction=True)
+    assert 'as_strided(A, ' in source
+    assert 'B.reshape(' in source
@@ -0,0 +1,275 @@
+import pytest
+
+from moa import ast, loop
+from moa.frontend import LazyArray
+from moa.shape import calculate_shapes
+from moa.dnf import reduce_to_dnf
+from moa.onf import reduce_to_onf
+
+
+def _onf(expression):
+    return reduce_to_onf(reduce_to_dnf(calculate_shapes(expression.context)), include_conditions=False)
+
+
+def _loop_nests(context, node=None):
+    """Index bounds of each perfect loop nest outermost first"""
+    node = node or context.ast
+    if node.symbol == (ast.NodeSymbol.LOOP,):
+        loops, statements = loop.perfect_nest(node)
+        nests = [tuple(context.symbol_table[_.attrib[0]].value[1] for _ in loops)]
+        for statement in statements:
+            nests.extend(_loop_nests(context, statement))
+        return nests
+    return [nest for child in node.child for nest in _loop_nests(context, child)]
+
+
+@pytest.mark.parametrize("expression, expected", [
+    (lambda: LazyArray(name='A', shape=(2, 3)) + LazyArray(name='B', shape=(2, 3)), [(2, 3)]),
+    (lambda: LazyArray(name='A', shape=(3, 2)).T + LazyArray(name='B', shape=(2, 3)), [(2, 3)]),
+    (lambda: LazyArray(name='A', shape=(2, 3), fmt='column') + LazyArray(name='B', shape=(2, 3), fmt='column'), [(3, 2)]),
+    (lambda: LazyArray(name='A', shape=(2, 3, 4)).reduce('+'), [(3, 4), (2,)]),
+])
+def test_interchange_loops(expression, expected):
+    context = loop.interchange_loops(_onf(expression()))
+    assert _loop_nests(context) == expected
+
+
+def test_is_permutable():
+    context = _onf(LazyArray(name='A', shape=(2, 3)) + LazyArray(name='B', shape=(2, 3)))
+    loops, statements = loop.perfect_nest(context.ast.child[0].child[-1])
+    assert len(loops) == 2
+    assert loop.is_permutable(context, loops, statements)
+
+
+def test_is_permutable_overwrite():
+    # _a3[_i1] = A[_i0, _i1] written by every iteration of _i0
+    symbol_table = {
+        'A': ast.SymbolNode(ast.NodeSymbol.ARRAY, (2, 3), None, None),
+        '_i0': ast.SymbolNode(ast.NodeSymbol.INDEX, (), None, (0, 2, 1)),
+        '_i1': ast.SymbolNode(ast.NodeSymbol.INDEX, (), None, (0, 3, 1)),
+        '_a2': ast.SymbolNode(ast.NodeSymbol.ARRAY, (2,), None, (
+            ast.Node((ast.NodeSymbol.INDEX,), (), ('_i0',), ()),
+            ast.Node((ast.NodeSymbol.INDEX,), (), ('_i1',), ()))),
+        '_a3': ast.SymbolNode(ast.NodeSymbol.ARRAY, (3,), None, None),
+        '_a4': ast.SymbolNode(ast.NodeSymbol.ARRAY, (1,), None, (
+            ast.Node((ast.NodeSymbol.INDEX,), (), ('_i1',), ()),)),
+    }
+    statement = ast.Node((ast.NodeSymbol.ASSIGN,), (), (), (
+        ast.Node((ast.NodeSymbol.PSI,), (), (), (
+            ast.Node((ast.NodeSymbol.ARRAY,), (1,), ('_a4',), ()),
+            ast.Node((ast.NodeSymbol.ARRAY,), (3,), ('_a3',), ()))),
+        ast.Node((ast.NodeSymbol.PSI,), (), (), (
+            ast.Node((ast.NodeSymbol.ARRAY,), (2,), ('_a2',), ()),
+            ast.Node((ast.NodeSymbol.ARRAY,), (2, 3), ('A',), ())))))
+    loops = tuple(ast.Node((ast.NodeSymbol.LOOP,), (), (name,), (
+        ast.Node((ast.NodeSymbol.BLOCK,), (), (), ()),)) for name in ('_i0', '_i1'))
+    context = ast.create_context(ast=loop.build_nest(loops, (statement,)), symbol_table=symbol_table)
+
+    assert not loop.is_permutable(context, loops, (statement,))
+    assert loop.interchange_loops(context).ast == context.ast
+
+
+
+def _loop_steps(context, node):
+    steps = []
+    if node.symbol == (ast.NodeSymbol.LOOP,):
+        steps.append(context.symbol_table[node.attrib[0]].value[2])
+    for child in node.child:
+        steps.extend(_loop_steps(context, child))
+    return steps
+
+
+@pytest.mark.parametrize("tile_sizes, expected", [
+    (2, [2, 2, 1, 1, 2, 1, 1, 1]),
+    ((4, 8, 16), [4, 8, 1, 1, 16, 1, 1, 1]),
+])
+def test_tile_loops_inner_product(tile_sizes, expected):
+    expression = LazyArray(name='A', shape=('n', 'm')).inner('+', '*', LazyArray(name='B', shape=('m', 'k')))
+    context = loop.tile_loops(_onf(expression), tile_sizes=tile_sizes)
+    assert _loop_steps(context, context.ast) == expected
+
+
+def test_tile_loops_constant_bounds():
+    # loops not larger than tile size are not tiled
+    expression = LazyArray(name='A', shape=(4, 64)) + LazyArray(name='B', shape=(4, 64))
+    context = loop.tile_loops(_onf(expression), tile_sizes=16)
+    assert _loop_steps(context, context.ast) == [16, 1, 1]
+
+
+def _count_loops(node):
+    return (node.symbol == (ast.NodeSymbol.LOOP,)) + sum(_count_loops(child) for child in node.child)
+
+
+def test_fuse_loops_sibling_reductions():
+    expression = LazyArray(name='A', shape=('n', 'm')).reduce('+', axis=1) * LazyArray(name='B', shape=('n', 'm')).reduce('max', axis=1)
+    context = _onf(expression)
+    assert _count_loops(context.ast) == 3
+    context = loop.fuse_loops(context)
+    assert _count_loops(context.ast) == 2
+
+
+@pytest.mark.parametrize("offset, fused", [
+    (0, True),
+    (1, False),
+])
+def test_fuse_loops_dependencies(offset, fused):
+    # LOOP _i0 (T[_i0] = A[_i0]) LOOP _i1 (B[_i1] = T[_i1 + offset])
+    def _index(name):
+        return ast.Node((ast.NodeSymbol.INDEX,), (), (name,), ())
+
+    def _psi(vector_name, array_name):
+        return ast.Node((ast.NodeSymbol.PSI,), (), (), (
+            ast.Node((ast.NodeSymbol.ARRAY,), (1,), (vector_name,), ()),
+            ast.Node((ast.NodeSymbol.ARRAY,), (3,), (array_name,), ())))
+
+    read_element = _index('_i1')
+    if offset:
+        read_element = ast.Node((ast.NodeSymbol.PLUS,), (), (), (read_element, ast.Node((ast.NodeSymbol.ARRAY,), (), ('_a5',), ())))
+
+    symbol_table = {
+        'A': ast.SymbolNode(ast.NodeSymbol.ARRAY, (3,), None, None),
+        'B': ast.SymbolNode(ast.NodeSymbol.ARRAY, (3,), None, None),
+        'T': ast.SymbolNode(ast.NodeSymbol.ARRAY, (3,), None, None),
+        '_i0': ast.SymbolNode(ast.NodeSymbol.INDEX, (), None, (0, 3, 1)),
+        '_i1': ast.SymbolNode(ast.NodeSymbol.INDEX, (), None, (0, 3, 1)),
+        '_a5': ast.SymbolNode(ast.NodeSymbol.ARRAY, (), None, (offset,)),
+        '_a6': ast.SymbolNode(ast.NodeSymbol.ARRAY, (1,), None, (_index('_i0'),)),
+        '_a7': ast.SymbolNode(ast.NodeSymbol.ARRAY, (1,), None, (_index('_i1'),)),
+        '_a8': ast.SymbolNode(ast.NodeSymbol.ARRAY, (1,), None, (read_element,)),
+    }
+    loops = (
+        ast.Node((ast.NodeSymbol.LOOP,), (), ('_i0',), (ast.Node((ast.NodeSymbol.BLOCK,), (), (), (
+            ast.Node((ast.NodeSymbol.ASSIGN,), (), (), (_psi('_a6', 'T'), _psi('_a6', 'A'))),)),)),
+        ast.Node((ast.NodeSymbol.LOOP,), (), ('_i1',), (ast.Node((ast.NodeSymbol.BLOCK,), (), (), (
+            ast.Node((ast.NodeSymbol.ASSIGN,), (), (), (_psi('_a7', 'B'), _psi('_a8', 'T'))),)),)),
+    )
+    context = ast.create_context(ast=ast.Node((ast.NodeSymbol.BLOCK,), (), (), loops), symbol_table=symbol_table)
+
+    context = loop.fuse_loops(context)
+    assert (len(context.ast.child) == 1) == fused
+
+
+@pytest.mark.parametrize("shape, unroll_threshold, expected_loops", [
+    ((3, 3), 16, 0),
+    ((3, 3), 4, 1),
+    ((3, 3), 2, 2),
+    ((8, 8), 16, 1),
+    ((8, 8), 4, 2),
+])
+def test_unroll_loops_full(shape, unroll_threshold, expected_loops):
+    context = _onf(LazyArray(name='A', shape=shape) + LazyArray(name='B', shape=shape))
+    context = loop.unroll_loops(context, unroll_threshold=unroll_threshold)
+    assert _count_loops(context.ast) == expected_loops
+
+
+def test_unroll_loops_constant_index():
+    context = _onf(LazyArray(name='A', shape=(2, 3)) + LazyArray(name='B', shape=(2, 3)))
+    context = loop.unroll_loops(context)
+
+    vectors = [context.symbol_table[node.child[0].attrib[0]].value for node in ast.psi_nodes(context.ast)]
+    assert len(vectors) == 18
+    assert set(vectors) == {(i, j) for i in range(2) for j in range(3)}
+
+
+def test_unroll_loops_partial():
+    context = _onf(LazyArray(name='A', shape=('n',)) + LazyArray(name='B', shape=('n',)))
+    context = loop.unroll_loops(context, unroll_factor=4)
+
+    main_loop, remainder_loop = context.ast.child[0].child[-2:]
+    assert main_loop.symbol == remainder_loop.symbol == (ast.NodeSymbol.LOOP,)
+    assert len(main_loop.child[0].child) == 4
+    assert len(remainder_loop.child[0].child) == 1
+    assert context.symbol_table[main_loop.attrib[0]].value[2] == 4
+    assert context.symbol_table[remainder_loop.attrib[0]].value[0] == context.symbol_table[main_loop.attrib[0]].value[1]
+
+
+@pytest.mark.parametrize("expression, expected", [
+    (lambda: LazyArray(name='A', shape=('n', 'm')) + LazyArray(name='B', shape=('n', 'm')), True),
+    (lambda: LazyArray(name='A', shape=('n', 'm')).inner('+', '*', LazyArray(name='B', shape=('m', 'k'))), True),
+    (lambda: LazyArray(name='A', shape=('n',)).reduce('+'), False),
+])
+def test_is_parallel(expression, expected):
+    context = _onf(expression())
+    outer_loop = [node for node in context.ast.child[0].child if node.symbol == (ast.NodeSymbol.LOOP,)][0]
+    assert loop.is_parallel(context, outer_loop) == expected
+
+
+def test_parallelize_loops():
+    context = _onf(LazyArray(name='A', shape=('n', 'm')).inner('+', '*', LazyArray(name='B', shape=('m', 'k'))))
+    context = loop.parallelize_loops(context)
+
+    def _parallel_loops(node):
+        loops = [node.attrib[0]] if node.symbol == (ast.NodeSymbol.LOOP,) and loop.is_parallel_loop(node) else []
+        return loops + [name for child in node.child for name in _parallel_loops(child)]
+
+    outer_loop = context.ast.child[0].child[-1]
+    assert _parallel_loops(context.ast) == [outer_loop.attrib[0]]
+
+
+@pytest.mark.parametrize("expression, split", [
+    (lambda: LazyArray(name='A', shape=('n',)).reduce('+'), True),
+    (lambda: LazyArray(name='A', shape=('n',)).reduce('*'), True),
+    (lambda: LazyArray(name='A', shape=('n',)).inner('+', '*', LazyArray(name='B', shape=('n',))), True),
+    (lambda: LazyArray(name='A', shape=('n',)).reduce('max'), False),
+    (lambda: LazyArray(name='A', shape=('n',)).reduce('-'), False),
+    (lambda: LazyArray(name='A', shape=('n', 'm')).reduce('+', axis=1), False),
+])
+def test_parallelize_reductions(expression, split):
+    context = _onf(expression())
+    new_context = loop.parallelize_reductions(context, num_partitions=4)
+    assert (new_context.ast != context.ast) == split
+
+    if split:
+        partition_loop = [node for node in new_context.ast.child[0].child if node.symbol == (ast.NodeSymbol.LOOP,)][0]
+        assert new_context.symbol_table[partition_loop.attrib[0]].value == (0, 4, 1)
+        assert loop.is_parallel(new_context, partition_loop)
+
+
+@pytest.mark.parametrize("shape, num_accumulators, interleaved", [
+    (('n',), 4, True),
+    ((100,), 2, True),
+    ((5,), 4, False),
+])
+def test_interleave_accumulators(shape, num_accumulators, interleaved):
+    context = _onf(LazyArray(name='A', shape=shape).reduce('+'))
+    new_context = loop.interleave_accumulators(context, num_accumulators=num_accumulators)
+    assert (_count_loops(new_context.ast) == 2) == interleaved
+
+    if interleaved:
+        main_loop = [node for node in new_context.ast.child[0].child if node.symbol == (ast.NodeSymbol.LOOP,)][0]
+        targets = {statement.child[0].attrib[0] for statement in main_loop.child[0].child}
+        assert len(targets) == num_accumulators
+
+
+@pytest.mark.parametrize("expression, vector_loops", [
+    (lambda: LazyArray(name='A', shape=('n', 'm')) + LazyArray(name='B', shape=('n', 'm')), 1),
+    (lambda: LazyArray(name='A', shape=(3, 2)).T * LazyArray(name='B', shape=(2, 3)), 1),
+    (lambda: LazyArray(name='A', shape=('n',)).outer('*', LazyArray(name='B', shape=('m',))), 1),
+    (lambda: LazyArray(name='A', shape=('n', 'm')).reduce('+', axis=1), 0),
+    (lambda: LazyArray(name='A', shape=('n',))[::2], 0),
+])
+def test_vectorize_loops(expression, vector_loops):
+    context = loop.vectorize_loops(_onf(expression()))
+
+    def _vector_loops(node):
+        return (node.symbol == (ast.NodeSymbol.LOOP,) and loop.is_vector_loop(node)) + sum(_vector_loops(child) for child in node.child)
+
+    assert _vector_loops(context.ast) == vector_loops
+
+
+@pytest.mark.parametrize("expression, num_loops", [
+    (lambda: LazyArray(name='A', shape=('n', 'm')) + LazyArray(name='B', shape=('n', 'm')), 1),
+    (lambda: (LazyArray(name='A', shape=(2, 3, 4)) * 2) + 1, 1),
+    (lambda: LazyArray(name='A', shape=('n', 'm')).T + LazyArray(name='B', shape=('m', 'n')), 2),
+    (lambda: LazyArray(name='A', shape=('n', 'n')).T + LazyArray(name='B', shape=('n', 'n')), 2),
+    (lambda: LazyArray(name='A', shape=('n', 'm')).reduce('+', axis=1), 2),
+    (lambda: LazyArray(name='A', shape=('n',)).outer('*', LazyArray(name='B', shape=('m',))), 2),
+    (lambda: LazyArray(name='A', shape=('n', 'm'), fmt='column') + LazyArray(name='B', shape=('n', 'm')), 2),
+])
+def test_collapse_loops(expression, num_loops):
+    context = loop.collapse_loops(loop.interchange_loops(_onf(expression())))
+    assert _count_loops(context.ast) == num_loops
+
+    if num_loops == 1:
+        (flat_loop,) = [node for node in context.ast.child[0].child if node.symbol == (ast.NodeSymbol.LOOP,)]
+        assert context.symbol_table[flat_loop.attrib[0]].value[0::2] == (0, 1)
@@ -0,0 +1,72 @@
+from moa import ast, onf
+
+
+def _array(name, shape):
+    return ast.Node((ast.NodeSymbol.ARRAY,), shape, (name,), ())
+
+
+def _element(vector_name, name, shape):
+    return ast.Node((ast.NodeSymbol.PSI,), (), (), (_array(vector_name, (len(shape),)), _array(name, shape)))
+
+
+def _temporaries_context():
+    """Temporary _t2 is live together with _t1 and later with _t3"""
+    symbol_table = {
+        'A': ast.SymbolNode(ast.NodeSymbol.ARRAY, (3,), None, None),
+        'R': ast.SymbolNode(ast.NodeSymbol.ARRAY, (), None, None),
+        '_t1': ast.SymbolNode(ast.NodeSymbol.ARRAY, (3,), None, None),
+        '_t2': ast.SymbolNode(ast.NodeSymbol.ARRAY, (2,), None, None),
+        '_t3': ast.SymbolNode(ast.NodeSymbol.ARRAY, (1, 3), None, None),
+        '_v0': ast.SymbolNode(ast.NodeSymbol.ARRAY, (0,), None, ()),
+        '_v1': ast.SymbolNode(ast.NodeSymbol.ARRAY, (1,), None, (1,)),
+        '_v2': ast.SymbolNode(ast.NodeSymbol.ARRAY, (2,), None, (0, 2)),
+    }
+    statements = (
+        ast.Node((ast.NodeSymbol.INITIALIZE,), (), ('R',), ()),
+        ast.Node((ast.NodeSymbol.INITIALIZE,), (3,), ('_t1',), ()),
+        ast.Node((ast.NodeSymbol.INITIALIZE,), (2,), ('_t2',), ()),
+        ast.Node((ast.NodeSymbol.ASSIGN,), (), (), (_element('_v1', '_t1', (3,)), _element('_v1', 'A', (3,)))),
+        ast.Node((ast.NodeSymbol.ASSIGN,), (), (), (_element('_v1', '_t2', (2,)), _element('_v1', '_t1', (3,)))),
+        ast.Node((ast.NodeSymbol.INITIALIZE,), (1, 3), ('_t3',), ()),
+        ast.Node((ast.NodeSymbol.ASSIGN,), (), (), (_element('_v2', '_t3', (1, 3)), _element('_v1', '_t2', (2,)))),
+        ast.Node((ast.NodeSymbol.ASSIGN,), (), (), (_element('_v0', 'R', ()), _element('_v2', '_t3', (1, 3)))),
+    )
+    return ast.create_context(
+        ast=ast.Node((ast.NodeSymbol.FUNCTION,), (), (('A',), 'R'), (
+            ast.Node((ast.NodeSymbol.BLOCK,), (), (), statements),)),
+        symbol_table=symbol_table)
+
+
+def test_temporary_lifetimes():
+    context = _temporaries_context()
+    assert onf.temporary_lifetimes(context) == {'_t1': (1, 4), '_t2': (2, 6), '_t3': (5, 7)}
+
+
+def test_plan_memory():
+    context, arena_size = onf.plan_memory(_temporaries_context())
+    # _t1 at offset 0, _t2 after it, _t3 reuses the memory of _t1
+    assert arena_size == 5
+
+    statements = context.ast.child[0].child
+    initialized = [statement.attrib[0] for statement in statements if statement.symbol == (ast.NodeSymbol.INITIALIZE,)]
+    assert len(initialized) == 2 and initialized[0] == 'R'
+    arena_name = initialized[1]
+    assert context.symbol_table[arena_name].shape == (5,)
+
+    def _offsets(node):
+        if node.symbol == (ast.NodeSymbol.PSI,) and node.child[1].attrib[0] == arena_name:
+            return (context.symbol_table[node.child[0].attrib[0]].value,)
+        return tuple(offset for child in node.child for offset in _offsets(child))
+
+    assert [_offsets(statement) for statement in statements[2:]] == [
+        ((1,),), ((4,), (1,)), ((2,), (4,)), ((2,),)]
+
+
+def test_plan_memory_no_temporaries():
+    context = _temporaries_context()
+    context = ast.create_context(
+        ast=ast.Node(context.ast.symbol, context.ast.shape, context.ast.attrib, (
+            ast.Node((ast.NodeSymbol.BLOCK,), (), (), context.ast.child[0].child[:1]),)),
+        symbol_table=context.symbol_table)
+    new_context, arena_size = onf.plan_memory(context)
+    assert arena_size == 0 and new_context.ast == context.ast
@@ -0,0 +1,416 @@
+import pytest
+
+from moa import ast, optimize, testing
+
+
+@pytest.mark.parametrize("operation, left, right, expected", [
+    (ast.NodeSymbol.PLUS, ((3,), (1, 2, 3)), ((3,), (4, 5, 6)), ((3,), (5, 7, 9))),
+    (ast.NodeSymbol.MINUS, ((), (1,)), ((3,), (4, 5, 6)), ((3,), (-3, -4, -5))),
+    (ast.NodeSymbol.TIMES, ((2, 2), (1, 2, 3, 4)), ((), (2,)), ((2, 2), (2, 4, 6, 8))),
+    (ast.NodeSymbol.DIVIDE, ((), (3,)), ((), (2,)), ((), (1.5,))),
+])
+def test_fold_constants_plus_minus_times_divide(operation, left, right, expected):
+    symbol_table = {
+        '_a0': ast.SymbolNode(ast.NodeSymbol.ARRAY, left[0], None, left[1]),
+        '_a1': ast.SymbolNode(ast.NodeSymbol.ARRAY, right[0], None, right[1]),
+    }
+    tree = ast.Node((operation,), expected[0], (), (
+        ast.Node((ast.NodeSymbol.ARRAY,), left[0], ('_a0',), ()),
+        ast.Node((ast.NodeSymbol.ARRAY,), right[0], ('_a1',), ())))
+
+    expected_symbol_table = {
+        **symbol_table,
+        '_a2': ast.SymbolNode(ast.NodeSymbol.ARRAY, expected[0], None, expected[1]),
+    }
+    expected_tree = ast.Node((ast.NodeSymbol.ARRAY,), expected[0], ('_a2',), ())
+
+    testing.assert_transformation(tree, symbol_table, expected_tree, expected_symbol_table, optimize.fold_constants)
+
+
+@pytest.mark.parametrize("symbol, array, expected", [
+    ((ast.NodeSymbol.TRANSPOSE,), ((2, 3), (0, 1, 2, 3, 4, 5)), ((3, 2), (0, 3, 1, 4, 2, 5))),
+    ((ast.NodeSymbol.RAV,), ((2, 3), (0, 1, 2, 3, 4, 5)), ((6,), (0, 1, 2, 3, 4, 5))),
+    ((ast.NodeSymbol.REDUCE, ast.NodeSymbol.PLUS), ((2, 3), (0, 1, 2, 3, 4, 5)), ((3,), (3, 5, 7))),
+    ((ast.NodeSymbol.REDUCE, ast.NodeSymbol.MINUS), ((3,), (1, 2, 3)), ((), (-6,))),
+])
+def test_fold_constants_unary(symbol, array, expected):
+    symbol_table = {
+        '_a0': ast.SymbolNode(ast.NodeSymbol.ARRAY, array[0], None, array[1]),
+    }
+    tree = ast.Node(symbol, expected[0], (), (
+        ast.Node((ast.NodeSymbol.ARRAY,), array[0], ('_a0',), ()),))
+
+    expected_symbol_table = {
+        **symbol_table,
+        '_a1': ast.SymbolNode(ast.NodeSymbol.ARRAY, expected[0], None, expected[1]),
+    }
+    expected_tree = ast.Node((ast.NodeSymbol.ARRAY,), expected[0], ('_a1',), ())
+
+    testing.assert_transformation(tree, symbol_table, expected_tree, expected_symbol_table, optimize.fold_constants)
+
+
+@pytest.mark.parametrize("symbol, vector, array, expected", [
+    ((ast.NodeSymbol.PSI,), (1,), ((2, 3), (0, 1, 2, 3, 4, 5)), ((3,), (3, 4, 5))),
+    ((ast.NodeSymbol.PSI,), (1, 2), ((2, 3), (0, 1, 2, 3, 4, 5)), ((), (5,))),
+    ((ast.NodeSymbol.TRANSPOSEV,), (1, 2, 0), ((2, 1, 3), (0, 1, 2, 3, 4, 5)), ((3, 2, 1), (0, 3, 1, 4, 2, 5))),
+    ((ast.NodeSymbol.RESHAPE,), (3, 2), ((2, 3), (0, 1, 2, 3, 4, 5)), ((3, 2), (0, 1, 2, 3, 4, 5))),
+])
+def test_fold_constants_binary(symbol, vector, array, expected):
+    symbol_table = {
+        '_a0': ast.SymbolNode(ast.NodeSymbol.ARRAY, (len(vector),), None, vector),
+        '_a1': ast.SymbolNode(ast.NodeSymbol.ARRAY, array[0], None, array[1]),
+    }
+    tree = ast.Node(symbol, expected[0], (), (
+        ast.Node((ast.NodeSymbol.ARRAY,), (len(vector),), ('_a0',), ()),
+        ast.Node((ast.NodeSymbol.ARRAY,), array[0], ('_a1',), ())))
+
+    expected_symbol_table = {
+        **symbol_table,
+        '_a2': ast.SymbolNode(ast.NodeSymbol.ARRAY, expected[0], None, expected[1]),
+    }
+    expected_tree = ast.Node((ast.NodeSymbol.ARRAY,), expected[0], ('_a2',), ())
+
+    testing.assert_transformation(tree, symbol_table, expected_tree, expected_symbol_table, optimize.fold_constants)
+
+
+def test_fold_constants_unknown_array():
+    symbol_table = {
+        '_a0': ast.SymbolNode(ast.NodeSymbol.ARRAY, (), None, (1,)),
+        'A': ast.SymbolNode(ast.NodeSymbol.ARRAY, (3,), None, None),
+    }
+    tree = ast.Node((ast.NodeSymbol.PLUS,), (3,), (), (
+        ast.Node((ast.NodeSymbol.ARRAY,), (), ('_a0',), ()),
+        ast.Node((ast.NodeSymbol.ARRAY,), (3,), ('A',), ())))
+
+    testing.assert_transformation(tree, symbol_table, tree, symbol_table, optimize.fold_constants)
+
+
+@pytest.mark.parametrize("operation, constant, constant_side, expected_child", [
+    (ast.NodeSymbol.PLUS, 0, 0, 1),
+    (ast.NodeSymbol.PLUS, 0, 1, 0),
+    (ast.NodeSymbol.MINUS, 0, 1, 0),
+    (ast.NodeSymbol.TIMES, 1, 0, 1),
+    (ast.NodeSymbol.TIMES, 1, 1, 0),
+    (ast.NodeSymbol.DIVIDE, 1, 1, 0),
+    (ast.NodeSymbol.TIMES, 0, 0, 0),
+    (ast.NodeSymbol.TIMES, 0, 1, 1),
+])
+def test_remove_identities(operation, constant, constant_side, expected_child):
+    symbol_table = {
+        '_a0': ast.SymbolNode(ast.NodeSymbol.ARRAY, (1,), None, (ast.Node((ast.NodeSymbol.ARRAY,), (), ('_i1',), ()),)),
+        '_i1': ast.SymbolNode(ast.NodeSymbol.INDEX, (), None, (0, 3, 1)),
+        '_a2': ast.SymbolNode(ast.NodeSymbol.ARRAY, (), None, (constant,)),
+        'A': ast.SymbolNode(ast.NodeSymbol.ARRAY, (3,), None, None),
+    }
+    children = [
+        ast.Node((ast.NodeSymbol.PSI,), (3,), (), (
+            ast.Node((ast.NodeSymbol.ARRAY,), (1,), ('_a0',), ()),
+            ast.Node((ast.NodeSymbol.ARRAY,), (3,), ('A',), ()))),
+    ]
+    children.insert(constant_side, ast.Node((ast.NodeSymbol.ARRAY,), (), ('_a2',), ()))
+    tree = ast.Node((operation,), (3,), (), tuple(children))
+
+    expected_tree = ast.Node(children[expected_child].symbol, (3,), children[expected_child].attrib, children[expected_child].child)
+
+    testing.assert_transformation(tree, symbol_table, expected_tree, symbol_table, optimize.remove_identities)
+
+
+def test_remove_identities_non_identity():
+    symbol_table = {
+        '_a0': ast.SymbolNode(ast.NodeSymbol.ARRAY, (), None, (0,)),
+        'A': ast.SymbolNode(ast.NodeSymbol.ARRAY, (), None, None),
+    }
+    # 0 - A and A / 0 are not identities
+    tree = ast.Node((ast.NodeSymbol.DIVIDE,), (), (), (
+        ast.Node((ast.NodeSymbol.MINUS,), (), (), (
+            ast.Node((ast.NodeSymbol.ARRAY,), (), ('_a0',), ()),
+            ast.Node((ast.NodeSymbol.ARRAY,), (), ('A',), ()))),
+        ast.Node((ast.NodeSymbol.ARRAY,), (), ('_a0',), ())))
+
+    testing.assert_transformation(tree, symbol_table, tree, symbol_table, optimize.remove_identities)
+
+
+def test_simplify_factor():
+    symbol_table = {
+        'A': ast.SymbolNode(ast.NodeSymbol.ARRAY, (3,), None, None),
+        'B': ast.SymbolNode(ast.NodeSymbol.ARRAY, (3,), None, None),
+        'C': ast.SymbolNode(ast.NodeSymbol.ARRAY, (3,), None, None),
+    }
+    # (B * A) - (A * C) => (B - C) * A
+    tree = ast.Node((ast.NodeSymbol.MINUS,), (3,), (), (
+        ast.Node((ast.NodeSymbol.TIMES,), (3,), (), (
+            ast.Node((ast.NodeSymbol.ARRAY,), (3,), ('B',), ()),
+            ast.Node((ast.NodeSymbol.ARRAY,), (3,), ('A',), ()))),
+        ast.Node((ast.NodeSymbol.TIMES,), (3,), (), (
+            ast.Node((ast.NodeSymbol.ARRAY,), (3,), ('A',), ()),
+            ast.Node((ast.NodeSymbol.ARRAY,), (3,), ('C',), ())))))
+
+    expected_tree = ast.Node((ast.NodeSymbol.TIMES,), (3,), (), (
+        ast.Node((ast.NodeSymbol.MINUS,), (3,), (), (
+            ast.Node((ast.NodeSymbol.ARRAY,), (3,), ('B',), ()),
+            ast.Node((ast.NodeSymbol.ARRAY,), (3,), ('C',), ()))),
+        ast.Node((ast.NodeSymbol.ARRAY,), (3,), ('A',), ())))
+
+    testing.assert_transformation(tree, symbol_table, expected_tree, symbol_table, optimize.simplify)
+
+
+@pytest.mark.parametrize("outer, inner, scalar_first, expected_outer, expected_scalar", [
+    (ast.NodeSymbol.PLUS, ast.NodeSymbol.PLUS, True, ast.NodeSymbol.PLUS, ast.NodeSymbol.PLUS),
+    (ast.NodeSymbol.MINUS, ast.NodeSymbol.PLUS, True, ast.NodeSymbol.PLUS, ast.NodeSymbol.MINUS),
+    (ast.NodeSymbol.MINUS, ast.NodeSymbol.MINUS, False, ast.NodeSymbol.MINUS, ast.NodeSymbol.PLUS),
+    (ast.NodeSymbol.TIMES, ast.NodeSymbol.TIMES, True, ast.NodeSymbol.TIMES, ast.NodeSymbol.TIMES),
+    (ast.NodeSymbol.DIVIDE, ast.NodeSymbol.TIMES, True, ast.NodeSymbol.TIMES, ast.NodeSymbol.DIVIDE),
+    (ast.NodeSymbol.TIMES, ast.NodeSymbol.DIVIDE, False, ast.NodeSymbol.DIVIDE, ast.NodeSymbol.DIVIDE),
+    (ast.NodeSymbol.DIVIDE, ast.NodeSymbol.DIVIDE, False, ast.NodeSymbol.DIVIDE, ast.NodeSymbol.TIMES),
+])
+def test_simplify_scalar_chain(outer, inner, scalar_first, expected_outer, expected_scalar):
+    n = ast.Node((ast.NodeSymbol.ARRAY,), (), ('n',), ())
+    symbol_table = {
+        'n': ast.SymbolNode(ast.NodeSymbol.ARRAY, (), None, None),
+        'A': ast.SymbolNode(ast.NodeSymbol.ARRAY, (n,), None, None),
+        's': ast.SymbolNode(ast.NodeSymbol.ARRAY, (), None, None),
+        't': ast.SymbolNode(ast.NodeSymbol.ARRAY, (), None, None),
+    }
+    a_node = ast.Node((ast.NodeSymbol.ARRAY,), (n,), ('A',), ())
+    s_node = ast.Node((ast.NodeSymbol.ARRAY,), (), ('s',), ())
+    t_node = ast.Node((ast.NodeSymbol.ARRAY,), (), ('t',), ())
+
+    inner_children = (s_node, a_node) if scalar_first else (a_node, s_node)
+    tree = ast.Node((outer,), (n,), (), (
+        ast.Node((inner,), (n,), (), inner_children),
+        t_node))
+
+    expected_tree = ast.Node((expected_outer,), (n,), (), (
+        a_node,
+        ast.Node((expected_scalar,), (), (), (s_node, t_node))))
+
+    testing.assert_transformation(tree, symbol_table, expected_tree, symbol_table, optimize.simplify)
+
+
+def test_simplify_scalar_chain_not_reassociated():
+    symbol_table = {
+        'A': ast.SymbolNode(ast.NodeSymbol.ARRAY, (3,), None, None),
+        's': ast.SymbolNode(ast.NodeSymbol.ARRAY, (), None, None),
+        't': ast.SymbolNode(ast.NodeSymbol.ARRAY, (), None, None),
+    }
+    # (s - A) + t cannot be reassociated
+    tree = ast.Node((ast.NodeSymbol.PLUS,), (3,), (), (
+        ast.Node((ast.NodeSymbol.MINUS,), (3,), (), (
+            ast.Node((ast.NodeSymbol.ARRAY,), (), ('s',), ()),
+            ast.Node((ast.NodeSymbol.ARRAY,), (3,), ('A',), ()))),
+        ast.Node((ast.NodeSymbol.ARRAY,), (), ('t',), ())))
+
+    testing.assert_transformation(tree, symbol_table, tree, symbol_table, optimize.simplify)
+
+
+@pytest.mark.parametrize("reduce_operation, operation", [
+    (ast.NodeSymbol.PLUS, ast.NodeSymbol.TIMES),
+    (ast.NodeSymbol.MINUS, ast.NodeSymbol.DIVIDE),
+])
+def test_simplify_reduce_scalar(reduce_operation, operation):
+    symbol_table = {
+        'A': ast.SymbolNode(ast.NodeSymbol.ARRAY, (4, 3), None, None),
+        's': ast.SymbolNode(ast.NodeSymbol.ARRAY, (), None, None),
+    }
+    a_node = ast.Node((ast.NodeSymbol.ARRAY,), (4, 3), ('A',), ())
+    s_node = ast.Node((ast.NodeSymbol.ARRAY,), (), ('s',), ())
+
+    tree = ast.Node((ast.NodeSymbol.REDUCE, reduce_operation), (3,), (), (
+        ast.Node((operation,), (4, 3), (), (a_node, s_node)),))
+
+    expected_tree = ast.Node((operation,), (3,), (), (
+        ast.Node((ast.NodeSymbol.REDUCE, reduce_operation), (3,), (), (a_node,)),
+        s_node))
+
+    testing.assert_transformation(tree, symbol_table, expected_tree, symbol_table, optimize.simplify)
+
+
+def test_simplify_reduce_times_scalar_unchanged():
+    symbol_table = {
+        'A': ast.SymbolNode(ast.NodeSymbol.ARRAY, (4, 3), None, None),
+        's': ast.SymbolNode(ast.NodeSymbol.ARRAY, (), None, None),
+    }
+    tree = ast.Node((ast.NodeSymbol.REDUCE, ast.NodeSymbol.TIMES), (3,), (), (
+        ast.Node((ast.NodeSymbol.TIMES,), (4, 3), (), (
+            ast.Node((ast.NodeSymbol.ARRAY,), (), ('s',), ()),
+            ast.Node((ast.NodeSymbol.ARRAY,), (4, 3), ('A',), ()))),))
+
+    testing.assert_transformation(tree, symbol_table, tree, symbol_table, optimize.simplify)
+
+
+def test_eliminate_common_subexpressions():
+    symbol_table = {
+        '_i0': ast.SymbolNode(ast.NodeSymbol.INDEX, (), None, (0, 3, 1)),
+        '_a1': ast.SymbolNode(ast.NodeSymbol.ARRAY, (1,), None, (ast.Node((ast.NodeSymbol.ARRAY,), (), ('_i0',), ()),)),
+        '_a2': ast.SymbolNode(ast.NodeSymbol.ARRAY, (1,), None, (ast.Node((ast.NodeSymbol.ARRAY,), (), ('_i0',), ()),)),
+        'A': ast.SymbolNode(ast.NodeSymbol.ARRAY, (3,), None, None),
+        'B': ast.SymbolNode(ast.NodeSymbol.ARRAY, (3,), None, None),
+    }
+    # B[i] = A[i] * A[i] (index vectors with equal values)
+    tree = ast.Node((ast.NodeSymbol.BLOCK,), (), (), (
+        ast.Node((ast.NodeSymbol.ASSIGN,), (), (), (
+            ast.Node((ast.NodeSymbol.PSI,), (), (), (
+                ast.Node((ast.NodeSymbol.ARRAY,), (1,), ('_a1',), ()),
+                ast.Node((ast.NodeSymbol.ARRAY,), (3,), ('B',), ()))),
+            ast.Node((ast.NodeSymbol.TIMES,), (), (), (
+                ast.Node((ast.NodeSymbol.PSI,), (), (), (
+                    ast.Node((ast.NodeSymbol.ARRAY,), (1,), ('_a1',), ()),
+                    ast.Node((ast.NodeSymbol.ARRAY,), (3,), ('A',), ()))),
+                ast.Node((ast.NodeSymbol.PSI,), (), (), (
+                    ast.Node((ast.NodeSymbol.ARRAY,), (1,), ('_a2',), ()),
+                    ast.Node((ast.NodeSymbol.ARRAY,), (3,), ('A',), ()))))))),))
+
+    context = ast.create_context(ast=tree, symbol_table=symbol_table)
+    context, num_eliminated = optimize.eliminate_common_subexpressions(context)
+
+    expected_symbol_table = {
+        **symbol_table,
+        '_a5': ast.SymbolNode(ast.NodeSymbol.ARRAY, (), None, None),
+    }
+    expected_tree = ast.Node((ast.NodeSymbol.BLOCK,), (), (), (
+        ast.Node((ast.NodeSymbol.ASSIGN,), (), (), (
+            ast.Node((ast.NodeSymbol.ARRAY,), (), ('_a5',), ()),
+            ast.Node((ast.NodeSymbol.PSI,), (), (), (
+                ast.Node((ast.NodeSymbol.ARRAY,), (1,), ('_a1',), ()),
+                ast.Node((ast.NodeSymbol.ARRAY,), (3,), ('A',), ()))))),
+        ast.Node((ast.NodeSymbol.ASSIGN,), (), (), (
+            ast.Node((ast.NodeSymbol.PSI,), (), (), (
+                ast.Node((ast.NodeSymbol.ARRAY,), (1,), ('_a1',), ()),
+                ast.Node((ast.NodeSymbol.ARRAY,), (3,), ('B',), ()))),
+            ast.Node((ast.NodeSymbol.TIMES,), (), (), (
+                ast.Node((ast.NodeSymbol.ARRAY,), (), ('_a5',), ()),
+                ast.Node((ast.NodeSymbol.ARRAY,), (), ('_a5',), ()))))),))
+
+    assert num_eliminated == 1
+    testing.assert_context_equal(context, ast.create_context(ast=expected_tree, symbol_table=expected_symbol_table))
+
+
+def test_eliminate_common_subexpressions_assigned_array():
+    symbol_table = {
+        '_a0': ast.SymbolNode(ast.NodeSymbol.ARRAY, (), None, None),
+        'A': ast.SymbolNode(ast.NodeSymbol.ARRAY, (), None, None),
+    }
+    # _a0 = _a0 + A; _a0 = _a0 + A must not be merged
+    statement = ast.Node((ast.NodeSymbol.ASSIGN,), (), (), (
+        ast.Node((ast.NodeSymbol.ARRAY,), (), ('_a0',), ()),
+        ast.Node((ast.NodeSymbol.PLUS,), (), (), (
+            ast.Node((ast.NodeSymbol.ARRAY,), (), ('_a0',), ()),
+            ast.Node((ast.NodeSymbol.ARRAY,), (), ('A',), ())))))
+    tree = ast.Node((ast.NodeSymbol.BLOCK,), (), (), (statement, statement))
+
+    context = ast.create_context(ast=tree, symbol_table=symbol_table)
+    new_context, num_eliminated = optimize.eliminate_common_subexpressions(context)
+
+    assert num_eliminated == 0
+    testing.assert_context_equal(context, new_context)
+
+
+def test_hoist_loop_invariants():
+    symbol_table = {
+        '_i0': ast.SymbolNode(ast.NodeSymbol.INDEX, (), None, (0, 3, 1)),
+        '_i1': ast.SymbolNode(ast.NodeSymbol.INDEX, (), None, (0, 2, 1)),
+        '_a2': ast.SymbolNode(ast.NodeSymbol.ARRAY, (2,), None, (
+            ast.Node((ast.NodeSymbol.ARRAY,), (), ('_i0',), ()),
+            ast.Node((ast.NodeSymbol.ARRAY,), (), ('_i1',), ()))),
+        '_a3': ast.SymbolNode(ast.NodeSymbol.ARRAY, (1,), None, (ast.Node((ast.NodeSymbol.ARRAY,), (), ('_i0',), ()),)),
+        '_a4': ast.SymbolNode(ast.NodeSymbol.ARRAY, (1,), None, (ast.Node((ast.NodeSymbol.ARRAY,), (), ('_i1',), ()),)),
+        'A': ast.SymbolNode(ast.NodeSymbol.ARRAY, (3,), None, None),
+        'B': ast.SymbolNode(ast.NodeSymbol.ARRAY, (2,), None, None),
+        'C': ast.SymbolNode(ast.NodeSymbol.ARRAY, (3, 2), None, None),
+    }
+
+    def _loop(index_name, statement):
+        return ast.Node((ast.NodeSymbol.LOOP,), (), (index_name,), (
+            ast.Node((ast.NodeSymbol.BLOCK,), (), (), (statement,)),))
+
+    def _psi(vector_name, array_name, shape):
+        return ast.Node((ast.NodeSymbol.PSI,), (), (), (
+            ast.Node((ast.NodeSymbol.ARRAY,), (len(shape),), (vector_name,), ()),
+            ast.Node((ast.NodeSymbol.ARRAY,), shape, (array_name,), ())))
+
+    # LOOP i (LOOP j (C[i, j] = A[i] * B[j]))
+    tree = ast.Node((ast.NodeSymbol.BLOCK,), (), (), (
+        _loop('_i0', _loop('_i1', ast.Node((ast.NodeSymbol.ASSIGN,), (), (), (
+            _psi('_a2', 'C', (3, 2)),
+            ast.Node((ast.NodeSymbol.TIMES,), (), (), (_psi('_a3', 'A', (3,)), _psi('_a4', 'B', (2,)))))))),))
+
+    context = ast.create_context(ast=tree, symbol_table=symbol_table)
+    context, num_hoisted = optimize.hoist_loop_invariants(context)
+
+    # LOOP i (_a8 = A[i]; LOOP j (C[i, j] = _a8 * B[j]))
+    expected_tree = ast.Node((ast.NodeSymbol.BLOCK,), (), (), (
+        ast.Node((ast.NodeSymbol.LOOP,), (), ('_i0',), (
+            ast.Node((ast.NodeSymbol.BLOCK,), (), (), (
+                ast.Node((ast.NodeSymbol.ASSIGN,), (), (), (
+                    ast.Node((ast.NodeSymbol.ARRAY,), (), ('_a8',), ()),
+                    _psi('_a3', 'A', (3,)))),
+                _loop('_i1', ast.Node((ast.NodeSymbol.ASSIGN,), (), (), (
+                    _psi('_a2', 'C', (3, 2)),
+                    ast.Node((ast.NodeSymbol.TIMES,), (), (), (
+                        ast.Node((ast.NodeSymbol.ARRAY,), (), ('_a8',), ()),
+                        _psi('_a4', 'B', (2,))))))))),)),))
+
+    assert num_hoisted == 1
+    assert context.ast == expected_tree
+    assert context.symbol_table['_a8'] == ast.SymbolNode(ast.NodeSymbol.ARRAY, (), None, None)
+
+
+def _condition_node(symbol, left, right):
+    return ast.Node((symbol,), (), (), (left, right))
+
+
+_n = ast.Node((ast.NodeSymbol.ARRAY,), (), ('n',), ())
+_three = ast.Node((ast.NodeSymbol.ARRAY,), (), ('_a0',), ())
+_five = ast.Node((ast.NodeSymbol.ARRAY,), (), ('_a1',), ())
+
+
+@pytest.mark.parametrize("test, expected", [
+    (_condition_node(ast.NodeSymbol.EQUAL, _n, _n), True),
+    (_condition_node(ast.NodeSymbol.NOTEQUAL, _n, _n), False),
+    (_condition_node(ast.NodeSymbol.LESSTHANEQUAL, _three, _five), True),
+    (_condition_node(ast.NodeSymbol.EQUAL, _n, _five), None),
+    (_condition_node(ast.NodeSymbol.AND, _condition_node(ast.NodeSymbol.EQUAL, _n, _n), _condition_node(ast.NodeSymbol.EQUAL, _n, _five)), None),
+    (_condition_node(ast.NodeSymbol.AND, _condition_node(ast.NodeSymbol.GREATERTHAN, _three, _five), _condition_node(ast.NodeSymbol.EQUAL, _n, _five)), False),
+    (_condition_node(ast.NodeSymbol.OR, _condition_node(ast.NodeSymbol.EQUAL, _n, _five), _condition_node(ast.NodeSymbol.LESSTHAN, _three, _five)), True),
+])
+def test_simplify_conditions(test, expected):
+    symbol_table = {
+        'n': ast.SymbolNode(ast.NodeSymbol.ARRAY, (), None, None),
+        '_a0': ast.SymbolNode(ast.NodeSymbol.ARRAY, (), None, (3,)),
+        '_a1': ast.SymbolNode(ast.NodeSymbol.ARRAY, (), None, (5,)),
+    }
+    body = ast.Node((ast.NodeSymbol.ARRAY,), (), ('B',), ())
+    tree = ast.Node((ast.NodeSymbol.BLOCK,), (), (), (
+        ast.Node((ast.NodeSymbol.CONDITION,), (), (), (test, ast.Node((ast.NodeSymbol.BLOCK,), (), (), (body,)))),))
+
+    context = optimize.simplify_conditions(ast.create_context(ast=tree, symbol_table=symbol_table))
+
+    if expected is None: # depends on runtime value of n
+        (condition,) = context.ast.child
+        assert condition.child[0] == _condition_node(ast.NodeSymbol.EQUAL, _n, _five)
+    else:
+        assert context.ast.child == ((body,) if expected else ())
+
+
+def test_reduce_strength():
+    from moa.frontend import LazyArray
+    from moa.shape import calculate_shapes
+    from moa.dnf import reduce_to_dnf
+    from moa.onf import reduce_to_onf
+
+    expression = LazyArray(name='A', shape=('n', 'k')).inner('+', '*', LazyArray(name='B', shape=('k', 'm')))
+    context = optimize.reduce_strength(reduce_to_onf(reduce_to_dnf(calculate_shapes(expression.context)), include_conditions=False))
+
+    def _nodes(node, symbol):
+        nodes = (node,) if node.symbol == (symbol,) else ()
+        return nodes + tuple(_ for child in node.child for _ in _nodes(child, symbol))
+
+    # every access is a flat offset into storage of A, B and the result
+    assert len(_nodes(context.ast, ast.NodeSymbol.STORAGE)) == 3
+    assert all(len(context.symbol_table[node.child[0].attrib[0]].value) == 1 for node in _nodes(context.ast, ast.NodeSymbol.PSI))
+
+    # offsets of A (stride 1) and B (stride m) advanced by the reduction loop
+    reduction_loop = _nodes(context.ast, ast.NodeSymbol.LOOP)[-1]
+    increments = reduction_loop.child[0].child[1:]
+    strides = {(context.symbol_table[stride.attrib[0]].value or stride.attrib)[0] for stride in (increment.child[1].child[1] for increment in increments)}
+    assert strides == {1, 'm'}
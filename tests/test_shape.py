@@ -114,6 +114,24 @@ def test_is_not_vector_2d(): # 2D array
      {'_a1': ast.SymbolNode(ast.NodeSymbol.ARRAY, (3, 2, 1), None, None)},
      ast.Node((ast.NodeSymbol.SHAPE,), (3,), (), (
          ast.Node((ast.NodeSymbol.ARRAY,), (3, 2, 1), ('_a1',), ()),))),
+    # RAV
+    ({'_a1': ast.SymbolNode(ast.NodeSymbol.ARRAY, (3, 2, 4), None, None)},
+     ast.Node((ast.NodeSymbol.RAV,), None, (), (
+         ast.Node((ast.NodeSymbol.ARRAY,), None, ('_a1',), ()),)),
+     {'_a1': ast.SymbolNode(ast.NodeSymbol.ARRAY, (3, 2, 4), None, None)},
+     ast.Node((ast.NodeSymbol.RAV,), (24,), (), (
+         ast.Node((ast.NodeSymbol.ARRAY,), (3, 2, 4), ('_a1',), ()),))),
+    # RESHAPE
+    ({'_a1': ast.SymbolNode(ast.NodeSymbol.ARRAY, (3,), None, (2, 3, 4)),
+      'A': ast.SymbolNode(ast.NodeSymbol.ARRAY, (6, 4), None, None)},
+     ast.Node((ast.NodeSymbol.RESHAPE,), None, (), (
+         ast.Node((ast.NodeSymbol.ARRAY,), None, ('_a1',), ()),
+         ast.Node((ast.NodeSymbol.ARRAY,), None, ('A',), ()),)),
+     {'_a1': ast.SymbolNode(ast.NodeSymbol.ARRAY, (3,), None, (2, 3, 4)),
+      'A': ast.SymbolNode(ast.NodeSymbol.ARRAY, (6, 4), None, None)},
+     ast.Node((ast.NodeSymbol.RESHAPE,), (2, 3, 4), (), (
+         ast.Node((ast.NodeSymbol.ARRAY,), (3,), ('_a1',), ()),
+         ast.Node((ast.NodeSymbol.ARRAY,), (6, 4), ('A',), ()),))),
     # PSI
     ({'_a1': ast.SymbolNode(ast.NodeSymbol.ARRAY, (2,), None, (3, 4)),
       'A': ast.SymbolNode(ast.NodeSymbol.ARRAY, (4, 5, 6), None, None)},
@@ -301,3 +319,163 @@ def test_shape_unit_plus_symbolic(left_shape, right_shape):
     print(new_context.symbol_table)
     testing.assert_context_equal(context, context_copy)
     testing.assert_context_equal(expected_context, exclude_condition_node)
+
+
+def test_shape_ravel_symbolic():
+    symbol_table = {
+        'n': ast.SymbolNode(ast.NodeSymbol.ARRAY, (), None, None),
+        'A': ast.SymbolNode(ast.NodeSymbol.ARRAY, (ast.Node((ast.NodeSymbol.ARRAY,), (), ('n',), ()), 4), None, None),
+    }
+    tree = ast.Node((ast.NodeSymbol.RAV,), None, (), (
+        ast.Node((ast.NodeSymbol.ARRAY,), None, ('A',), ()),))
+
+    expected_symbol_table = {
+        **symbol_table,
+        '_a2': ast.SymbolNode(ast.NodeSymbol.ARRAY, (), None, (4,)),
+    }
+    expected_tree = ast.Node((ast.NodeSymbol.RAV,), (
+        ast.Node((ast.NodeSymbol.TIMES,), (), (), (
+            ast.Node((ast.NodeSymbol.ARRAY,), (), ('n',), ()),
+            ast.Node((ast.NodeSymbol.ARRAY,), (), ('_a2',), ()))),), (), (
+        ast.Node((ast.NodeSymbol.ARRAY,), symbol_table['A'].shape, ('A',), ()),))
+
+    testing.assert_transformation(tree, symbol_table, expected_tree, expected_symbol_table, shape.calculate_shapes)
+
+
+def test_shape_reshape_invalid_number_elements():
+    symbol_table = {
+        '_a1': ast.SymbolNode(ast.NodeSymbol.ARRAY, (2,), None, (4, 2)),
+        'A': ast.SymbolNode(ast.NodeSymbol.ARRAY, (3, 3), None, None),
+    }
+    tree = ast.Node((ast.NodeSymbol.RESHAPE,), None, (), (
+        ast.Node((ast.NodeSymbol.ARRAY,), None, ('_a1',), ()),
+        ast.Node((ast.NodeSymbol.ARRAY,), None, ('A',), ())))
+    context = ast.create_context(ast=tree, symbol_table=symbol_table)
+
+    with pytest.raises(shape.MOAShapeError):
+        shape.calculate_shapes(context)
+
+
+@pytest.mark.parametrize("slice_value, array_shape, normalized_slice, expected_shape", [
+    ((None, None, 2, 1, -1, None), (5, 6), (0, 5, 2, 1, 5, 1), (3, 4)),
+    ((None, None, -1), (5, 6), (4, -1, -1), (5, 6)),
+    ((4, 0, -3), (5,), (4, 0, -3), (2,)),
+    ((-2, 100, None), (5,), (3, 5, 1), (2,)),
+])
+def test_shape_slice(slice_value, array_shape, normalized_slice, expected_shape):
+    symbol_table = {
+        '_a0': ast.SymbolNode(ast.NodeSymbol.ARRAY, (len(slice_value) // 3, 3), None, slice_value),
+        'A': ast.SymbolNode(ast.NodeSymbol.ARRAY, array_shape, None, None),
+    }
+    tree = ast.Node((ast.NodeSymbol.SLICE,), None, (), (
+        ast.Node((ast.NodeSymbol.ARRAY,), None, ('_a0',), ()),
+        ast.Node((ast.NodeSymbol.ARRAY,), None, ('A',), ())))
+
+    expected_symbol_table = {
+        **symbol_table,
+        '_a2': ast.SymbolNode(ast.NodeSymbol.ARRAY, (len(slice_value) // 3, 3), None, normalized_slice),
+    }
+    expected_tree = ast.Node((ast.NodeSymbol.SLICE,), expected_shape, (), (
+        ast.Node((ast.NodeSymbol.ARRAY,), (len(slice_value) // 3, 3), ('_a2',), ()),
+        ast.Node((ast.NodeSymbol.ARRAY,), array_shape, ('A',), ())))
+
+    testing.assert_transformation(tree, symbol_table, expected_tree, expected_symbol_table, shape.calculate_shapes)
+
+
+def test_shape_slice_symbolic():
+    n = ast.Node((ast.NodeSymbol.ARRAY,), (), ('n',), ())
+    symbol_table = {
+        'n': ast.SymbolNode(ast.NodeSymbol.ARRAY, (), None, None),
+        '_a0': ast.SymbolNode(ast.NodeSymbol.ARRAY, (1, 3), None, (1, None, 2)),
+        'A': ast.SymbolNode(ast.NodeSymbol.ARRAY, (n,), None, None),
+    }
+    context = ast.create_context(ast=ast.Node((ast.NodeSymbol.SLICE,), None, (), (
+        ast.Node((ast.NodeSymbol.ARRAY,), None, ('_a0',), ()),
+        ast.Node((ast.NodeSymbol.ARRAY,), None, ('A',), ()))), symbol_table=symbol_table)
+
+    context = shape.calculate_shapes(context)
+
+    # (n - 1 + 1) // 2 elements
+    assert context.ast.symbol == (ast.NodeSymbol.CONDITION,)
+    slice_node = ast.select_node(context, (1,))
+    length = slice_node.ast.shape[0]
+    assert length.symbol == (ast.NodeSymbol.FLOORDIVIDE,)
+    assert ast.select_array_node_symbol(slice_node, (0,)).value == (1, n, 2)
+
+
+def test_shape_slice_zero_step():
+    symbol_table = {
+        '_a0': ast.SymbolNode(ast.NodeSymbol.ARRAY, (1, 3), None, (None, None, 0)),
+        'A': ast.SymbolNode(ast.NodeSymbol.ARRAY, (3,), None, None),
+    }
+    context = ast.create_context(ast=ast.Node((ast.NodeSymbol.SLICE,), None, (), (
+        ast.Node((ast.NodeSymbol.ARRAY,), None, ('_a0',), ()),
+        ast.Node((ast.NodeSymbol.ARRAY,), None, ('A',), ()))), symbol_table=symbol_table)
+
+    with pytest.raises(shape.MOAShapeError):
+        shape.calculate_shapes(context)
+
+
+@pytest.mark.parametrize("axes, expected_axes, expected_shape", [
+    ((1,), (1,), (1, 3)),
+    ((-1,), (2,), (1, 2)),
+    ((2, 0), (0, 2), (2,)),
+    ((0, 1, 2), (0, 1, 2), ()),
+])
+def test_shape_unit_reduce_axes(axes, expected_axes, expected_shape):
+    symbol_table = {
+        'A': ast.SymbolNode(ast.NodeSymbol.ARRAY, (1, 2, 3), None, None),
+    }
+    tree = ast.Node((ast.NodeSymbol.REDUCE, ast.NodeSymbol.PLUS), None, axes, (
+        ast.Node((ast.NodeSymbol.ARRAY,), None, ('A',), ()),))
+    expected_tree = ast.Node((ast.NodeSymbol.REDUCE, ast.NodeSymbol.PLUS), expected_shape, expected_axes, (
+        ast.Node((ast.NodeSymbol.ARRAY,), (1, 2, 3), ('A',), ()),))
+
+    testing.assert_transformation(tree, symbol_table, expected_tree, symbol_table, shape.calculate_shapes)
+
+
+@pytest.mark.parametrize("axes", [
+    (3,), (-4,), (0, -3),
+])
+def test_shape_unit_reduce_axes_invalid(axes):
+    symbol_table = {
+        'A': ast.SymbolNode(ast.NodeSymbol.ARRAY, (1, 2, 3), None, None),
+    }
+    tree = ast.Node((ast.NodeSymbol.REDUCE, ast.NodeSymbol.PLUS), None, axes, (
+        ast.Node((ast.NodeSymbol.ARRAY,), None, ('A',), ()),))
+    context = ast.create_context(ast=tree, symbol_table=symbol_table)
+
+    with pytest.raises(shape.MOAShapeError):
+        shape.calculate_shapes(context)
+
+
+def test_shape_block():
+    symbol_table = {
+        'A': ast.SymbolNode(ast.NodeSymbol.ARRAY, (2, 3), None, None),
+    }
+    tree = ast.Node((ast.NodeSymbol.BLOCK,), None, (), (
+        ast.Node((ast.NodeSymbol.REDUCE, ast.NodeSymbol.MAXIMUM), None, (), (
+            ast.Node((ast.NodeSymbol.ARRAY,), None, ('A',), ()),)),
+        ast.Node((ast.NodeSymbol.REDUCE, ast.NodeSymbol.MINIMUM), None, (), (
+            ast.Node((ast.NodeSymbol.ARRAY,), None, ('A',), ()),))))
+    expected_tree = ast.Node((ast.NodeSymbol.BLOCK,), (3,), (), (
+        ast.Node((ast.NodeSymbol.REDUCE, ast.NodeSymbol.MAXIMUM), (3,), (), (
+            ast.Node((ast.NodeSymbol.ARRAY,), (2, 3), ('A',), ()),)),
+        ast.Node((ast.NodeSymbol.REDUCE, ast.NodeSymbol.MINIMUM), (3,), (), (
+            ast.Node((ast.NodeSymbol.ARRAY,), (2, 3), ('A',), ()),))))
+
+    testing.assert_transformation(tree, symbol_table, expected_tree, symbol_table, shape.calculate_shapes)
+
+
+def test_shape_block_invalid():
+    symbol_table = {
+        'A': ast.SymbolNode(ast.NodeSymbol.ARRAY, (2, 3), None, None),
+    }
+    tree = ast.Node((ast.NodeSymbol.BLOCK,), None, (), (
+        ast.Node((ast.NodeSymbol.ARRAY,), None, ('A',), ()),
+        ast.Node((ast.NodeSymbol.REDUCE, ast.NodeSymbol.PLUS), None, (), (
+            ast.Node((ast.NodeSymbol.ARRAY,), None, ('A',), ()),))))
+    context = ast.create_context(ast=tree, symbol_table=symbol_table)
+
+    with pytest.raises(shape.MOAShapeError):
+        shape.calculate_shapes(context)